@@ -0,0 +1,281 @@
+import argparse
+import asyncio
+import contextlib
+import statistics
+import time
+import tracemalloc
+from zaifapi import (
+    AsyncZaifFuturesPublicApi,
+    AsyncZaifLeverageTradeApi,
+    AsyncZaifPublicApi,
+    AsyncZaifPublicStreamApi,
+    AsyncZaifTradeApi,
+    ZaifFuturesPublicApi,
+    ZaifLeverageTradeApi,
+    ZaifPublicApi,
+    ZaifPublicStreamApi,
+    ZaifTradeApi,
+)
+from .mock_server import MockZaifServerProcess
+
+ALLOC_NUMBER = 50
+KEY = "0123456789abcdef0123456789abcdef"
+SECRET = "fedcba9876543210fedcba9876543210"
+ORDER = {"currency_pair": "btc_jpy", "action": "bid", "price": 4100000, "amount": 0.01}
+POSITION = dict(ORDER, type="margin", leverage=2)
+LEVERAGE_ID = {"type": "margin", "leverage_id": 1000}
+WITHDRAW = {"currency": "btc", "address": "12qwQ3sPJJAosodSUhSpMds4WfUPBeFEM2", "amount": 0.001}
+
+
+def _percentile(samples, quantile):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(quantile * len(ordered)))]
+
+
+def _report(name, elapsed, latencies, allocations):
+    print(
+        "{:<36}{:>10.0f}{:>10.1f}{:>10.1f}{:>12.1f}".format(
+            name,
+            len(latencies) / elapsed,
+            _percentile(latencies, 0.5) * 1e6,
+            _percentile(latencies, 0.99) * 1e6,
+            statistics.median(allocations) / 1024,
+        )
+    )
+
+
+def measure(name, call, number):
+    for _ in range(min(number, 20)):
+        call()
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(number):
+        begin = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - begin)
+    elapsed = time.perf_counter() - started
+    allocations = []
+    tracemalloc.start()
+    try:
+        for _ in range(ALLOC_NUMBER):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            call()
+            allocations.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    _report(name, elapsed, latencies, allocations)
+
+
+async def measure_async(name, call, number):
+    for _ in range(min(number, 20)):
+        await call()
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(number):
+        begin = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - begin)
+    elapsed = time.perf_counter() - started
+    allocations = []
+    tracemalloc.start()
+    try:
+        for _ in range(ALLOC_NUMBER):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            await call()
+            allocations.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    _report(name, elapsed, latencies, allocations)
+
+
+def measure_stream(name, messages, number):
+    next(messages)
+    latencies = []
+    allocations = []
+    started = time.perf_counter()
+    for _ in range(number):
+        message = next(messages)
+        latencies.append(time.time() - message["sent"])
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    try:
+        for _ in range(ALLOC_NUMBER):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            next(messages)
+            allocations.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    _report(name, elapsed, latencies, allocations)
+
+
+def sync_paths(server):
+    public = ZaifPublicApi(server.api_url("api", 1))
+    futures = ZaifFuturesPublicApi(server.api_url("fapi", 1))
+    trade = ZaifTradeApi(KEY, SECRET, server.api_url("tapi"))
+    leverage = ZaifLeverageTradeApi(KEY, SECRET, server.api_url("tlapi"))
+    typed = ZaifPublicApi(server.api_url("api", 1), typed=True)
+    return [
+        ("public.last_price", lambda: public.last_price("btc_jpy")),
+        ("public.ticker", lambda: public.ticker("btc_jpy")),
+        ("public.trades", lambda: public.trades("btc_jpy")),
+        ("public.depth", lambda: public.depth("btc_jpy")),
+        ("public.depth (typed)", lambda: typed.depth("btc_jpy")),
+        ("public.currency_pairs", lambda: public.currency_pairs("all")),
+        ("public.currencies", lambda: public.currencies("all")),
+        ("futures.last_price", lambda: futures.last_price(1, "btc_jpy")),
+        ("futures.ticker", lambda: futures.ticker(1, "btc_jpy")),
+        ("futures.trades", lambda: futures.trades(1, "btc_jpy")),
+        ("futures.depth", lambda: futures.depth(1, "btc_jpy")),
+        ("futures.groups", lambda: futures.groups("all")),
+        ("futures.swap_history", lambda: futures.swap_history(1, "btc_jpy")),
+        ("futures.swap_history (page)", lambda: futures.swap_history(1, "btc_jpy", page=2)),
+        ("trade.get_info", trade.get_info),
+        ("trade.get_info2", trade.get_info2),
+        ("trade.get_personal_info", trade.get_personal_info),
+        ("trade.get_id_info", trade.get_id_info),
+        ("trade.trade", lambda: trade.trade(**ORDER)),
+        ("trade.cancel_order", lambda: trade.cancel_order(order_id=1)),
+        ("trade.active_orders", trade.active_orders),
+        ("trade.trade_history", trade.trade_history),
+        ("trade.withdraw", lambda: trade.withdraw(**WITHDRAW)),
+        ("trade.withdraw_history", lambda: trade.withdraw_history(currency="btc")),
+        ("trade.deposit_history", lambda: trade.deposit_history(currency="btc")),
+        ("leverage.get_positions", lambda: leverage.get_positions(type="margin")),
+        ("leverage.position_history", lambda: leverage.position_history(**LEVERAGE_ID)),
+        ("leverage.active_positions", lambda: leverage.active_positions(type="margin")),
+        ("leverage.create_position", lambda: leverage.create_position(**POSITION)),
+        (
+            "leverage.change_position",
+            lambda: leverage.change_position(price=4100000, **LEVERAGE_ID),
+        ),
+        ("leverage.cancel_position", lambda: leverage.cancel_position(**LEVERAGE_ID)),
+    ]
+
+
+async def async_paths(server, number, concurrency, selected):
+    async with contextlib.AsyncExitStack() as stack:
+        public = await stack.enter_async_context(AsyncZaifPublicApi(server.api_url("api", 1)))
+        futures = await stack.enter_async_context(
+            AsyncZaifFuturesPublicApi(server.api_url("fapi", 1))
+        )
+        trade = await stack.enter_async_context(
+            AsyncZaifTradeApi(KEY, SECRET, server.api_url("tapi"))
+        )
+        leverage = await stack.enter_async_context(
+            AsyncZaifLeverageTradeApi(KEY, SECRET, server.api_url("tlapi"))
+        )
+        paths = [
+            ("async public.last_price", lambda: public.last_price("btc_jpy"), number),
+            ("async public.ticker", lambda: public.ticker("btc_jpy"), number),
+            ("async public.trades", lambda: public.trades("btc_jpy"), number),
+            ("async public.depth", lambda: public.depth("btc_jpy"), number),
+            ("async public.currencies", lambda: public.currencies("all"), number),
+            ("async futures.depth", lambda: futures.depth(1, "btc_jpy"), number),
+            (
+                "async futures.swap_history (page)",
+                lambda: futures.swap_history(1, "btc_jpy", page=2),
+                number,
+            ),
+            ("async trade.get_info", trade.get_info, number),
+            ("async trade.trade", lambda: trade.trade(**ORDER), number),
+            ("async trade.cancel_order", lambda: trade.cancel_order(order_id=1), number),
+            ("async trade.active_orders", trade.active_orders, number),
+            ("async trade.trade_history", trade.trade_history, number),
+            (
+                "async leverage.get_positions",
+                lambda: leverage.get_positions(type="margin"),
+                number,
+            ),
+            (
+                "async leverage.create_position",
+                lambda: leverage.create_position(**POSITION),
+                number,
+            ),
+            (
+                "async public.ticker x{}".format(concurrency),
+                lambda: asyncio.gather(*(public.ticker("btc_jpy") for _ in range(concurrency))),
+                max(1, number // concurrency),
+            ),
+            (
+                "async trade.trade_many x{}".format(concurrency),
+                lambda: trade.trade_many([ORDER] * concurrency, max_concurrency=concurrency),
+                max(1, number // concurrency),
+            ),
+        ]
+        for name, call, count in paths:
+            if selected(name):
+                await measure_async(name, call, count)
+
+
+async def _async_stream_messages(server, number):
+    stream = AsyncZaifPublicStreamApi(server.api_url("stream", protocol="ws"))
+    async with stream:
+        messages = stream.execute("btc_jpy")
+        latencies = []
+        await messages.__anext__()
+        started = time.perf_counter()
+        for _ in range(number):
+            message = await messages.__anext__()
+            latencies.append(time.time() - message["sent"])
+        elapsed = time.perf_counter() - started
+        allocations = []
+        tracemalloc.start()
+        try:
+            for _ in range(ALLOC_NUMBER):
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+                await messages.__anext__()
+                allocations.append(tracemalloc.get_traced_memory()[1] - baseline)
+        finally:
+            tracemalloc.stop()
+        await messages.aclose()
+    _report("async stream", elapsed, latencies, allocations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="zaifapi client benchmarks on a local mock server")
+    parser.add_argument("--number", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency in ms")
+    parser.add_argument("--depth-levels", type=int, default=150)
+    parser.add_argument("--trade-count", type=int, default=150)
+    parser.add_argument("--order-count", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--stream-interval", type=float, default=0.0, help="in ms")
+    parser.add_argument("--filter", default="", help="only run paths containing this text")
+    args = parser.parse_args()
+
+    def selected(name):
+        return args.filter in name
+
+    server = MockZaifServerProcess(
+        latency=args.latency / 1000,
+        depth_levels=args.depth_levels,
+        trade_count=args.trade_count,
+        order_count=args.order_count,
+        stream_interval=args.stream_interval / 1000,
+    )
+    with server:
+        print(
+            "{:<36}{:>10}{:>10}{:>10}{:>12}".format(
+                "path", "calls/s", "p50 us", "p99 us", "KiB/call"
+            )
+        )
+        for name, call in sync_paths(server):
+            if selected(name):
+                measure(name, call, args.number)
+        asyncio.run(async_paths(server, args.number, args.concurrency, selected))
+        if selected("stream"):
+            stream = ZaifPublicStreamApi(server.api_url("stream", protocol="ws"))
+            messages = stream.execute("btc_jpy")
+            measure_stream("stream", messages, args.number)
+            stream.stop()
+            messages.close()
+        if selected("async stream"):
+            asyncio.run(_async_stream_messages(server, args.number))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import timeit
+from zaifapi.api_common import JsonDecoder
+from .payloads import depth_payload, trades_payload
+
+NUMBER = 2000
+
+
+def main():
+    decoders = [
+        ("json (str)", lambda data: JsonDecoder(use_orjson=False).decode(data.decode())),
+        ("json (bytes)", JsonDecoder(use_orjson=False).decode),
+        ("orjson (bytes)", JsonDecoder().decode),
+        ("json Decimal", JsonDecoder(use_decimal=True).decode),
+    ]
+    for payload_name, payload in (("depth", depth_payload()), ("trades", trades_payload())):
+        for name, decode in decoders:
+            seconds = timeit.timeit(lambda: decode(payload), number=NUMBER)
+            print("{:<8}{:<18}{:>10.2f} us/call".format(payload_name, name, seconds / NUMBER * 1e6))
+
+
+if __name__ == "__main__":
+    main()
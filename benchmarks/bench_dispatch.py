@@ -0,0 +1,36 @@
+import inspect
+import timeit
+from unittest.mock import MagicMock
+from zaifapi import ZaifPublicApi
+
+NUMBER = 20000
+
+
+def _stack_method_name():
+    return inspect.stack()[1][3]
+
+
+def stack_dispatch():
+    return _stack_method_name()
+
+
+def table_dispatch():
+    return ZaifPublicApi._endpoints["last_price"]
+
+
+def main():
+    api = ZaifPublicApi()
+    api._session = MagicMock()
+    api._session.get.return_value = MagicMock(status_code=200, content=b'{"last_price": 1}')
+
+    results = [
+        ("inspect.stack() lookup", timeit.timeit(stack_dispatch, number=NUMBER // 10) * 10),
+        ("endpoint table lookup", timeit.timeit(table_dispatch, number=NUMBER)),
+        ("last_price() full call", timeit.timeit(lambda: api.last_price("btc_jpy"), number=NUMBER)),
+    ]
+    for name, seconds in results:
+        print("{:<28}{:>10.2f} us/call".format(name, seconds / NUMBER * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import hashlib
+import hmac
+import timeit
+from urllib.parse import urlencode
+from zaifapi.exchange_api.trade import _Signer
+
+NUMBER = 100000
+KEY = "0123456789abcdef0123456789abcdef"
+SECRET = "fedcba9876543210fedcba9876543210"
+PARAMS = urlencode(
+    {
+        "currency_pair": "btc_jpy",
+        "action": "bid",
+        "price": 4100000,
+        "amount": 0.01,
+        "method": "trade",
+        "nonce": "1600000000.000001",
+    }
+)
+
+
+def _fresh(key, secret, params):
+    signature = hmac.new(bytearray(secret.encode("utf-8")), digestmod=hashlib.sha512)
+    signature.update(params.encode("utf-8"))
+    return {"key": key, "sign": signature.hexdigest()}
+
+
+def main():
+    signer = _Signer(KEY, SECRET)
+    for name, sign in (
+        ("fresh hmac", lambda: _fresh(KEY, SECRET, PARAMS)),
+        ("pre-keyed copy", lambda: signer.sign(PARAMS)),
+    ):
+        seconds = timeit.timeit(sign, number=NUMBER)
+        print(
+            "{:<16}{:>8.2f} us/call {:>10.0f} signs/s".format(
+                name, seconds / NUMBER * 1e6, NUMBER / seconds
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import timeit
+from zaifapi.api_common.validator import ZaifApiValidator
+
+NUMBER = 20000
+KEYS = ("currency_pair", "action", "price", "amount", "limit", "comment")
+PARAMS = {"currency_pair": "btc_jpy", "action": "bid", "price": 400000, "amount": 0.01}
+
+
+def main():
+    for name, validator in (
+        ("cerberus (cached)", ZaifApiValidator(fast=False)),
+        ("compiled fast path", ZaifApiValidator()),
+    ):
+        seconds = timeit.timeit(lambda: validator._validate(KEYS, PARAMS), number=NUMBER)
+        print("{:<28}{:>10.2f} us/call".format(name, seconds / NUMBER * 1e6))
+
+
+if __name__ == "__main__":
+    main()
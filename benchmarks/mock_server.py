@@ -0,0 +1,229 @@
+import asyncio
+import itertools
+import json
+import multiprocessing
+import threading
+import time
+from urllib.parse import parse_qs
+from aiohttp import web
+from zaifapi.api_common import ApiUrl
+from .payloads import depth_payload, fixture, fixture_payload, keyed_records, trades_payload
+
+
+def _api_url(host, port, api_name, version=None, protocol="http"):
+    return ApiUrl(api_name, protocol=protocol, host=host, port=port, version=version)
+
+
+FUNDS = fixture("get_info")["funds"]
+
+_TRADE_FIXTURES = {
+    "get_info": "get_info",
+    "get_info2": "get_info",
+    "get_personal_info": "get_personal_info",
+    "get_id_info": "get_id_info",
+    "withdraw": "withdraw",
+}
+
+_KEYED_FIXTURES = {
+    "active_orders": "orders",
+    "trade_history": "trade_history",
+    "withdraw_history": "transfer_history",
+    "deposit_history": "transfer_history",
+    "active_positions": "positions",
+    "get_positions": "positions",
+    "position_history": "position_history",
+}
+
+
+class MockZaifServer:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        depth_levels: int = 150,
+        trade_count: int = 150,
+        order_count: int = 50,
+        stream_interval: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency = latency
+        self.stream_interval = stream_interval
+        self.host = host
+        self.port = port
+        self.requests = 0
+        self._depth = depth_payload(depth_levels)
+        self._trades = trades_payload(trade_count)
+        self._order_count = order_count
+        self._fixtures = {method: fixture(name) for method, name in _TRADE_FIXTURES.items()}
+        self._keyed = {
+            method: keyed_records(name, order_count) for method, name in _KEYED_FIXTURES.items()
+        }
+        self._public_fixtures = {
+            name: fixture_payload(name)
+            for name in (
+                "last_price",
+                "ticker",
+                "currency_pairs",
+                "currencies",
+                "groups",
+                "swap_history",
+            )
+        }
+        self._order_ids = itertools.count(200000000)
+        depth = json.loads(self._depth)
+        self._stream = json.dumps(
+            {
+                "asks": depth["asks"][:20],
+                "bids": depth["bids"][:20],
+                "trades": json.loads(self._trades)[:20],
+                "timestamp": "2020-01-01 00:00:00.000000",
+                "last_price": {"action": "ask", "price": 4100000},
+                "currency_pair": "btc_jpy",
+            }
+        ).encode()[:-1]
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._runner = None
+
+    def api_url(self, api_name, version=None, protocol="http"):
+        return _api_url(self.host, self.port, api_name, version, protocol)
+
+    def _app(self):
+        app = web.Application()
+        app.router.add_get("/api/1/{name}/{arg}", self._public)
+        app.router.add_get("/fapi/1/{name}/{group_id}", self._public)
+        app.router.add_get("/fapi/1/{name}/{group_id}/{arg}", self._public)
+        app.router.add_get("/fapi/1/{name}/{group_id}/{arg}/{page}", self._public)
+        app.router.add_post("/tapi", self._trade)
+        app.router.add_post("/tlapi", self._trade)
+        app.router.add_get("/stream", self._stream_handler)
+        return app
+
+    async def _delay(self):
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    def _public_body(self, name):
+        if name == "depth":
+            return self._depth
+        if name == "trades":
+            return self._trades
+        return self._public_fixtures[name]
+
+    async def _public(self, request):
+        await self._delay()
+        return web.Response(body=self._public_body(request.match_info["name"]))
+
+    def _trade_result(self, method, params):
+        if method in self._fixtures:
+            return self._fixtures[method]
+        if method in self._keyed:
+            return self._keyed[method]
+        if method in ("trade", "create_position"):
+            return {
+                "received": 0,
+                "remains": 0.01,
+                "order_id": next(self._order_ids),
+                "funds": FUNDS,
+            }
+        if method == "cancel_order":
+            return {"order_id": int(params.get("order_id", ["0"])[0]), "funds": FUNDS}
+        if method == "cancel_position":
+            return {
+                "leverage_id": int(params.get("leverage_id", ["0"])[0]),
+                "fee_refunded": 0,
+                "timestamp": "1600000000",
+            }
+        if method == "change_position":
+            return {
+                "leverage_id": int(params.get("leverage_id", ["0"])[0]),
+                "price": float(params.get("price", ["0"])[0]),
+                "limit": 4200000,
+                "stop": 4000000,
+            }
+        return {}
+
+    async def _trade(self, request):
+        await self._delay()
+        params = parse_qs(await request.text())
+        method = params.get("method", [""])[0]
+        if "key" not in request.headers and "token" not in request.headers:
+            return web.json_response({"success": 0, "error": "no key"})
+        return web.json_response({"success": 1, "return": self._trade_result(method, params)})
+
+    async def _stream_handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.requests += 1
+        closing = asyncio.ensure_future(ws.receive())
+        try:
+            while not ws.closed and not closing.done():
+                message = self._stream + b', "sent": %.6f}' % time.time()
+                await ws.send_str(message.decode())
+                await asyncio.sleep(self.stream_interval)
+        except ConnectionError:
+            pass
+        finally:
+            closing.cancel()
+        return ws
+
+    async def _start(self):
+        self._runner = web.AppRunner(self._app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def _stop(self):
+        await self._runner.cleanup()
+
+    def start(self):
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+        return self
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def _serve(connection, options):
+    server = MockZaifServer(**options).start()
+    connection.send(server.port)
+    connection.recv()
+    server.stop()
+
+
+class MockZaifServerProcess:
+    def __init__(self, **options):
+        self.host = options.get("host", "127.0.0.1")
+        self.port = None
+        self._options = options
+        self._connection, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve, args=(child, options), daemon=True)
+
+    def api_url(self, api_name, version=None, protocol="http"):
+        return _api_url(self.host, self.port, api_name, version, protocol)
+
+    def start(self):
+        self._process.start()
+        self.port = self._connection.recv()
+        return self
+
+    def stop(self):
+        self._connection.send(None)
+        self._process.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
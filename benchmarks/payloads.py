@@ -0,0 +1,50 @@
+import json
+import os
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name + ".json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def fixture_payload(name):
+    return json.dumps(fixture(name)).encode()
+
+
+def _tile_levels(levels, count, direction):
+    span = abs(levels[-1][0] - levels[0][0]) + abs(levels[1][0] - levels[0][0])
+    return [
+        [
+            levels[i % len(levels)][0] + direction * span * (i // len(levels)),
+            levels[i % len(levels)][1],
+        ]
+        for i in range(count)
+    ]
+
+
+def depth_payload(levels=150):
+    depth = fixture("depth")
+    asks = _tile_levels(depth["asks"], levels, 1)
+    bids = _tile_levels(depth["bids"], levels, -1)
+    return json.dumps({"asks": asks, "bids": bids}).encode()
+
+
+def trades_payload(count=150):
+    trades = fixture("trades")
+    newest = trades[0]
+    result = []
+    for i in range(count):
+        trade = dict(trades[i % len(trades)])
+        trade["tid"] = newest["tid"] + count - len(trades) - i
+        trade["date"] -= (newest["date"] - trades[-1]["date"] + 1) * (i // len(trades))
+        result.append(trade)
+    return json.dumps(result).encode()
+
+
+def keyed_records(name, count):
+    records = fixture(name)
+    first = min(int(key) for key in records)
+    values = list(records.values())
+    return {str(first + i): dict(values[i % len(values)]) for i in range(count)}
@@ -35,4 +35,10 @@ setup(
         "License :: OSI Approved :: MIT License",
     ],
     install_requires=["requests", "websocket-client", "Cerberus"],
+    extras_require={
+        "async": ["aiohttp"],
+        "fast": ["orjson"],
+        "numpy": ["numpy"],
+        "pandas": ["numpy", "pandas"],
+    },
 )
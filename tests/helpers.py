@@ -0,0 +1,18 @@
+from unittest.mock import MagicMock
+
+
+def response(content=b'{"last": 1}', status_code=200):
+    return MagicMock(status_code=status_code, content=content)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
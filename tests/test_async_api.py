@@ -0,0 +1,140 @@
+import asyncio
+import unittest
+from unittest.mock import patch, AsyncMock, MagicMock
+from urllib.parse import parse_qs
+from zaifapi import (
+    AsyncZaifPublicApi,
+    AsyncZaifFuturesPublicApi,
+    AsyncZaifTradeApi,
+    AsyncZaifLeverageTradeApi,
+    AsyncZaifPublicStreamApi,
+)
+from zaifapi.api_common import AsyncZaifSession
+from zaifapi.api_common.async_session import AsyncResponse
+from zaifapi.api_error import ZaifApiError, ZaifApiValidationError
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestAsyncPublicApi(unittest.TestCase):
+    def setUp(self):
+        self.api = AsyncZaifPublicApi()
+        self.response = AsyncResponse(200, b'{"last_price": 1}')
+
+    def test_last_price(self):
+        with patch.object(self.api._session, "get", AsyncMock(return_value=self.response)) as get:
+            result = run(self.api.last_price("btc_jpy"))
+            get.assert_awaited_once_with("https://api.zaif.jp/api/1/last_price/btc_jpy", params={})
+            self.assertEqual(result, {"last_price": 1})
+
+    def test_concurrent_calls(self):
+        async def fetch_all():
+            return await asyncio.gather(
+                self.api.depth("btc_jpy"), self.api.depth("xem_jpy"), self.api.ticker("mona_jpy")
+            )
+
+        with patch.object(self.api._session, "get", AsyncMock(return_value=self.response)) as get:
+            run(fetch_all())
+            urls = sorted(call[0][0] for call in get.await_args_list)
+            self.assertEqual(
+                urls,
+                [
+                    "https://api.zaif.jp/api/1/depth/btc_jpy",
+                    "https://api.zaif.jp/api/1/depth/xem_jpy",
+                    "https://api.zaif.jp/api/1/ticker/mona_jpy",
+                ],
+            )
+        self.assertEqual(self.api._url.get_absolute_url(), "https://api.zaif.jp/api/1")
+
+    def test_status_error(self):
+        response = AsyncResponse(502, b"")
+        with patch.object(self.api._session, "get", AsyncMock(return_value=response)):
+            with self.assertRaises(ZaifApiError):
+                run(self.api.ticker("btc_jpy"))
+
+    def test_validation(self):
+        with self.assertRaises(ZaifApiValidationError):
+            run(self.api.ticker(1))
+
+    def test_futures_swap_history(self):
+        api = AsyncZaifFuturesPublicApi()
+        with patch.object(api._session, "get", AsyncMock(return_value=self.response)) as get:
+            run(api.swap_history(group_id=1, currency_pair="btc_jpy", page=2))
+            get.assert_awaited_once_with(
+                "https://api.zaif.jp/fapi/1/swap_history/1/btc_jpy/2", params={}
+            )
+
+
+class TestAsyncTradeApi(unittest.TestCase):
+    def setUp(self):
+        self.response = AsyncResponse(200, b'{"success": 1, "return": "return"}')
+
+    def _post(self, api):
+        return patch.object(api._session, "post", AsyncMock(return_value=self.response))
+
+    def test_trade(self):
+        api = AsyncZaifTradeApi("key", "secret")
+        api._get_nonce = MagicMock(return_value=1111111111)
+        with self._post(api) as post:
+            result = run(api.trade(currency_pair="btc_jpy", action="bid", price=1, amount=1))
+            self.assertEqual(result, "return")
+            self.assertEqual(post.await_args[0], ("https://api.zaif.jp/tapi",))
+            data = parse_qs(post.await_args[1]["data"])
+            self.assertEqual(data["method"], ["trade"])
+            self.assertEqual(post.await_args[1]["headers"]["key"], "key")
+
+    def test_history(self):
+        api = AsyncZaifTradeApi("key", "secret")
+        with self._post(api) as post:
+            run(api.deposit_history(currency="jpy", from_num=0))
+            data = parse_qs(post.await_args[1]["data"])
+            self.assertEqual(data["method"], ["deposit_history"])
+            self.assertEqual(data["from"], ["0"])
+
+    def test_leverage(self):
+        api = AsyncZaifLeverageTradeApi("key", "secret")
+        with self._post(api) as post:
+            run(api.active_positions(type="margin"))
+            self.assertEqual(post.await_args[0], ("https://api.zaif.jp/tlapi",))
+
+    def test_error(self):
+        api = AsyncZaifTradeApi("key", "secret")
+        response = AsyncResponse(200, b'{"success": 0, "error": "bad"}')
+        with patch.object(api._session, "post", AsyncMock(return_value=response)):
+            with self.assertRaises(ZaifApiError):
+                run(api.get_info())
+
+
+class TestAsyncSession(unittest.TestCase):
+    def test_shared_session_is_not_closed(self):
+        session = AsyncZaifSession()
+        session.close = AsyncMock()
+
+        async def use():
+            async with AsyncZaifPublicApi(session=session):
+                pass
+
+        run(use())
+        session.close.assert_not_awaited()
+
+    def test_stream_url(self):
+        api = AsyncZaifPublicStreamApi()
+        ws = MagicMock()
+        ws.__aenter__ = AsyncMock(return_value=ws)
+        ws.__aexit__ = AsyncMock(return_value=False)
+        ws.__aiter__.return_value = []
+        with patch.object(api._session, "ws_connect", return_value=ws) as ws_connect:
+
+            async def consume():
+                return [message async for message in api.execute("btc_jpy")]
+
+            self.assertEqual(run(consume()), [])
+            ws_connect.assert_called_once_with(
+                "wss://ws.zaif.jp:8888/stream?currency_pair=btc_jpy", heartbeat=None
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
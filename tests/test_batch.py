@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from zaifapi import AsyncZaifPublicApi, ZaifFuturesPublicApi, ZaifPublicApi
+from zaifapi.api_common import AsyncZaifSession
+from zaifapi.api_common.async_session import AsyncResponse
+from zaifapi.exchange_api.batch import run_batch
+from tests.helpers import response
+
+
+class TestRunBatch(unittest.TestCase):
+    def test_bounded_concurrency(self):
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def call(key):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return key * 2
+
+        result = run_batch(call, range(10), max_concurrency=3)
+        self.assertEqual(result, {key: key * 2 for key in range(10)})
+        self.assertEqual(peak[0], 3)
+        self.assertTrue(result.ok)
+
+    def test_duplicate_keys_are_fetched_once(self):
+        call = MagicMock(return_value=1)
+        result = run_batch(call, ["a", "a", "b"])
+        self.assertEqual(call.call_count, 2)
+        self.assertEqual(list(result), ["a", "b"])
+
+
+class TestPublicApiBatch(unittest.TestCase):
+    def test_ticker_many_reports_partial_failures(self):
+        api = ZaifPublicApi()
+
+        def get(url, params=None):
+            if url.endswith("bad_jpy"):
+                return response(b"", 500)
+            return response(b'{"last": 1}')
+
+        with patch("requests.Session.get", side_effect=get) as mock_get:
+            result = api.ticker_many(["btc_jpy", "xem_jpy", "bad_jpy"])
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(result, {"btc_jpy": {"last": 1}, "xem_jpy": {"last": 1}})
+        self.assertEqual(list(result.errors), ["bad_jpy"])
+        self.assertFalse(result.ok)
+        with self.assertRaises(Exception):
+            result.raise_first()
+
+    def test_last_price_and_depth_many(self):
+        api = ZaifPublicApi()
+        with patch("requests.Session.get", return_value=response()) as mock_get:
+            self.assertEqual(
+                set(api.last_price_many(["btc_jpy", "xem_jpy"])), {"btc_jpy", "xem_jpy"}
+            )
+            self.assertEqual(list(api.depth_many(["btc_jpy"])), ["btc_jpy"])
+        urls = sorted(call.args[0] for call in mock_get.call_args_list)
+        self.assertEqual(
+            urls,
+            [
+                "https://api.zaif.jp/api/1/depth/btc_jpy",
+                "https://api.zaif.jp/api/1/last_price/btc_jpy",
+                "https://api.zaif.jp/api/1/last_price/xem_jpy",
+            ],
+        )
+
+    def test_futures_ticker_many(self):
+        api = ZaifFuturesPublicApi()
+        with patch("requests.Session.get", return_value=response()) as mock_get:
+            result = api.ticker_many([1, 2], "btc_jpy")
+        self.assertEqual(set(result), {1, 2})
+        urls = sorted(call.args[0] for call in mock_get.call_args_list)
+        self.assertEqual(
+            urls,
+            [
+                "https://api.zaif.jp/fapi/1/ticker/1/btc_jpy",
+                "https://api.zaif.jp/fapi/1/ticker/2/btc_jpy",
+            ],
+        )
+
+
+class TestAsyncPublicApiBatch(unittest.TestCase):
+    def test_ticker_many(self):
+        session = AsyncZaifSession()
+
+        async def get(url, params=None):
+            await asyncio.sleep(0)
+            if url.endswith("bad_jpy"):
+                return AsyncResponse(500, b"")
+            return AsyncResponse(200, b'{"last": 1}')
+
+        session.get = get
+
+        async def main():
+            api = AsyncZaifPublicApi(session=session)
+            return await api.ticker_many(["btc_jpy", "bad_jpy"], max_concurrency=2)
+
+        result = asyncio.run(main())
+        self.assertEqual(result, {"btc_jpy": {"last": 1}})
+        self.assertEqual(list(result.errors), ["bad_jpy"])
@@ -0,0 +1,193 @@
+import asyncio
+import itertools
+import random
+import threading
+import time
+import unittest
+from urllib.parse import parse_qs
+from unittest.mock import MagicMock, patch
+from zaifapi import AsyncZaifTradeApi, ZaifTradeApi
+from zaifapi.api_common import AsyncZaifSession
+from zaifapi.api_common.async_session import AsyncResponse
+from zaifapi.api_error import ZaifApiNonceError, ZaifApiValidationError
+from tests.helpers import response
+
+ORDERS = [
+    {"currency_pair": "btc_jpy", "action": "bid", "price": 100 + i, "amount": 0.01}
+    for i in range(5)
+]
+
+
+class TestBulkOrders(unittest.TestCase):
+    def setUp(self):
+        self.api = ZaifTradeApi(key="test_key", secret="test_secret")
+        self.api._get_header = MagicMock(return_value={"key": "key", "sign": "sign"})
+        self.nonces = itertools.count(1)
+        self.api._get_nonce = MagicMock(side_effect=lambda: next(self.nonces))
+
+    def test_trade_many_signs_with_increasing_nonces(self):
+        def post(url, data=None, headers=None):
+            params = parse_qs(data)
+            return response(
+                '{{"success": 1, "return": {{"order_id": {}}}}}'.format(params["price"][0]).encode()
+            )
+
+        with patch("requests.Session.post", side_effect=post) as mock_post:
+            result = self.api.trade_many(ORDERS, max_concurrency=3)
+        self.assertTrue(result.ok)
+        self.assertEqual(result, {i: {"order_id": 100 + i} for i in range(5)})
+        signed = [call.args[0] for call in self.api._get_header.call_args_list]
+        nonces = [int(parse_qs(data)["nonce"][0]) for data in signed]
+        self.assertEqual(nonces, [1, 2, 3, 4, 5])
+        self.assertEqual(mock_post.call_count, 5)
+
+    def test_invalid_orders_are_reported_without_sending(self):
+        orders = ORDERS[:2] + [{"currency_pair": "btc_jpy", "action": "buy", "price": 1}]
+        with patch("requests.Session.post") as mock_post:
+            mock_post.return_value = response(b'{"success": 1, "return": {"order_id": 1}}')
+            result = self.api.trade_many(orders)
+        self.assertEqual(sorted(result), [0, 1])
+        self.assertIsInstance(result.errors[2], ZaifApiValidationError)
+        self.assertEqual(mock_post.call_count, 2)
+
+    def test_nonce_error_resigns_and_retries(self):
+        responses = [
+            response(b'{"success": 0, "error": "nonce out of range"}'),
+            response(b'{"success": 1, "return": {"order_id": 7}}'),
+        ]
+        with patch("requests.Session.post", side_effect=responses):
+            result = self.api.cancel_orders([7], max_concurrency=1)
+        self.assertEqual(result, {0: {"order_id": 7}})
+        self.assertEqual(self.api._get_nonce.call_count, 2)
+
+    def test_cancel_orders_reports_failures(self):
+        def post(url, data=None, headers=None):
+            if parse_qs(data)["order_id"] == ["2"]:
+                return response(b'{"success": 0, "error": "order not found"}')
+            return response(b'{"success": 1, "return": {}}')
+
+        with patch("requests.Session.post", side_effect=post):
+            result = self.api.cancel_orders([1, {"order_id": 2, "currency_pair": "btc_jpy"}, 3])
+        self.assertEqual(sorted(result), [0, 2])
+        self.assertEqual(str(result.errors[1]), "order not found")
+        self.assertNotIsInstance(result.errors[1], ZaifApiNonceError)
+
+
+class NonceCheckingServer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.last_nonce = 0
+        self.rejected = 0
+
+    def __call__(self, url, data=None, headers=None, **kwargs):
+        nonce = float(parse_qs(data)["nonce"][0])
+        with self._lock:
+            if nonce <= self.last_nonce:
+                self.rejected += 1
+                return response(b'{"success": 0, "error": "nonce not incremented"}')
+            self.last_nonce = nonce
+        time.sleep(0.001)
+        return response(b'{"success": 1, "return": {"order_id": 1}}')
+
+
+class TestBulkOrderNonces(unittest.TestCase):
+    def test_reordered_nonces_are_retried(self):
+        api = ZaifTradeApi(key="nonce_order_key", secret="test_secret")
+        sign = api._get_header
+        jitter = random.Random(0)
+
+        def slow_sign(params):
+            time.sleep(jitter.random() * 0.002)
+            return sign(params)
+
+        api._get_header = slow_sign
+        server = NonceCheckingServer()
+        orders = [dict(ORDERS[0], price=100 + i) for i in range(30)]
+        with patch("requests.Session.post", side_effect=server):
+            result = api.trade_many(orders, max_concurrency=4)
+        self.assertTrue(result.ok)
+        self.assertEqual(len(result), 30)
+
+    def test_orders_are_sent_concurrently(self):
+        api = ZaifTradeApi(key="concurrent_key", secret="test_secret")
+        lock = threading.Lock()
+        in_flight = [0, 0]
+        nonces = []
+
+        def post(url, data=None, headers=None, **kwargs):
+            with lock:
+                nonces.append(float(parse_qs(data)["nonce"][0]))
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            time.sleep(0.1)
+            with lock:
+                in_flight[0] -= 1
+            return response(b'{"success": 1, "return": {"order_id": 1}}')
+
+        started = time.monotonic()
+        with patch("requests.Session.post", side_effect=post):
+            result = api.trade_many([ORDERS[0]] * 8, max_concurrency=8)
+        self.assertTrue(result.ok)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertGreater(in_flight[1], 1)
+        self.assertEqual(len(set(nonces)), 8)
+
+    def test_async_orders_reach_the_server_in_nonce_order(self):
+        session = AsyncZaifSession()
+        server = NonceCheckingServer()
+
+        async def post(url, data=None, headers=None):
+            await asyncio.sleep(0)
+            response = server(url, data)
+            return AsyncResponse(200, response.content)
+
+        session.post = post
+
+        async def main():
+            api = AsyncZaifTradeApi("async_nonce_order_key", "test_secret", session=session)
+            return await api.trade_many(ORDERS * 4, max_concurrency=4)
+
+        result = asyncio.run(main())
+        self.assertTrue(result.ok)
+        self.assertEqual(server.rejected, 0)
+
+    def test_async_orders_are_sent_concurrently(self):
+        session = AsyncZaifSession()
+        in_flight = [0, 0]
+
+        async def post(url, data=None, headers=None):
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+            await asyncio.sleep(0.05)
+            in_flight[0] -= 1
+            return AsyncResponse(200, b'{"success": 1, "return": {"order_id": 1}}')
+
+        session.post = post
+
+        async def main():
+            api = AsyncZaifTradeApi("async_concurrent_key", "test_secret", session=session)
+            return await api.trade_many(ORDERS * 2, max_concurrency=5)
+
+        self.assertTrue(asyncio.run(main()).ok)
+        self.assertEqual(in_flight[1], 5)
+
+
+class TestAsyncBulkOrders(unittest.TestCase):
+    def test_trade_many(self):
+        session = AsyncZaifSession()
+        sent = []
+
+        async def post(url, data=None, headers=None):
+            sent.append(data)
+            await asyncio.sleep(0)
+            return AsyncResponse(200, b'{"success": 1, "return": {"order_id": 1}}')
+
+        session.post = post
+
+        async def main():
+            api = AsyncZaifTradeApi("test_key", "test_secret", session=session)
+            return await api.trade_many(ORDERS, max_concurrency=2)
+
+        result = asyncio.run(main())
+        self.assertEqual(sorted(result), list(range(5)))
+        self.assertEqual(len(sent), 5)
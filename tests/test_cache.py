@@ -0,0 +1,175 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from zaifapi import AsyncZaifPublicApi, ZaifFuturesPublicApi, ZaifPublicApi
+from zaifapi.api_common import AsyncZaifSession, ResponseCache
+from zaifapi.api_common.async_session import AsyncResponse
+from tests.helpers import FakeClock
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResponseCache({"ticker": 0.5, "currencies": 3600}, maxsize=2, clock=self.clock)
+
+    def test_hit_until_ttl_expires(self):
+        loader = MagicMock(side_effect=[b"1", b"2"])
+        self.assertEqual(self.cache.fetch("k", "ticker", loader), b"1")
+        self.clock.now = 0.4
+        self.assertEqual(self.cache.fetch("k", "ticker", loader), b"1")
+        self.clock.now = 0.5
+        self.assertEqual(self.cache.fetch("k", "ticker", loader), b"2")
+        stats = self.cache.stats()["ticker"]
+        self.assertEqual((stats["hits"], stats["misses"], stats["expired"]), (1, 2, 1))
+
+    def test_uncached_endpoint_always_loads(self):
+        loader = MagicMock(return_value=b"x")
+        self.cache.fetch("k", "trades", loader)
+        self.cache.fetch("k", "trades", loader)
+        self.assertEqual(loader.call_count, 2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        self.cache.put("a", 1, "currencies")
+        self.cache.put("b", 2, "currencies")
+        self.cache.get("a", "currencies")
+        self.cache.put("c", 3, "currencies")
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.stats()["currencies"]["evictions"], 1)
+
+    def test_errors_are_not_cached(self):
+        loader = MagicMock(side_effect=[ValueError("boom"), b"ok"])
+        with self.assertRaises(ValueError):
+            self.cache.fetch("k", "ticker", loader)
+        self.assertEqual(self.cache.fetch("k", "ticker", loader), b"ok")
+
+    def test_concurrent_misses_share_one_call(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            started.set()
+            release.wait(1)
+            return b"shared"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.fetch("k", "ticker", loader)))
+            for _ in range(5)
+        ]
+        threads[0].start()
+        started.wait(1)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(1)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [b"shared"] * 5)
+        self.assertEqual(self.cache.stats()["ticker"]["coalesced"], 4)
+
+    def test_hits_reuse_decoded_value_as_copies(self):
+        decode = MagicMock(side_effect=lambda data: {"asks": [[1, 2]], "raw": bytes(data)})
+        loader = MagicMock(return_value=b"x")
+        first = self.cache.fetch("k", "ticker", loader, decode)
+        first["asks"][0][0] = 99
+        second = self.cache.fetch("k", "ticker", loader, decode)
+        second["raw"] = None
+        self.assertEqual(self.cache.fetch("k", "ticker", loader, decode)["asks"], [[1, 2]])
+        self.assertEqual(self.cache.get("k", "ticker", decode)["raw"], b"x")
+        self.assertEqual(decode.call_count, 1)
+        self.assertEqual(loader.call_count, 1)
+
+    def test_changed_value_is_decoded_again(self):
+        decode = MagicMock(side_effect=bytes)
+        self.cache.put("k", b"1", "ticker")
+        self.assertEqual(self.cache.get("k", "ticker", decode), b"1")
+        self.cache.put("k", b"2", "ticker")
+        self.assertEqual(self.cache.get("k", "ticker", decode), b"2")
+        self.assertEqual(decode.call_count, 2)
+
+    def test_cancelled_async_owner_does_not_fail_waiters(self):
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return b"shared"
+
+        async def main():
+            owner = asyncio.ensure_future(self.cache.fetch_async("k", "ticker", loader))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(self.cache.fetch_async("k", "ticker", loader))
+            await asyncio.sleep(0)
+            owner.cancel()
+            return owner, await waiter
+
+        owner, result = asyncio.run(main())
+        self.assertTrue(owner.cancelled())
+        self.assertEqual(result, b"shared")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.cache.get("k", "ticker"), b"shared")
+
+    def test_make_key(self):
+        self.assertEqual(ResponseCache.make_key("u", {}), "u")
+        self.assertEqual(ResponseCache.make_key("u", {"b": 1, "a": 2}), "u?a=2&b=1")
+
+
+class TestPublicApiCache(unittest.TestCase):
+    def setUp(self):
+        self.response = MagicMock()
+        self.response.status_code = 200
+        self.response.content = b'{"last_price": 1}'
+
+    def test_cached_calls(self):
+        api = ZaifPublicApi(cache=True)
+        with patch("requests.Session.get") as mock_get:
+            mock_get.return_value = self.response
+            first = api.last_price("btc_jpy")
+            first["last_price"] = 2
+            self.assertEqual(api.last_price("btc_jpy"), {"last_price": 1})
+            api.last_price("xem_jpy")
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(api.cache_stats()["last_price"]["hits"], 1)
+
+    def test_error_status_not_cached(self):
+        api = ZaifFuturesPublicApi(cache=ResponseCache())
+        error = MagicMock(status_code=500, content=b"")
+        with patch("requests.Session.get") as mock_get:
+            mock_get.side_effect = [error, self.response]
+            with self.assertRaises(Exception):
+                api.groups(1)
+            api.groups(1)
+            api.groups(1)
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_disabled_by_default(self):
+        api = ZaifPublicApi()
+        self.assertEqual(api.cache_stats(), {})
+
+
+class TestAsyncPublicApiCache(unittest.TestCase):
+    def test_concurrent_async_misses_share_one_call(self):
+        session = AsyncZaifSession()
+        calls = []
+
+        async def get(url, params=None):
+            calls.append(url)
+            await asyncio.sleep(0.01)
+            return AsyncResponse(200, b'{"last": 1}')
+
+        session.get = get
+
+        async def main():
+            api = AsyncZaifPublicApi(session=session, cache=True)
+            return await asyncio.gather(*(api.ticker("btc_jpy") for _ in range(3)))
+
+        results = asyncio.run(main())
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"last": 1}] * 3)
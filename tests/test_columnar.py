@@ -0,0 +1,113 @@
+import unittest
+from zaifapi import columnar
+from zaifapi.models import Orders, Trades
+
+TRADES = [
+    {
+        "date": 1600000000,
+        "price": 1100000,
+        "amount": 0.01,
+        "tid": 10,
+        "currency_pair": "btc_jpy",
+        "trade_type": "bid",
+    },
+    {
+        "date": 1600000001,
+        "price": 1100005.5,
+        "amount": 0.02,
+        "tid": 11,
+        "currency_pair": "btc_jpy",
+        "trade_type": "ask",
+    },
+]
+
+HISTORY = {
+    "182": {
+        "currency_pair": "btc_jpy",
+        "action": "bid",
+        "amount": 0.03,
+        "price": 56000,
+        "fee": 0,
+        "your_action": "ask",
+        "bonus": None,
+        "timestamp": "1402018713",
+        "comment": "demo",
+    },
+    "183": {
+        "currency_pair": "btc_jpy",
+        "action": "ask",
+        "amount": 0.5,
+        "price": 57000,
+        "fee": 10.5,
+        "your_action": "ask",
+        "bonus": 1.2,
+        "timestamp": "1402018800",
+        "comment": "",
+    },
+}
+
+DEPTH = {"asks": [[1100010, 0.5], [1100020, 1.0]], "bids": [[1100000, 0.2]]}
+
+
+class TestColumns(unittest.TestCase):
+    def test_trades_columns_reuse_table_buffers(self):
+        trades = Trades(TRADES)
+        columns = columnar.trades_columns(trades)
+        self.assertIs(columns["price"], trades.column("price"))
+        self.assertEqual(list(columns["tid"]), [10, 11])
+        self.assertEqual(memoryview(columns["price"]).format, "d")
+
+    def test_trade_history_columns_from_raw(self):
+        columns = columnar.trade_history_columns(HISTORY)
+        self.assertEqual(list(columns["id"]), [182, 183])
+        self.assertEqual(list(columns["bonus"]), [None, 1.2])
+
+    def test_depth_columns(self):
+        columns = columnar.depth_columns(DEPTH)
+        self.assertEqual(list(columns["asks"]["price"]), [1100010, 1100020])
+        self.assertEqual(list(columns["bids"]["amount"]), [0.2])
+
+
+@unittest.skipIf(columnar.np is None, "numpy is not installed")
+class TestNumpy(unittest.TestCase):
+    def test_trades_to_numpy(self):
+        result = columnar.trades_to_numpy(TRADES)
+        self.assertEqual(result.dtype["tid"].str, "<i8")
+        self.assertEqual(result.dtype["price"].str, "<f8")
+        self.assertEqual(result["price"].tolist(), [1100000.0, 1100005.5])
+        self.assertEqual(result["trade_type"].tolist(), ["bid", "ask"])
+
+    def test_trade_history_to_numpy(self):
+        result = columnar.trade_history_to_numpy(Orders.from_json(HISTORY))
+        self.assertEqual(result["id"].tolist(), [182, 183])
+        self.assertEqual(result["timestamp"].tolist(), [1402018713.0, 1402018800.0])
+        self.assertTrue(columnar.np.isnan(result["bonus"][0]))
+        self.assertEqual(result["bonus"][1], 1.2)
+        self.assertEqual(result["comment"].tolist(), ["demo", ""])
+
+    def test_depth_to_numpy(self):
+        result = columnar.depth_to_numpy(DEPTH)
+        self.assertEqual(result["asks"]["amount"].tolist(), [0.5, 1.0])
+        self.assertEqual(len(result["bids"]), 1)
+
+    def test_empty(self):
+        result = columnar.trades_to_numpy([])
+        self.assertEqual(len(result), 0)
+        self.assertIn("price", result.dtype.names)
+
+
+@unittest.skipIf(columnar.pd is None, "pandas is not installed")
+class TestDataFrame(unittest.TestCase):
+    def test_trades_to_dataframe(self):
+        frame = columnar.trades_to_dataframe(TRADES)
+        self.assertEqual(frame["tid"].tolist(), [10, 11])
+
+    def test_trade_history_to_dataframe(self):
+        frame = columnar.trade_history_to_dataframe(HISTORY)
+        self.assertEqual(frame.index.tolist(), [182, 183])
+
+
+class TestMissingDependency(unittest.TestCase):
+    def test_require_raises(self):
+        with self.assertRaises(ImportError):
+            columnar._require(None, "pandas")
@@ -0,0 +1,39 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import MagicMock
+from zaifapi import ZaifPublicApi, ZaifTradeApi
+from zaifapi.api_common import JsonDecoder, DECIMAL_DECODER
+
+PAYLOAD = b'{"asks": [[4100000.5, 0.0123]], "bids": [[4099999, 1e-08]], "last": "x"}'
+
+
+class TestJsonDecoder(unittest.TestCase):
+    def test_decoders_agree(self):
+        expected = JsonDecoder(use_orjson=False).decode(PAYLOAD)
+        self.assertEqual(JsonDecoder().decode(PAYLOAD), expected)
+        self.assertEqual(JsonDecoder().decode(PAYLOAD.decode()), expected)
+        self.assertEqual(JsonDecoder(use_orjson=False).decode(memoryview(PAYLOAD)), expected)
+
+    def test_decimal(self):
+        result = DECIMAL_DECODER.decode(PAYLOAD)
+        self.assertEqual(result["asks"][0], [Decimal("4100000.5"), Decimal("0.0123")])
+        self.assertEqual(result["bids"][0], [4099999, Decimal("1E-8")])
+        self.assertIsInstance(result["bids"][0][0], int)
+
+    def test_public_api_decoder(self):
+        api = ZaifPublicApi(decoder=DECIMAL_DECODER)
+        api._session = MagicMock()
+        api._session.get.return_value = MagicMock(status_code=200, content=b'{"last_price": 0.1}')
+        self.assertEqual(api.last_price("btc_jpy"), {"last_price": Decimal("0.1")})
+
+    def test_trade_api_decoder(self):
+        api = ZaifTradeApi("key", "secret", decoder=DECIMAL_DECODER)
+        api._session = MagicMock()
+        api._session.post.return_value = MagicMock(
+            status_code=200, content=b'{"success": 1, "return": {"funds": {"btc": 0.3}}}'
+        )
+        self.assertEqual(api.get_info(), {"funds": {"btc": Decimal("0.3")}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import asyncio
+import unittest
+from zaifapi.api_common import perform, run_flow, run_flow_async
+
+
+def _flow(effect):
+    try:
+        value = yield from perform(effect)
+    except ValueError as e:
+        return "handled {}".format(e)
+    return value * 2
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+class TestFlow(unittest.TestCase):
+    def test_sync_driver(self):
+        self.assertEqual(run_flow(_flow(lambda: 21)), 42)
+        self.assertEqual(run_flow(_flow(_fail)), "handled boom")
+
+    def test_async_driver(self):
+        async def value():
+            return 21
+
+        async def fail():
+            _fail()
+
+        self.assertEqual(asyncio.run(run_flow_async(_flow(value))), 42)
+        self.assertEqual(asyncio.run(run_flow_async(_flow(fail))), "handled boom")
+
+    def test_unhandled_errors_propagate(self):
+        def flow():
+            yield _fail
+
+        with self.assertRaises(ValueError):
+            run_flow(flow())
+
+
+if __name__ == "__main__":
+    unittest.main()
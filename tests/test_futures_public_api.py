@@ -13,14 +13,14 @@ class TestPublicApi(unittest.TestCase):
     def setUp(self):
         self.response = MagicMock()
         self.response.status_code = 200
-        self.response.text = "{}"
+        self.response.content = b"{}"
         self.assertEqual(self.api._url.get_absolute_url(), "https://api.zaif.jp/test_futures/1")
 
     def tearDown(self):
         self.assertEqual(self.api._url.get_absolute_url(), "https://api.zaif.jp/test_futures/1")
 
     def test_last_price(self):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             currency_pair = "test_jpy"
             mock_get.return_value = self.response
             self.api.last_price(currency_pair=currency_pair, group_id=17)
@@ -29,7 +29,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_ticker(self):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             currency_pair = "test_jpy"
             mock_get.return_value = self.response
             self.api.ticker(currency_pair=currency_pair, group_id="all")
@@ -38,7 +38,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_trades(self):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             currency_pair = "test_jpy"
             mock_get.return_value = self.response
             self.api.trades(currency_pair=currency_pair, group_id=1212)
@@ -47,7 +47,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_depth(self):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             currency_pair = "test_jpy"
             mock_get.return_value = self.response
             self.api.depth(currency_pair=currency_pair, group_id="group_id")
@@ -56,7 +56,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_groups(self):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_get.return_value = self.response
             self.api.groups(group_id=3)
             mock_get.assert_called_once_with(
@@ -64,7 +64,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_swap_history(self):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             currency_pair = "test_jpy"
             mock_get.return_value = self.response
             self.api.swap_history(currency_pair=currency_pair, group_id=3, page=5)
@@ -73,7 +73,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_swap_history_missing_page_arg(self):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             currency_pair = "test_jpy"
             mock_get.return_value = self.response
             self.api.swap_history(currency_pair=currency_pair, group_id=3)
@@ -82,7 +82,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_swap_history_with_invalid_page_arg(self):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             currency_pair = "test_jpy"
             mock_get.return_value = self.response
             # page argument is invalid type
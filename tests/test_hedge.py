@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from zaifapi import AsyncZaifPublicApi, ZaifPublicApi
+from zaifapi.api_common import HedgePolicy
+from zaifapi.api_common.async_session import AsyncResponse
+from zaifapi.api_error import ZaifServerException
+
+FAST = b'{"last_price": 2}'
+SLOW = b'{"last_price": 1}'
+
+
+def _policy(**kwargs):
+    return HedgePolicy(initial_delay=0.01, **kwargs)
+
+
+class SlowThenFast:
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, params=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+            first = self.calls == 1
+        if first:
+            self.release.wait(5)
+            return MagicMock(status_code=200, content=SLOW)
+        return MagicMock(status_code=200, content=FAST)
+
+
+class TestHedgePolicy(unittest.TestCase):
+    def test_delay_follows_latency_percentile(self):
+        policy = HedgePolicy(quantile=0.9, min_samples=10, min_delay=0.001, max_delay=0.5)
+        self.assertEqual(policy.delay("depth"), policy.initial_delay)
+        for i in range(100):
+            policy.observe("depth", 0.01 if i < 90 else 0.2)
+        self.assertAlmostEqual(policy.delay("depth"), 0.01, delta=0.001)
+        for _ in range(100):
+            policy.observe("depth", 2.0)
+        self.assertEqual(policy.delay("depth"), 0.5)
+
+    def test_window_resets_histogram(self):
+        policy = HedgePolicy(min_samples=5, window=20, min_delay=0, max_delay=10)
+        for _ in range(20):
+            policy.observe("ticker", 1.0)
+        for _ in range(20):
+            policy.observe("ticker", 0.001)
+        self.assertLess(policy.delay("ticker"), 0.01)
+
+
+class TestHedgedPublicApi(unittest.TestCase):
+    def test_hedge_wins_over_slow_primary(self):
+        api = ZaifPublicApi(hedge=_policy())
+        get = SlowThenFast()
+        try:
+            with patch("requests.Session.get", side_effect=get):
+                self.assertEqual(api.depth("btc_jpy"), {"last_price": 2})
+        finally:
+            get.release.set()
+        self.assertEqual(get.calls, 2)
+        stats = api.hedge_stats()["depth"]
+        self.assertEqual((stats["requests"], stats["fired"], stats["won"]), (1, 1, 1))
+
+    def test_running_loser_is_counted_until_it_finishes(self):
+        api = ZaifPublicApi(hedge=_policy())
+        get = SlowThenFast()
+        try:
+            with patch("requests.Session.get", side_effect=get):
+                api.depth("btc_jpy")
+                self.assertEqual(api.hedge_stats()["depth"]["losers"], 1)
+                get.release.set()
+                api._hedge._executor.shutdown(wait=True)
+        finally:
+            get.release.set()
+        self.assertEqual(api.hedge_stats()["depth"]["losers"], 0)
+
+    def test_in_flight_cap_falls_back_to_plain_request(self):
+        api = ZaifPublicApi(hedge=_policy(max_in_flight=1))
+        get = SlowThenFast()
+        timer = threading.Timer(0.05, get.release.set)
+        timer.start()
+        try:
+            with patch("requests.Session.get", side_effect=get):
+                self.assertEqual(api.depth("btc_jpy"), {"last_price": 1})
+                self.assertEqual(api.depth("btc_jpy"), {"last_price": 2})
+        finally:
+            timer.cancel()
+            get.release.set()
+        stats = api.hedge_stats()["depth"]
+        self.assertEqual((stats["requests"], stats["fired"], stats["skipped"]), (2, 0, 1))
+
+    def test_fast_primary_does_not_hedge(self):
+        api = ZaifPublicApi(hedge=HedgePolicy(initial_delay=5))
+        response = MagicMock(status_code=200, content=FAST)
+        with patch("requests.Session.get", return_value=response) as mock_get:
+            api.ticker("btc_jpy")
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(api.hedge_stats()["ticker"]["fired"], 0)
+
+    def test_failed_primary_falls_back_to_hedge(self):
+        api = ZaifPublicApi(hedge=_policy())
+        responses = iter([(0.05, 502, SLOW), (0.1, 200, FAST)])
+        lock = threading.Lock()
+
+        def get(url, params=None, **kwargs):
+            with lock:
+                delay, status, content = next(responses)
+            time.sleep(delay)
+            return MagicMock(status_code=status, content=content)
+
+        with patch("requests.Session.get", side_effect=get):
+            self.assertEqual(api.depth("btc_jpy"), {"last_price": 2})
+        self.assertEqual(api.hedge_stats()["depth"]["won"], 1)
+
+    def test_both_failing_raises(self):
+        api = ZaifPublicApi(hedge=HedgePolicy(initial_delay=0))
+        response = MagicMock(status_code=503, content=b"")
+        with patch("requests.Session.get", return_value=response):
+            with self.assertRaises(ZaifServerException):
+                api.depth("btc_jpy")
+
+    def test_hedge_waits_for_rate_limit(self):
+        limiter = MagicMock()
+        api = ZaifPublicApi(hedge=_policy(), rate_limiter=limiter)
+        get = SlowThenFast()
+        try:
+            with patch("requests.Session.get", side_effect=get):
+                api.depth("btc_jpy")
+        finally:
+            get.release.set()
+        self.assertEqual(limiter.acquire.call_count, 2)
+
+    def test_other_endpoints_are_not_hedged(self):
+        api = ZaifPublicApi(hedge=HedgePolicy(initial_delay=0))
+        response = MagicMock(status_code=200, content=b"[]")
+        with patch("requests.Session.get", return_value=response) as mock_get:
+            api.trades("btc_jpy")
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(api.hedge_stats(), {})
+
+
+class TestAsyncHedge(unittest.TestCase):
+    def test_slow_primary_is_cancelled(self):
+        api = AsyncZaifPublicApi(hedge=_policy())
+        cancelled = []
+
+        async def get(url, params=None, **kwargs):
+            if not cancelled:
+                cancelled.append(False)
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled[0] = True
+                    raise
+                return AsyncResponse(200, SLOW)
+            return AsyncResponse(200, FAST)
+
+        async def run():
+            with patch.object(api._session, "get", get):
+                result = await api.depth("btc_jpy")
+                await asyncio.sleep(0)
+                return result
+
+        self.assertEqual(asyncio.run(run()), {"last_price": 2})
+        self.assertEqual(cancelled, [True])
+        self.assertEqual(api.hedge_stats()["depth"]["won"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import socket
+import unittest
+from unittest.mock import MagicMock, patch
+from zaifapi import ZaifPublicApi, ZaifTradeApi
+from zaifapi.api_common import NULL_TRACE, Histogram, Instrumentation, StatsdEmitter
+from tests.helpers import response
+
+
+class TestHistogram(unittest.TestCase):
+    def test_percentiles_within_precision(self):
+        histogram = Histogram()
+        for micros in range(1, 10001):
+            histogram.record(micros * 1e-6)
+        self.assertEqual(histogram.count, 10000)
+        for quantile in (0.5, 0.9, 0.99):
+            expected = quantile * 10000 * 1e-6
+            self.assertAlmostEqual(histogram.percentile(quantile), expected, delta=expected * 0.02)
+        self.assertEqual(histogram.percentile(1.0), histogram.max)
+        self.assertAlmostEqual(histogram.mean, 5000.5e-6)
+
+    def test_empty(self):
+        self.assertEqual(Histogram().percentile(0.99), 0.0)
+        self.assertEqual(Histogram().as_dict()["min"], 0.0)
+
+
+class TestInstrumentedApi(unittest.TestCase):
+    def test_disabled_uses_null_trace(self):
+        self.assertIs(ZaifPublicApi()._start_trace("ticker"), NULL_TRACE)
+
+    def test_public_phases_and_hooks(self):
+        instrumentation = Instrumentation()
+        pre, post = MagicMock(), MagicMock()
+        instrumentation.add_hook(pre=pre, post=post)
+        api = ZaifPublicApi(instrumentation=instrumentation)
+        with patch("requests.Session.get", return_value=response()):
+            result = api.ticker("btc_jpy")
+        trace = pre.call_args.args[0]
+        post.assert_called_once_with(trace, result)
+        self.assertEqual((trace.api, trace.endpoint), ("api", "ticker"))
+        self.assertEqual(set(trace.phases), {"validation", "rate_limit", "network", "decoding"})
+        self.assertGreaterEqual(trace.elapsed, sum(trace.phases.values()) - 1e-9)
+        snapshot = instrumentation.snapshot()["api.ticker"]
+        self.assertEqual(snapshot["total"]["count"], 1)
+
+    def test_trade_phases_include_signing(self):
+        instrumentation = Instrumentation()
+        api = ZaifTradeApi("key", "secret", instrumentation=instrumentation)
+        with patch("requests.Session.post") as mock_post:
+            mock_post.return_value = response(b'{"success": 1, "return": {}}')
+            api.get_info()
+        phases = instrumentation.snapshot()["tapi.get_info"]
+        self.assertEqual(
+            set(phases), {"validation", "signing", "rate_limit", "network", "decoding", "total"}
+        )
+
+    def test_error_hook(self):
+        instrumentation = Instrumentation()
+        error = MagicMock()
+        instrumentation.add_hook(error=error)
+        api = ZaifPublicApi(instrumentation=instrumentation)
+        with patch("requests.Session.get", return_value=response(b"", 500)):
+            with self.assertRaises(Exception) as context:
+                api.last_price("btc_jpy")
+        self.assertIs(error.call_args.args[1], context.exception)
+        self.assertIn(
+            'zaifapi_request_errors_total{api="api",endpoint="last_price"} 1',
+            instrumentation.prometheus_text(),
+        )
+
+    def test_prometheus_text(self):
+        instrumentation = Instrumentation()
+        api = ZaifPublicApi(instrumentation=instrumentation)
+        with patch("requests.Session.get", return_value=response()):
+            api.ticker("btc_jpy")
+            api.ticker("btc_jpy")
+        text = instrumentation.prometheus_text()
+        self.assertIn("# TYPE zaifapi_request_seconds summary", text)
+        self.assertIn(
+            'zaifapi_request_seconds_count{api="api",endpoint="ticker",phase="network"} 2', text
+        )
+        self.assertIn('endpoint="ticker",phase="total",quantile="0.99"}', text)
+
+
+class TestStatsdEmitter(unittest.TestCase):
+    def test_emits_timings(self):
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(("127.0.0.1", 0))
+        receiver.settimeout(1)
+        instrumentation = Instrumentation(histograms=False)
+        emitter = StatsdEmitter(port=receiver.getsockname()[1]).attach(instrumentation)
+        api = ZaifPublicApi(instrumentation=instrumentation)
+        try:
+            with patch("requests.Session.get", return_value=response()):
+                api.ticker("btc_jpy")
+            lines = receiver.recv(4096).decode().splitlines()
+        finally:
+            emitter.close()
+            receiver.close()
+        self.assertTrue(any(line.startswith("zaifapi.api.ticker.network:") for line in lines))
+        self.assertTrue(lines[-1].startswith("zaifapi.api.ticker.total:"))
+        self.assertTrue(all(line.endswith("|ms") for line in lines))
+        self.assertEqual(instrumentation.snapshot(), {})
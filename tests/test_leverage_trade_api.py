@@ -15,14 +15,14 @@ class TestPublicApi(unittest.TestCase):
     def setUp(self):
         self.response = MagicMock()
         self.response.status_code = 200
-        self.response.text = '{"success": 1, "return": "return"}'
+        self.response.content = b'{"success": 1, "return": "return"}'
         self.assertEqual(self.api._url.get_absolute_url(), "https://test_leverage_trade.com/tlapi")
 
     def tearDown(self):
         self.assertEqual(self.api._url.get_absolute_url(), "https://test_leverage_trade.com/tlapi")
 
     def test_get_positions(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.get_positions(
                 type="futures",
@@ -55,7 +55,7 @@ class TestPublicApi(unittest.TestCase):
             self.assertDictEqual(mock_post.call_args[1]["headers"], {"key": "key", "sign": "sign"})
 
     def test_position_history(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.position_history(type="futures", group_id=1, leverage_id=12)
 
@@ -72,7 +72,7 @@ class TestPublicApi(unittest.TestCase):
             self.assertDictEqual(mock_post.call_args[1]["headers"], {"key": "key", "sign": "sign"})
 
     def test_active_positions(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.active_positions(type="futures", group_id=1, currency_pair="test_jpy")
 
@@ -89,7 +89,7 @@ class TestPublicApi(unittest.TestCase):
             self.assertDictEqual(mock_post.call_args[1]["headers"], {"key": "key", "sign": "sign"})
 
     def test_create_position(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.create_position(
                 type="futures",
@@ -122,7 +122,7 @@ class TestPublicApi(unittest.TestCase):
             self.assertDictEqual(mock_post.call_args[1]["headers"], {"key": "key", "sign": "sign"})
 
     def test_change_position(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.change_position(
                 type="futures", group_id=1, price=12345, leverage_id=5, limit=123, stop=12345566
@@ -144,7 +144,7 @@ class TestPublicApi(unittest.TestCase):
             self.assertDictEqual(mock_post.call_args[1]["headers"], {"key": "key", "sign": "sign"})
 
     def test_cancel_position(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.cancel_position(type="futures", group_id=1, leverage_id=5)
 
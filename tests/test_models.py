@@ -0,0 +1,122 @@
+import unittest
+from array import array
+from decimal import Decimal
+from unittest.mock import MagicMock
+from zaifapi import ZaifPublicApi, ZaifTradeApi
+from zaifapi.models import DepthSnapshot, Order, Orders, Ticker, Trade, Trades
+
+TRADES = [
+    {
+        "date": 1600000000,
+        "price": 1100000,
+        "amount": 0.01,
+        "tid": 10,
+        "currency_pair": "btc_jpy",
+        "trade_type": "bid",
+    },
+    {
+        "date": 1600000001,
+        "price": 1100005.5,
+        "amount": 0.02,
+        "tid": 11,
+        "currency_pair": "btc_jpy",
+        "trade_type": "ask",
+    },
+]
+
+HISTORY = {
+    "182": {
+        "currency_pair": "btc_jpy",
+        "action": "bid",
+        "amount": 0.1,
+        "price": 1100000,
+        "fee": 0,
+        "your_action": "ask",
+        "bonus": 0,
+        "timestamp": "1600000000",
+        "comment": "demo",
+    }
+}
+
+
+class TestModels(unittest.TestCase):
+    def test_trades_are_columnar(self):
+        trades = Trades.from_json(TRADES)
+        self.assertEqual(len(trades), 2)
+        self.assertIsInstance(trades.column("price"), array)
+        self.assertEqual(trades[1].tid, 11)
+        self.assertEqual(trades[-1].trade_type, "ask")
+        self.assertEqual([trade.price for trade in trades], [1100000.0, 1100005.5])
+        self.assertEqual(trades[:1], [Trade(**TRADES[0])])
+        with self.assertRaises(IndexError):
+            trades[2]
+        self.assertFalse(hasattr(trades[0], "__dict__"))
+
+    def test_decimal_values_are_kept(self):
+        trades = Trades([dict(TRADES[0], price=Decimal("1.1"))])
+        self.assertEqual(trades[0].price, Decimal("1.1"))
+
+    def test_orders_mapping(self):
+        orders = Orders.from_json(HISTORY)
+        self.assertIn(182, orders)
+        self.assertIn("182", orders)
+        self.assertEqual(list(orders), [182])
+        order = orders["182"]
+        self.assertIsInstance(order, Order)
+        self.assertEqual((order.id, order.your_action, order.timestamp), (182, "ask", "1600000000"))
+
+    def test_extra_columns(self):
+        trades = Trades(TRADES, currency_pair="xem_jpy")
+        self.assertEqual(trades.column("currency_pair"), ["xem_jpy", "xem_jpy"])
+        self.assertEqual(TRADES[0]["currency_pair"], "btc_jpy")
+        orders = Orders(HISTORY, comment="tagged")
+        self.assertEqual((orders[182].id, orders[182].comment), (182, "tagged"))
+        self.assertNotIn("id", HISTORY["182"])
+
+    def test_token_both_orders(self):
+        result = Orders.from_json({"active_orders": HISTORY, "token_active_orders": {}})
+        self.assertEqual(len(result["active_orders"]), 1)
+        self.assertEqual(len(result["token_active_orders"]), 0)
+
+    def test_depth_snapshot(self):
+        depth = DepthSnapshot.from_json({"asks": [[2, 1], [3, 1]], "bids": [[1, 5]]})
+        self.assertEqual(depth.best_ask, (2.0, 1.0))
+        self.assertEqual(depth.best_bid, (1.0, 5.0))
+        self.assertEqual(depth.asks, [(2.0, 1.0), (3.0, 1.0)])
+
+
+class TestTypedClients(unittest.TestCase):
+    def test_public_typed(self):
+        api = ZaifPublicApi(typed=True)
+        api._session = MagicMock()
+        api._session.get.return_value = MagicMock(
+            status_code=200,
+            content=b'{"last": 1, "high": 2, "low": 0.5, "vwap": 1, "volume": 9,'
+            b' "bid": 1, "ask": 1.1}',
+        )
+        ticker = api.ticker("btc_jpy")
+        self.assertIsInstance(ticker, Ticker)
+        self.assertEqual(ticker.ask, 1.1)
+        api._session.get.return_value = MagicMock(status_code=200, content=b'{"last_price": 1}')
+        self.assertEqual(api.last_price("btc_jpy"), {"last_price": 1})
+
+    def test_untyped_by_default(self):
+        api = ZaifPublicApi()
+        api._session = MagicMock()
+        api._session.get.return_value = MagicMock(status_code=200, content=b"[]")
+        self.assertEqual(api.trades("btc_jpy"), [])
+
+    def test_trade_history_typed(self):
+        api = ZaifTradeApi("key", "secret", typed=True)
+        api._session = MagicMock()
+        api._session.post.return_value = MagicMock(
+            status_code=200, content=b'{"success": 1, "return": {"5": {"action": "bid"}}}'
+        )
+        self.assertEqual(api.trade_history()[5].action, "bid")
+        self.assertEqual(
+            [(id_, order.action) for id_, order in api.iter_trade_history()], [(5, "bid")]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
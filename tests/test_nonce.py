@@ -0,0 +1,89 @@
+import os
+import tempfile
+import threading
+import unittest
+from decimal import Decimal
+from unittest.mock import patch, MagicMock
+from urllib.parse import parse_qs
+from zaifapi import ZaifLeverageTradeApi, ZaifTokenTradeApi, ZaifTradeApi
+from zaifapi.api_common import NonceGenerator, FileNonceGenerator, get_nonce_generator
+from zaifapi.api_error import ZaifApiNonceError
+
+
+class TestNonceGenerator(unittest.TestCase):
+    def test_format(self):
+        with patch("time.time", return_value=1500000000.25):
+            self.assertEqual(str(NonceGenerator().next()), "1500000000.250000")
+
+    def test_clock_step_backwards(self):
+        generator = NonceGenerator()
+        with patch("time.time", return_value=1500000001.0):
+            first = generator.next()
+        with patch("time.time", return_value=1500000000.0):
+            second = generator.next()
+        self.assertEqual(second - first, Decimal("0.000001"))
+
+    def test_unique_across_threads(self):
+        generator = NonceGenerator()
+        nonces = []
+
+        def worker():
+            nonces.extend(generator.next() for _ in range(1000))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(nonces)), 8000)
+
+    def test_file_generator_shares_state(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "nonce")
+            first, second = FileNonceGenerator(path), FileNonceGenerator(path)
+            with patch("time.time", return_value=1500000000.0):
+                nonces = [first.next(), second.next(), first.next()]
+            self.assertEqual(nonces, sorted(set(nonces)))
+
+    def test_generator_shared_per_key(self):
+        self.assertIs(get_nonce_generator("k1"), get_nonce_generator("k1"))
+        self.assertIsNot(get_nonce_generator("k1"), get_nonce_generator("k2"))
+        trade = ZaifTradeApi("shared_key", "secret")
+        leverage = ZaifLeverageTradeApi("shared_key", "secret")
+        self.assertIs(trade._nonce, leverage._nonce)
+        self.assertIs(trade._send_lock, leverage._send_lock)
+
+    def test_send_lock_keyed_by_token(self):
+        first = ZaifTokenTradeApi(token="token1")
+        self.assertIs(first._send_lock, ZaifTokenTradeApi(token="token1")._send_lock)
+        self.assertIsNot(first._send_lock, ZaifTokenTradeApi(token="token2")._send_lock)
+
+
+class TestNonceRetry(unittest.TestCase):
+    def setUp(self):
+        self.api = ZaifTradeApi("key", "secret", nonce_retries=1)
+        self.nonce_error = MagicMock(
+            status_code=200, content=b'{"success": 0, "error": "nonce out of range"}'
+        )
+        self.success = MagicMock(status_code=200, content=b'{"success": 1, "return": "ok"}')
+
+    def test_retry_with_new_nonce(self):
+        with patch("requests.Session.post") as mock_post:
+            mock_post.side_effect = [self.nonce_error, self.success]
+            self.assertEqual(self.api.trade_history(from_num=1), "ok")
+            sent = [parse_qs(call[1]["data"]) for call in mock_post.call_args_list]
+            self.assertLess(Decimal(sent[0]["nonce"][0]), Decimal(sent[1]["nonce"][0]))
+            self.assertEqual(sent[1]["from"], ["1"])
+            signs = [call[1]["headers"]["sign"] for call in mock_post.call_args_list]
+            self.assertNotEqual(signs[0], signs[1])
+
+    def test_give_up(self):
+        with patch("requests.Session.post") as mock_post:
+            mock_post.return_value = self.nonce_error
+            with self.assertRaises(ZaifApiNonceError):
+                self.api.get_info()
+            self.assertEqual(mock_post.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,220 @@
+import asyncio
+import itertools
+import unittest
+from zaifapi import OrderTracker
+from zaifapi.exchange_api.pagination import MAX_COUNT, aiter_history, iter_history
+from zaifapi.order_tracker import CANCELLED, CLOSED, FILLED, OPEN
+
+
+class FakeTradeApi:
+    def __init__(self):
+        self.active = {}
+        self.history = {}
+        self.calls = []
+        self._order_ids = itertools.count(100)
+        self._trade_ids = itertools.count(1)
+
+    def trade(self, currency_pair, action, price, amount, comment="", received=0):
+        self.calls.append(("trade", {}))
+        remains = amount - received
+        if received:
+            self.fill(currency_pair, action, price, received, comment)
+        order_id = next(self._order_ids) if remains else 0
+        if remains:
+            self.active[str(order_id)] = {
+                "currency_pair": currency_pair,
+                "action": action,
+                "price": price,
+                "amount": remains,
+                "timestamp": "1600000000",
+                "comment": comment,
+            }
+        return {"received": received, "remains": remains, "order_id": order_id, "funds": {}}
+
+    def cancel_order(self, order_id, **kwargs):
+        self.calls.append(("cancel_order", {}))
+        del self.active[str(order_id)]
+        return {"order_id": order_id, "funds": {}}
+
+    def fill(self, currency_pair, action, price, amount, comment="", order_id=None):
+        trade_id = next(self._trade_ids)
+        self.history[str(trade_id)] = {
+            "currency_pair": currency_pair,
+            "action": "ask" if action == "bid" else "bid",
+            "your_action": action,
+            "price": price,
+            "amount": amount,
+            "fee": 0,
+            "comment": comment,
+            "timestamp": "1600000000",
+        }
+        if order_id is not None:
+            order = self.active[str(order_id)]
+            order["amount"] -= amount
+            if order["amount"] <= 0:
+                del self.active[str(order_id)]
+        return trade_id
+
+    def active_orders(self, **params):
+        self.calls.append(("active_orders", params))
+        return {
+            key: dict(order)
+            for key, order in self.active.items()
+            if params.get("currency_pair") in (None, order["currency_pair"])
+        }
+
+    def trade_history(self, **params):
+        self.calls.append(("trade_history", params))
+        ids = sorted((int(key) for key in self.history), reverse=params["order"] == "DESC")
+        ids = [i for i in ids if i >= params.get("from_id", 0)]
+        ids = [i for i in ids if i <= params.get("end_id", i)]
+        return {str(i): self.history[str(i)] for i in ids[: params.get("count", MAX_COUNT)]}
+
+    def iter_trade_history(self, prefetch=True, **params):
+        return iter_history(self.trade_history, params, prefetch)
+
+
+class AsyncFakeTradeApi(FakeTradeApi):
+    async def active_orders(self, **params):
+        return super().active_orders(**params)
+
+    async def trade_history(self, **params):
+        return super().trade_history(**params)
+
+    async def trade(self, **params):
+        return super().trade(**params)
+
+    def iter_trade_history(self, prefetch=True, **params):
+        return aiter_history(self.trade_history, params, prefetch)
+
+
+ORDER = {"currency_pair": "btc_jpy", "action": "bid", "price": 4000000.0, "amount": 0.03}
+
+
+class TestOrderTracker(unittest.TestCase):
+    def setUp(self):
+        self.api = FakeTradeApi()
+        self.tracker = OrderTracker(self.api)
+        self.tracker.sync()
+
+    def test_first_sync_seeds_from_active_orders(self):
+        self.api.trade(**ORDER)
+        tracker = OrderTracker(self.api)
+        self.assertEqual(tracker.sync(), [])
+        self.assertEqual(len(tracker), 1)
+        self.assertEqual(tracker.last_trade_id, 0)
+
+    def test_trade_and_cancel(self):
+        order = self.tracker.trade(**ORDER)
+        self.assertEqual(order.status, OPEN)
+        self.assertIs(self.tracker.get(order.order_id), order)
+        self.assertEqual(self.tracker.open_orders("btc_jpy"), [order])
+        self.assertEqual(self.tracker.currency_pairs(), ["btc_jpy"])
+        self.assertIs(self.tracker.cancel_order(order_id=order.order_id), order)
+        self.assertEqual(order.status, CANCELLED)
+        self.assertNotIn(order.order_id, self.tracker)
+        self.assertEqual(self.tracker.open_orders("btc_jpy"), [])
+        self.assertIs(self.tracker.get(order.order_id), order)
+
+    def test_immediately_filled_order(self):
+        order = self.tracker.trade(received=0.03, **ORDER)
+        self.assertEqual(order.status, FILLED)
+        self.assertEqual(len(self.tracker), 0)
+
+    def test_sync_applies_fill_deltas(self):
+        order = self.tracker.trade(**ORDER)
+        self.api.fill("btc_jpy", "bid", 4000000.0, 0.01, order_id=order.order_id)
+        self.assertEqual(self.tracker.sync(), [order])
+        self.assertAlmostEqual(order.remaining, 0.02)
+        self.assertAlmostEqual(order.filled, 0.01)
+        self.assertEqual(self.api.calls[-1][1]["from_id"], 1)
+        self.assertEqual(self.tracker.sync(), [])
+        self.assertEqual(self.api.calls[-1][1]["from_id"], 2)
+        self.api.fill("btc_jpy", "bid", 4000000.0, 0.02, order_id=order.order_id)
+        self.tracker.sync()
+        self.assertEqual(order.status, FILLED)
+        self.assertEqual(order.fills, [1, 2])
+        self.assertEqual(len(self.tracker), 0)
+
+    def test_sync_does_not_refetch_active_orders(self):
+        self.tracker.trade(**ORDER)
+        self.api.calls.clear()
+        for _ in range(3):
+            self.tracker.sync()
+        self.assertEqual([name for name, _ in self.api.calls], ["trade_history"] * 3)
+
+    def test_partial_immediate_fill_is_not_double_counted(self):
+        order = self.tracker.trade(received=0.01, **ORDER)
+        resting = dict(ORDER, price=3990000.0)
+        other = self.tracker.trade(**resting)
+        self.assertAlmostEqual(order.remaining, 0.02)
+        self.tracker.sync()
+        self.assertAlmostEqual(order.remaining, 0.02)
+        self.assertAlmostEqual(other.remaining, 0.03)
+
+    def test_comment_disambiguates_orders_at_the_same_price(self):
+        first = self.tracker.trade(comment="a", **ORDER)
+        second = self.tracker.trade(comment="b", **ORDER)
+        self.api.fill("btc_jpy", "bid", 4000000.0, 0.01, "b", order_id=second.order_id)
+        self.tracker.sync()
+        self.assertAlmostEqual(first.remaining, 0.03)
+        self.assertAlmostEqual(second.remaining, 0.02)
+
+    def test_reconcile_closes_missing_orders(self):
+        kept = self.tracker.trade(**ORDER)
+        gone = self.tracker.trade(**dict(ORDER, currency_pair="xem_jpy", price=10.0))
+        external = self.api.trade(**dict(ORDER, price=3900000.0))
+        del self.api.active[str(gone.order_id)]
+        closed = self.tracker.reconcile()
+        self.assertEqual(closed, [gone])
+        self.assertEqual(gone.status, CLOSED)
+        self.assertIn(kept.order_id, self.tracker)
+        self.assertIn(external["order_id"], self.tracker)
+
+    def test_reconcile_closes_partially_filled_order_as_closed(self):
+        order = self.tracker.trade(**ORDER)
+        self.api.fill("btc_jpy", "bid", 4000000.0, 0.01, order_id=order.order_id)
+        self.tracker.sync()
+        del self.api.active[str(order.order_id)]
+        self.assertEqual(self.tracker.reconcile(), [order])
+        self.assertEqual(order.status, CLOSED)
+        self.assertEqual(order.fills, [1])
+        self.assertAlmostEqual(order.filled, 0.01)
+        self.assertAlmostEqual(order.remaining, 0.02)
+
+    def test_fill_matches_price_with_float_noise(self):
+        order = self.tracker.trade(**dict(ORDER, currency_pair="xem_jpy", price=0.3))
+        self.api.fill("xem_jpy", "bid", 0.1 + 0.2, 0.01, order_id=order.order_id)
+        self.assertEqual(self.tracker.sync(), [order])
+        self.assertAlmostEqual(order.remaining, 0.02)
+
+    def test_reconcile_scoped_to_currency_pair(self):
+        api = FakeTradeApi()
+        tracker = OrderTracker(api, currency_pair="btc_jpy")
+        tracker.sync()
+        other = tracker.record_trade(
+            dict(ORDER, currency_pair="xem_jpy"), {"received": 0, "remains": 1, "order_id": 9}
+        )
+        tracker.reconcile()
+        self.assertEqual(other.status, OPEN)
+        self.assertEqual(api.calls[-1], ("active_orders", {"currency_pair": "btc_jpy"}))
+
+
+class TestAsyncOrderTracker(unittest.TestCase):
+    def test_sync_async(self):
+        api = AsyncFakeTradeApi()
+        tracker = OrderTracker(api)
+
+        async def run():
+            await tracker.sync_async()
+            order = await tracker.trade_async(**ORDER)
+            api.fill("btc_jpy", "bid", 4000000.0, 0.03, order_id=order.order_id)
+            return order, await tracker.sync_async()
+
+        order, updated = asyncio.run(run())
+        self.assertEqual(updated, [order])
+        self.assertEqual(order.status, FILLED)
+
+
+if __name__ == "__main__":
+    unittest.main()
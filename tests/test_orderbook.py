@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import MagicMock
+from zaifapi import LocalOrderBook
+from zaifapi.models import DepthSnapshot
+from zaifapi.orderbook import LevelChange
+
+DEPTH = {
+    "asks": [[101.0, 1.0], [102.0, 2.0], [104.0, 3.0]],
+    "bids": [[100.0, 1.5], [99.0, 2.5], [97.0, 1.0]],
+}
+
+
+class TestLocalOrderBook(unittest.TestCase):
+    def setUp(self):
+        self.book = LocalOrderBook("btc_jpy", DEPTH)
+
+    def test_best_prices(self):
+        self.assertEqual(self.book.best_ask, (101.0, 1.0))
+        self.assertEqual(self.book.best_bid, (100.0, 1.5))
+        self.assertEqual(self.book.spread, 1.0)
+        self.assertEqual(self.book.bids(), [(100.0, 1.5), (99.0, 2.5), (97.0, 1.0)])
+        self.assertEqual(self.book.asks(), [(101.0, 1.0), (102.0, 2.0), (104.0, 3.0)])
+
+    def test_level_lookup(self):
+        self.assertEqual(self.book.amount_at("ask", 102), 2.0)
+        self.assertEqual(self.book.amount_at("bid", 98), 0.0)
+        with self.assertRaises(ValueError):
+            self.book.amount_at("buy", 100)
+
+    def test_depth_queries(self):
+        self.assertEqual(self.book.volume_within("ask", 102), 3.0)
+        self.assertEqual(self.book.volume_within("bid", 99), 4.0)
+        self.assertEqual(self.book.price_for_volume("ask", 2.0), (102.0, 101.5))
+        self.assertEqual(self.book.price_for_volume("bid", 1.5), (100.0, 100.0))
+        self.assertIsNone(self.book.price_for_volume("ask", 100))
+        for volume in (0, -1.0):
+            with self.assertRaises(ValueError):
+                self.book.price_for_volume("ask", volume)
+
+    def test_diff(self):
+        diff = self.book.update(
+            {
+                "asks": [[101.0, 1.0], [102.0, 0.5], [103.0, 1.0]],
+                "bids": [[100.0, 1.5], [99.0, 2.5], [97.0, 1.0]],
+                "last_price": {"price": 101.0, "action": "bid"},
+            }
+        )
+        self.assertEqual(
+            diff.asks,
+            [
+                LevelChange(102.0, 2.0, 0.5),
+                LevelChange(103.0, 0.0, 1.0),
+                LevelChange(104.0, 3.0, 0.0),
+            ],
+        )
+        self.assertEqual(diff.bids, [])
+        self.assertEqual(self.book.last_price["price"], 101.0)
+        self.assertFalse(self.book.update(self.book_snapshot()))
+
+    def book_snapshot(self):
+        return {"asks": self.book.asks(), "bids": self.book.bids()}
+
+    def test_follow_stream_seeded_from_api(self):
+        api = MagicMock()
+        api.depth.return_value = DEPTH
+        book = LocalOrderBook.from_api(api, "btc_jpy")
+        api.depth.assert_called_once_with("btc_jpy")
+        stream = [{"asks": [], "bids": [[100.0, 1.5]]}]
+        diffs = list(book.follow(stream))
+        self.assertEqual(len(diffs[0].asks), 3)
+        self.assertIsNone(book.best_ask)
+        self.assertIsNone(book.spread)
+
+    def test_typed_snapshot(self):
+        api = MagicMock()
+        api.depth.return_value = DepthSnapshot.from_json(DEPTH)
+        book = LocalOrderBook.from_api(api, "btc_jpy")
+        self.assertEqual(book.best_ask, (101.0, 1.0))
+        self.assertEqual(book.best_bid, (100.0, 1.5))
+        self.assertFalse(book.update(DepthSnapshot.from_json(DEPTH)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+from zaifapi import ZaifTradeApi, AsyncZaifLeverageTradeApi
+from zaifapi.api_error import ZaifApiValidationError
+from zaifapi.exchange_api.pagination import MAX_COUNT, iter_history
+
+
+class FakeHistory:
+    def __init__(self, ids):
+        self.ids = sorted(ids)
+        self.calls = []
+
+    def __call__(self, **params):
+        self.calls.append(params)
+        ids = [
+            id_
+            for id_ in self.ids
+            if params.get("from_id", 0) <= id_ <= params.get("end_id", float("inf"))
+        ]
+        if params["order"] == "DESC":
+            ids.reverse()
+        return {str(id_): {"id": id_} for id_ in ids[: params["count"]]}
+
+
+class TestIterHistory(unittest.TestCase):
+    def test_desc(self):
+        fetch = FakeHistory(range(1, 26))
+        result = [id_ for id_, _ in iter_history(fetch, {"count": 10})]
+        self.assertEqual(result, list(range(25, 0, -1)))
+        self.assertEqual([call.get("end_id") for call in fetch.calls], [None, 15, 5])
+
+    def test_asc(self):
+        fetch = FakeHistory(range(1, 21))
+        result = [id_ for id_, _ in iter_history(fetch, {"count": 10, "order": "ASC"}, False)]
+        self.assertEqual(result, list(range(1, 21)))
+        self.assertEqual([call.get("from_id") for call in fetch.calls], [None, 11, 21])
+
+    def test_from_id_bound(self):
+        fetch = FakeHistory(range(1, 21))
+        result = [id_ for id_, _ in iter_history(fetch, {"count": 5, "from_id": 11})]
+        self.assertEqual(result, list(range(20, 10, -1)))
+        self.assertEqual(len(fetch.calls), 2)
+
+    def test_count_is_capped(self):
+        fetch = FakeHistory([1])
+        list(iter_history(fetch, {"count": MAX_COUNT * 5}))
+        self.assertEqual(fetch.calls[0]["count"], MAX_COUNT)
+
+    def test_lazy(self):
+        fetch = FakeHistory(range(1, 101))
+        iterator = iter_history(fetch, {"count": 10}, prefetch=False)
+        self.assertEqual(fetch.calls, [])
+        next(iterator)
+        self.assertEqual(len(fetch.calls), 1)
+        iterator.close()
+
+    def test_from_num(self):
+        with self.assertRaises(ZaifApiValidationError):
+            next(iter_history(FakeHistory([]), {"from_num": 10}))
+
+
+class TestClientIterators(unittest.TestCase):
+    def test_iter_trade_history(self):
+        api = ZaifTradeApi("key", "secret")
+        fetch = FakeHistory(range(1, 8))
+        with patch.object(api, "trade_history", side_effect=fetch):
+            records = list(api.iter_trade_history(count=3, currency_pair="btc_jpy"))
+        self.assertEqual([id_ for id_, _ in records], list(range(7, 0, -1)))
+        self.assertTrue(all(call["currency_pair"] == "btc_jpy" for call in fetch.calls))
+
+    def test_async_iter_positions(self):
+        api = AsyncZaifLeverageTradeApi("key", "secret")
+        fetch = FakeHistory(range(1, 8))
+
+        async def get_positions(**params):
+            return fetch(**params)
+
+        async def collect():
+            return [id_ async for id_, _ in api.iter_positions(type="margin", count=3)]
+
+        with patch.object(api, "get_positions", side_effect=get_positions):
+            self.assertEqual(asyncio.run(collect()), list(range(7, 0, -1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
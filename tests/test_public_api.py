@@ -12,14 +12,14 @@ class TestPublicApi(unittest.TestCase):
     def setUp(self):
         self.response = MagicMock()
         self.response.status_code = 200
-        self.response.text = "{}"
+        self.response.content = b"{}"
         self.assertEqual(self.api._url.get_absolute_url(), "https://api.zaif.jp/test_public/1")
 
     def tearDown(self):
         self.assertEqual(self.api._url.get_absolute_url(), "https://api.zaif.jp/test_public/1")
 
     def test_last_price(self):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             currency_pair = "test_jpy"
             mock_get.return_value = self.response
             self.api.last_price(currency_pair=currency_pair)
@@ -28,7 +28,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_ticker(self):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             currency_pair = "test_jpy"
             mock_get.return_value = self.response
             self.api.ticker(currency_pair=currency_pair)
@@ -37,7 +37,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_trades(self):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             currency_pair = "test_jpy"
             mock_get.return_value = self.response
             self.api.trades(currency_pair=currency_pair)
@@ -46,7 +46,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_depth(self):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             currency_pair = "test_jpy"
             mock_get.return_value = self.response
             self.api.depth(currency_pair=currency_pair)
@@ -55,7 +55,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_currency_pairs(self):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             currency_pair = "test_jpy"
             mock_get.return_value = self.response
             self.api.currency_pairs(currency_pair=currency_pair)
@@ -64,7 +64,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_currency(self):
-        with patch("requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             currency_pair = "test_coin"
             mock_get.return_value = self.response
             self.api.currencies(currency=currency_pair)
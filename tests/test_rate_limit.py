@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from zaifapi import ZaifPublicApi, ZaifTradeApi
+from zaifapi.api_common import Budget, RateLimiter, PRIORITY_HIGH, PRIORITY_LOW
+from tests.helpers import FakeClock
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_burst_then_wait(self):
+        clock = FakeClock()
+        limiter = RateLimiter({"api": Budget(2)}, clock=clock)
+        lane = limiter._get_lane("api")
+        self.assertEqual(lane.bucket.take(), 0)
+        self.assertEqual(lane.bucket.take(), 0)
+        self.assertAlmostEqual(lane.bucket.take(), 0.5)
+        clock.now += 0.5
+        self.assertEqual(lane.bucket.take(), 0)
+
+    def test_unknown_group_is_unlimited(self):
+        limiter = RateLimiter({"api": Budget(1)})
+        for _ in range(10):
+            self.assertEqual(limiter.acquire("oauth"), 0.0)
+        self.assertEqual(limiter.stats(), {})
+
+    def test_throughput(self):
+        limiter = RateLimiter({"api": Budget(5, 0.1)})
+        started = time.monotonic()
+        for _ in range(10):
+            limiter.acquire("api")
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+        stats = limiter.stats()["api"][1]
+        self.assertEqual(stats["count"], 10)
+        self.assertGreater(stats["max"], 0)
+
+    def test_priority_lanes(self):
+        limiter = RateLimiter({"tapi": Budget(1, 0.05)})
+        limiter.acquire("tapi")
+        order = []
+        low_started = threading.Event()
+
+        def take(priority, name):
+            if priority == PRIORITY_LOW:
+                low_started.set()
+            limiter.acquire("tapi", priority)
+            order.append(name)
+
+        low = [threading.Thread(target=take, args=(PRIORITY_LOW, "low")) for _ in range(3)]
+        for thread in low:
+            thread.start()
+        low_started.wait()
+        while limiter.queue_length("tapi") < 3:
+            time.sleep(0.001)
+        high = threading.Thread(target=take, args=(PRIORITY_HIGH, "high"))
+        high.start()
+        for thread in low + [high]:
+            thread.join()
+        self.assertEqual(order[0], "high")
+
+    def test_acquire_async(self):
+        limiter = RateLimiter({"api": Budget(2, 0.05)})
+
+        async def run():
+            await asyncio.gather(*(limiter.acquire_async("api") for _ in range(4)))
+
+        asyncio.run(run())
+        self.assertEqual(limiter.stats()["api"][1]["count"], 4)
+        self.assertEqual(limiter.queue_length("api"), 0)
+
+
+class TestClientRateLimit(unittest.TestCase):
+    def test_public_calls_go_through_limiter(self):
+        limiter = MagicMock()
+        api = ZaifPublicApi(rate_limiter=limiter)
+        api._session = MagicMock()
+        api._session.get.return_value = MagicMock(status_code=200, content=b"{}")
+        api.ticker("btc_jpy")
+        limiter.acquire.assert_called_once_with("api", 1)
+
+    def test_trade_priorities(self):
+        limiter = MagicMock()
+        api = ZaifTradeApi("key", "secret", rate_limiter=limiter)
+        api._session = MagicMock()
+        api._session.post.return_value = MagicMock(
+            status_code=200, content=b'{"success": 1, "return": {}}'
+        )
+        api.cancel_order(order_id=1)
+        api.trade_history()
+        self.assertEqual(limiter.acquire.call_args_list[0][0], ("tapi", PRIORITY_HIGH))
+        self.assertEqual(limiter.acquire.call_args_list[1][0], ("tapi", PRIORITY_LOW))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+from urllib.parse import parse_qs
+import requests
+from zaifapi import AsyncZaifPublicApi, ZaifPublicApi, ZaifTradeApi
+from zaifapi.api_common import DEFAULT_TIMEOUT, CircuitBreaker, RetryPolicy, is_transient
+from zaifapi.api_common.async_session import AsyncResponse
+from zaifapi.api_common.retry import CLOSED, HALF_OPEN, OPEN
+from zaifapi.api_error import ZaifApiError, ZaifCircuitOpenError, ZaifServerException
+from tests.helpers import FakeClock, response
+
+NO_WAIT = RetryPolicy(retries=2, backoff=0)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_is_transient(self):
+        self.assertTrue(is_transient(ZaifServerException("bad gateway", 502)))
+        self.assertTrue(is_transient(ZaifServerException("too many requests", 429)))
+        self.assertTrue(is_transient(requests.ConnectionError()))
+        self.assertTrue(is_transient(requests.ReadTimeout()))
+        self.assertTrue(is_transient(asyncio.TimeoutError()))
+        self.assertFalse(is_transient(ZaifServerException("not found", 404)))
+        self.assertFalse(is_transient(ZaifApiError("insufficient funds")))
+        self.assertFalse(is_transient(ZaifCircuitOpenError("open")))
+
+    def test_exponential_backoff(self):
+        policy = RetryPolicy(retries=4, backoff=0.1, max_backoff=0.3, jitter=False)
+        error = requests.ConnectionError()
+        delays = [policy.next_delay(error, attempt) for attempt in range(5)]
+        self.assertEqual(delays, [0.1, 0.2, 0.3, 0.3, None])
+        self.assertIsNone(policy.next_delay(ZaifApiError("bad"), 0))
+
+    def test_jitter(self):
+        policy = RetryPolicy(backoff=0.1, random=lambda: 0.5)
+        self.assertAlmostEqual(policy.delay(1), 0.1)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=self.clock)
+        self.error = ZaifServerException("bad gateway", 502)
+
+    def test_trips_after_consecutive_failures(self):
+        self.breaker.record(self.error)
+        self.breaker.record()
+        self.breaker.record(self.error)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.record(self.error)
+        self.assertEqual(self.breaker.state, OPEN)
+        with self.assertRaises(ZaifCircuitOpenError):
+            self.breaker.before()
+        self.assertEqual(self.breaker.stats()["rejected"], 1)
+
+    def test_half_open_probe(self):
+        self.breaker.record(self.error)
+        self.breaker.record(self.error)
+        self.clock.now = 10
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.breaker.before()
+        with self.assertRaises(ZaifCircuitOpenError):
+            self.breaker.before()
+        self.breaker.record(self.error)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.clock.now = 20
+        self.breaker.before()
+        self.breaker.record()
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.stats()["trips"], 2)
+
+    def test_stale_probe_expires(self):
+        self.breaker.record(self.error)
+        self.breaker.record(self.error)
+        self.clock.now = 10
+        self.breaker.before()
+        self.clock.now = 15
+        with self.assertRaisesRegex(ZaifCircuitOpenError, "retry in 5.0s"):
+            self.breaker.before()
+        self.clock.now = 20
+        self.breaker.before()
+        self.breaker.record()
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_interrupted_probe_is_released(self):
+        self.breaker.record(self.error)
+        self.breaker.record(self.error)
+        self.clock.now = 10
+        self.breaker.before()
+        self.breaker.record(KeyboardInterrupt())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.breaker.before()
+
+    def test_api_errors_do_not_trip(self):
+        for _ in range(5):
+            self.breaker.record(ZaifApiError("insufficient funds"))
+        self.assertEqual(self.breaker.state, CLOSED)
+
+
+class TestPublicApiRetry(unittest.TestCase):
+    def test_retries_transient_errors(self):
+        api = ZaifPublicApi(retry=NO_WAIT)
+        responses = [
+            requests.ConnectionError(),
+            response(status_code=502),
+            response(b'{"last_price": 1}'),
+        ]
+        with patch("requests.Session.get", side_effect=responses) as mock_get:
+            self.assertEqual(api.last_price("btc_jpy"), {"last_price": 1})
+        self.assertEqual(mock_get.call_count, 3)
+
+    def test_gives_up_after_retries(self):
+        api = ZaifPublicApi(retry=NO_WAIT)
+        with patch("requests.Session.get", return_value=response(status_code=503)) as mock_get:
+            with self.assertRaises(ZaifServerException):
+                api.ticker("btc_jpy")
+        self.assertEqual(mock_get.call_count, 3)
+
+    def test_client_errors_are_not_retried(self):
+        api = ZaifPublicApi(retry=NO_WAIT)
+        with patch("requests.Session.get", return_value=response(status_code=404)) as mock_get:
+            with self.assertRaises(ZaifApiError):
+                api.ticker("btc_jpy")
+        self.assertEqual(mock_get.call_count, 1)
+
+    def test_circuit_breaker_fails_fast(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+        api = ZaifPublicApi(circuit_breaker=breaker)
+        with patch("requests.Session.get", return_value=response(status_code=502)) as mock_get:
+            for _ in range(2):
+                with self.assertRaises(ZaifServerException):
+                    api.ticker("btc_jpy")
+            with self.assertRaises(ZaifCircuitOpenError):
+                api.ticker("btc_jpy")
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(api.circuit_stats()["state"], OPEN)
+
+    def test_per_endpoint_timeout(self):
+        api = ZaifPublicApi(timeouts={"depth": 1.5})
+        with patch("requests.Session.get", return_value=response(status_code=200)) as mock_get:
+            api.depth("btc_jpy")
+            self.assertEqual(mock_get.call_args[1]["timeout"], 1.5)
+            api.ticker("btc_jpy")
+            self.assertNotIn("timeout", mock_get.call_args[1])
+
+    def test_plain_session_gets_default_timeout(self):
+        api = ZaifPublicApi(session=requests.Session())
+        with patch("requests.Session.get", return_value=response(status_code=200)) as mock_get:
+            api.ticker("btc_jpy")
+        self.assertEqual(mock_get.call_args[1]["timeout"], DEFAULT_TIMEOUT)
+
+
+class TestTradeApiRetry(unittest.TestCase):
+    def setUp(self):
+        self.api = ZaifTradeApi("key", "secret", retry=NO_WAIT)
+        self.success = response(b'{"success": 1, "return": {"order_id": 1}}')
+
+    def test_read_calls_are_retried_with_a_fresh_nonce(self):
+        responses = [requests.ReadTimeout(), self.success]
+        with patch("requests.Session.post", side_effect=responses) as mock_post:
+            self.api.get_info()
+        nonces = [parse_qs(call[1]["data"])["nonce"][0] for call in mock_post.call_args_list]
+        self.assertEqual(len(nonces), 2)
+        self.assertNotEqual(nonces[0], nonces[1])
+
+    def test_orders_are_never_retried(self):
+        with patch("requests.Session.post", side_effect=requests.ReadTimeout()) as mock_post:
+            with self.assertRaises(requests.ReadTimeout):
+                self.api.trade(currency_pair="btc_jpy", action="bid", price=100, amount=1)
+            with self.assertRaises(requests.ReadTimeout):
+                self.api.cancel_order(order_id=1)
+        self.assertEqual(mock_post.call_count, 2)
+
+    def test_timeout_is_passed_to_post(self):
+        api = ZaifTradeApi("key", "secret", timeouts={"trade": 2.0})
+        with patch("requests.Session.post", return_value=self.success) as mock_post:
+            api.trade(currency_pair="btc_jpy", action="bid", price=100, amount=1)
+        self.assertEqual(mock_post.call_args[1]["timeout"], 2.0)
+
+
+class TestAsyncRetry(unittest.TestCase):
+    def test_cancelled_probe_does_not_block_the_breaker(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+        api = AsyncZaifPublicApi(circuit_breaker=breaker)
+        breaker.record(ZaifServerException("bad gateway", 502))
+        clock.now = 10
+
+        async def hang(url, params=None, **kwargs):
+            await asyncio.sleep(5)
+
+        async def run():
+            with patch.object(api._session, "get", hang):
+                with self.assertRaises(asyncio.TimeoutError):
+                    await asyncio.wait_for(api.ticker("btc_jpy"), 0.01)
+            success = AsyncMock(return_value=AsyncResponse(200, b'{"last_price": 1}'))
+            with patch.object(api._session, "get", success):
+                return await api.ticker("btc_jpy")
+
+        self.assertEqual(asyncio.run(run()), {"last_price": 1})
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_async_public_retry(self):
+        api = AsyncZaifPublicApi(retry=NO_WAIT, circuit_breaker=True)
+        responses = [AsyncResponse(502, b""), AsyncResponse(200, b'{"last_price": 1}')]
+        with patch.object(api._session, "get", AsyncMock(side_effect=responses)) as get:
+            result = asyncio.run(api.last_price("btc_jpy"))
+        self.assertEqual(result, {"last_price": 1})
+        self.assertEqual(get.await_count, 2)
+        self.assertEqual(api.circuit_stats()["state"], CLOSED)
+
+
+if __name__ == "__main__":
+    unittest.main()
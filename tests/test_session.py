@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import requests
+from zaifapi import ZaifPublicApi, ZaifTokenApi, ZaifTradeApi
+from zaifapi.api_common import DEFAULT_TIMEOUT, ZaifSession
+
+
+class TestZaifSession(unittest.TestCase):
+    def test_adapter_pool_size(self):
+        session = ZaifSession(pool_connections=2, pool_maxsize=32)
+        adapter = session.get_adapter("https://api.zaif.jp")
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 32)
+
+    def test_default_timeout(self):
+        session = ZaifSession(timeout=1.5)
+        with patch("requests.Session.send") as mock_send:
+            mock_send.return_value = MagicMock(status_code=200)
+            session.get("https://api.zaif.jp/api/1/ticker/btc_jpy")
+            self.assertEqual(mock_send.call_args[1]["timeout"], 1.5)
+
+    def test_explicit_timeout(self):
+        session = ZaifSession(timeout=1.5)
+        with patch("requests.Session.send") as mock_send:
+            mock_send.return_value = MagicMock(status_code=200)
+            session.get("https://api.zaif.jp/api/1/ticker/btc_jpy", timeout=9)
+            self.assertEqual(mock_send.call_args[1]["timeout"], 9)
+
+    def test_plain_session_post_gets_default_timeout(self):
+        response = MagicMock(status_code=200, content=b'{"access_token": "t"}')
+        with patch("requests.Session.post", return_value=response) as mock_post:
+            ZaifTokenApi("id", "secret", session=requests.Session()).get_token("code")
+            self.assertEqual(mock_post.call_args[1]["timeout"], DEFAULT_TIMEOUT)
+            ZaifTokenApi("id", "secret", session=ZaifSession()).refresh_token("token")
+            self.assertNotIn("timeout", mock_post.call_args[1])
+
+    def test_session_is_reused(self):
+        api = ZaifPublicApi()
+        response = MagicMock(status_code=200, content=b"{}")
+        with patch.object(api._session, "get", return_value=response) as mock_get:
+            api.ticker("btc_jpy")
+            api.depth("btc_jpy")
+            self.assertEqual(mock_get.call_count, 2)
+
+    def test_shared_session(self):
+        session = ZaifSession()
+        public = ZaifPublicApi(session=session)
+        trade = ZaifTradeApi("key", "secret", session=session)
+        self.assertIs(public._session, session)
+        self.assertIs(trade._session, session)
+
+    def test_close_owned_session_only(self):
+        session = MagicMock()
+        with ZaifPublicApi(session=session):
+            pass
+        session.close.assert_not_called()
+
+        api = ZaifPublicApi()
+        with patch.object(api._session, "close") as mock_close:
+            with api:
+                pass
+            mock_close.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from zaifapi import ZaifPublicApi
+from zaifapi.api_common import MmapCacheBackend, ResponseCache
+from zaifapi.api_common.cache import EXPIRED, MISS
+from zaifapi.api_common.shared_cache import _SLOT_HEADER, _hash_key
+
+
+def _write_snapshot(path, body):
+    backend = MmapCacheBackend(path)
+    backend.set("ticker/btc_jpy", body, backend.clock() + 60)
+    backend.close()
+
+
+class TestMmapCacheBackend(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache")
+        self.backend = MmapCacheBackend(self.path, slots=8, slot_size=256)
+
+    def tearDown(self):
+        self.backend.close()
+        self.tmp.cleanup()
+
+    def test_set_and_get(self):
+        self.assertIs(self.backend.get("a", 0), MISS)
+        self.assertEqual(self.backend.set("a", b'{"last": 1}', 10), 0)
+        self.assertEqual(self.backend.get("a", 5), b'{"last": 1}')
+        self.assertIs(self.backend.get("a", 10), EXPIRED)
+        self.assertEqual(len(self.backend), 1)
+
+    def test_transform_reads_from_the_mapping(self):
+        self.backend.set("a", b"payload", 10)
+        seen = []
+
+        def transform(data):
+            seen.append(type(data))
+            return data.tobytes()
+
+        self.assertEqual(self.backend.get("a", 0, transform), b"payload")
+        self.assertEqual(seen, [memoryview])
+
+    def test_response_cache_hits_decode_from_the_mapping(self):
+        cache = ResponseCache({"ticker": 10}, backend=self.backend, clock=lambda: 0)
+        cache.fetch("a", "ticker", lambda: b"payload")
+        seen = []
+
+        def transform(data):
+            seen.append(type(data))
+            return data.tobytes()
+
+        self.assertEqual(cache.fetch("a", "ticker", None, transform), b"payload")
+        self.assertEqual(seen, [memoryview])
+
+    def test_delete_and_clear(self):
+        self.backend.set("a", b"1", 10)
+        self.backend.set("b", b"2", 10)
+        self.backend.delete("a")
+        self.assertIs(self.backend.get("a", 0), MISS)
+        self.backend.clear()
+        self.assertIs(self.backend.get("b", 0), MISS)
+        self.assertEqual(len(self.backend), 0)
+
+    def test_oversized_value_is_not_stored(self):
+        self.backend.set("a", b"x" * 1024, 10)
+        self.assertIs(self.backend.get("a", 0), MISS)
+
+    def test_colliding_key_replaces_slot(self):
+        keys = ["key{}".format(i) for i in range(9)]
+        evicted = sum(self.backend.set(key, b"v", 10) for key in keys)
+        self.assertGreaterEqual(evicted, 1)
+        stored = [key for key in keys if self.backend.get(key, 0) is not MISS]
+        self.assertEqual(len(stored), len(self.backend))
+
+    def _crash_mid_write(self, key):
+        offset = self.backend._slot(_hash_key(key.encode()))
+        seq = _SLOT_HEADER.unpack_from(self.backend._mmap, offset)[0]
+        _SLOT_HEADER.pack_into(self.backend._mmap, offset, seq + 1, 0.0, 0, 0, 0)
+        return offset
+
+    def test_write_after_crashed_writer(self):
+        self.backend.set("a", b"1", 10)
+        self._crash_mid_write("a")
+        self.assertIs(self.backend.get("a", 0), MISS)
+        self.backend.set("a", b"2", 10)
+        self.assertEqual(self.backend.get("a", 0), b"2")
+
+    def test_open_repairs_crashed_slots(self):
+        self.backend.set("a", b"1", 10)
+        offset = self._crash_mid_write("a")
+        with MmapCacheBackend(self.path) as other:
+            self.assertEqual(_SLOT_HEADER.unpack_from(other._mmap, offset)[0] & 1, 0)
+
+    def test_existing_file_keeps_layout(self):
+        self.backend.set("a", b"1", 10)
+        with MmapCacheBackend(self.path, slots=64, slot_size=1024) as other:
+            self.assertEqual(other.get("a", 0), b"1")
+            other.set("b", b"2", 10)
+        self.assertEqual(self.backend.get("b", 0), b"2")
+
+    def test_visible_to_other_processes(self):
+        process = multiprocessing.get_context("fork").Process(
+            target=_write_snapshot, args=(self.path, b'{"last": 2}')
+        )
+        process.start()
+        process.join(5)
+        self.assertEqual(process.exitcode, 0)
+        self.assertEqual(self.backend.get("ticker/btc_jpy", self.backend.clock()), b'{"last": 2}')
+
+
+class TestSharedPublicApiCache(unittest.TestCase):
+    def test_clients_share_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache")
+            first = ZaifPublicApi(cache=ResponseCache(backend=MmapCacheBackend(path)))
+            second = ZaifPublicApi(cache=ResponseCache(backend=MmapCacheBackend(path)))
+            response = MagicMock(status_code=200, content=b'{"last": 1}')
+            with patch("requests.Session.get", return_value=response) as mock_get:
+                self.assertEqual(first.ticker("btc_jpy"), {"last": 1})
+                self.assertEqual(second.ticker("btc_jpy"), {"last": 1})
+            self.assertEqual(mock_get.call_count, 1)
+            self.assertEqual(second.cache_stats()["ticker"]["hits"], 1)
+            first._cache._backend.close()
+            second._cache._backend.close()
@@ -0,0 +1,34 @@
+import hashlib
+import hmac
+import unittest
+from zaifapi import ZaifLeverageTradeApi, ZaifTokenTradeApi, ZaifTradeApi
+from zaifapi.exchange_api.trade import _make_signature
+
+
+def _reference(secret, params):
+    return hmac.new(secret.encode("utf-8"), params.encode("utf-8"), hashlib.sha512).hexdigest()
+
+
+class TestSignature(unittest.TestCase):
+    def test_signer_matches_fresh_hmac(self):
+        api = ZaifTradeApi(key="test_key", secret="test_secret")
+        for params in ("method=get_info&nonce=1.000001", "method=get_info&nonce=1.000002", ""):
+            self.assertEqual(
+                api._get_header(params),
+                {"key": "test_key", "sign": _reference("test_secret", params)},
+            )
+
+    def test_leverage_signer(self):
+        api = ZaifLeverageTradeApi(key="k", secret="秘密")
+        params = "method=active_positions&nonce=1.5"
+        self.assertEqual(api._get_header(params)["sign"], _reference("秘密", params))
+
+    def test_make_signature(self):
+        params = "method=trade&nonce=2"
+        self.assertEqual(
+            _make_signature("k", "s", params), {"key": "k", "sign": _reference("s", params)}
+        )
+
+    def test_token_header(self):
+        api = ZaifTokenTradeApi(token="token")
+        self.assertEqual(api._get_header("method=get_info"), {"token": "token"})
@@ -0,0 +1,147 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from websocket import ABNF, WebSocketConnectionClosedException, WebSocketTimeoutException
+from zaifapi import ZaifPublicStreamApi
+from zaifapi.exchange_api.stream import DROP_OLDEST, StreamConnection
+
+
+class FakeWebSocket:
+    def __init__(self, *script):
+        self.script = list(script)
+        self.pings = 0
+        self.timeouts = []
+        self.closed = threading.Event()
+
+    def settimeout(self, timeout):
+        self.timeouts.append(timeout)
+
+    def recv_data_frame(self, control_frame=False):
+        if not self.script:
+            self.closed.wait(5)
+            raise WebSocketConnectionClosedException("closed")
+        action = self.script.pop(0)
+        if action == "timeout":
+            raise WebSocketTimeoutException("timeout")
+        if action == "error":
+            raise WebSocketConnectionClosedException("reset")
+        if action == "close":
+            return ABNF.OPCODE_CLOSE, SimpleNamespace(data=b"")
+        return ABNF.OPCODE_TEXT, SimpleNamespace(data=action)
+
+    def ping(self):
+        self.pings += 1
+
+    def shutdown(self):
+        self.closed.set()
+
+    def close(self, timeout=None):
+        self.closed.set()
+
+
+def _connect(*sockets):
+    return patch("zaifapi.exchange_api.stream.create_connection", side_effect=list(sockets))
+
+
+class TestStreamConnection(unittest.TestCase):
+    def test_reconnect(self):
+        first = FakeWebSocket(b'{"n": 1}', "error")
+        second = FakeWebSocket(b'{"n": 2}', "close")
+        with _connect(first, second, FakeWebSocket()):
+            connection = StreamConnection("wss://test", backoff=0.001).start()
+            messages = iter(connection)
+            self.assertEqual([next(messages), next(messages)], [b'{"n": 1}', b'{"n": 2}'])
+            connection.stop()
+        self.assertGreaterEqual(connection.stats.connects, 2)
+        self.assertEqual(connection.stats.errors, 1)
+
+    def test_reconnect_after_connect_failure(self):
+        with _connect(OSError("refused"), FakeWebSocket(b"{}")):
+            connection = StreamConnection("wss://test", backoff=0.001).start()
+            self.assertEqual(next(iter(connection)), b"{}")
+            connection.stop()
+
+    def test_heartbeat(self):
+        silent = FakeWebSocket("timeout", "timeout")
+        with _connect(silent, FakeWebSocket(b"{}")):
+            connection = StreamConnection(
+                "wss://test", backoff=0.001, ping_interval=5, ping_timeout=1
+            ).start()
+            self.assertEqual(next(iter(connection)), b"{}")
+            connection.stop()
+        self.assertEqual(silent.pings, 1)
+        self.assertEqual(silent.timeouts, [5, 1])
+
+    def test_drop_oldest(self):
+        ws = FakeWebSocket(*[str(i).encode() for i in range(5)])
+        with _connect(ws):
+            connection = StreamConnection("wss://test", queue_size=2, overflow=DROP_OLDEST)
+            connection.start()
+            while connection.stats.received < 5:
+                time.sleep(0.001)
+            messages = iter(connection)
+            self.assertEqual([next(messages), next(messages)], [b"3", b"4"])
+            connection.stop()
+        self.assertEqual(connection.stats.dropped, 3)
+
+    def test_block_keeps_messages_when_closing_with_full_queue(self):
+        ws = FakeWebSocket(b"0", b"1", "close")
+        with _connect(ws):
+            connection = StreamConnection("wss://test", reconnect=False, queue_size=2).start()
+            while connection.stats.received < 2:
+                time.sleep(0.001)
+            time.sleep(0.05)
+            self.assertEqual(list(connection), [b"0", b"1"])
+        self.assertEqual(connection.stats.dropped, 0)
+
+    def test_error_without_reconnect(self):
+        with _connect(FakeWebSocket("error")):
+            connection = StreamConnection("wss://test", reconnect=False).start()
+            with self.assertRaises(WebSocketConnectionClosedException):
+                list(connection)
+
+    def test_invalid_overflow(self):
+        with self.assertRaises(ValueError):
+            StreamConnection("wss://test", overflow="unknown")
+
+
+class TestPublicStreamApi(unittest.TestCase):
+    def test_execute_raw(self):
+        api = ZaifPublicStreamApi()
+        with _connect(FakeWebSocket(b'{"last_price": 1}')):
+            messages = api.execute("btc_jpy", raw=True)
+            self.assertEqual(bytes(next(messages)), b'{"last_price": 1}')
+            api.stop()
+            messages.close()
+
+    def test_execute_and_stop(self):
+        api = ZaifPublicStreamApi()
+        ws = FakeWebSocket(b'{"last_price": 1}')
+        with _connect(ws) as create_connection:
+            received = []
+
+            def consume():
+                for message in api.execute("btc_jpy"):
+                    received.append(message)
+
+            consumer = threading.Thread(target=consume)
+            consumer.start()
+            while not received:
+                time.sleep(0.001)
+            started = time.monotonic()
+            api.stop()
+            consumer.join(1)
+            self.assertFalse(consumer.is_alive())
+            self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(received, [{"last_price": 1}])
+        self.assertEqual(
+            create_connection.call_args[0][0], "wss://ws.zaif.jp:8888/stream?currency_pair=btc_jpy"
+        )
+        self.assertTrue(ws.closed.is_set())
+        self.assertEqual(api._connections, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import json
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+from zaifapi import StreamRecorder, StreamReplayer
+from zaifapi.api_common import DECIMAL_DECODER
+from zaifapi.stream_log import CODEC_NONE, orjson
+from tests.helpers import FakeClock
+
+
+def _message(i, currency_pair="btc_jpy"):
+    return {
+        "currency_pair": currency_pair,
+        "last_price": {"action": "bid", "price": 4100000 + i},
+        "asks": [[4100000 + i, 0.01]],
+        "bids": [[4099995 + i, 0.02]],
+    }
+
+
+class TestStreamLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "stream.log")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _record(self, count, block_size=1024, **kwargs):
+        with StreamRecorder(self.path, block_size=block_size, **kwargs) as recorder:
+            for i in range(count):
+                recorder.write(_message(i), timestamp=1000.0 + i)
+
+    def test_round_trip(self):
+        self._record(100)
+        with StreamReplayer(self.path) as replayer:
+            self.assertEqual(len(replayer), 100)
+            self.assertGreater(len(replayer.blocks), 1)
+            self.assertEqual(replayer.start_time, 1000.0)
+            self.assertEqual(replayer.end_time, 1099.0)
+            self.assertEqual(list(replayer), [_message(i) for i in range(100)])
+
+    def test_uncompressed_round_trip(self):
+        self._record(10, codec=CODEC_NONE)
+        with StreamReplayer(self.path) as replayer:
+            self.assertEqual(list(replayer), [_message(i) for i in range(10)])
+
+    def test_compressed_smaller_than_json_lines(self):
+        self._record(1000, block_size=64 * 1024)
+        lines = sum(len(json.dumps(_message(i))) + 1 for i in range(1000))
+        self.assertLess(os.path.getsize(self.path), lines / 4)
+
+    def test_seek_by_time(self):
+        self._record(100)
+        with StreamReplayer(self.path) as replayer:
+            timestamps = [ts for ts, _ in replayer.raw(start=1050.0, end=1059.5)]
+        self.assertEqual(timestamps, [1050.0 + i for i in range(10)])
+
+    def test_recovers_truncated_tail(self):
+        self._record(100)
+        size = os.path.getsize(self.path)
+        with open(self.path, "r+b") as f:
+            f.truncate(size - 10)
+        with StreamReplayer(self.path) as replayer:
+            recovered = len(replayer)
+        self.assertLess(recovered, 100)
+        with StreamRecorder(self.path) as recorder:
+            recorder.write(_message(100), timestamp=1100.0)
+        with StreamReplayer(self.path) as replayer:
+            messages = list(replayer)
+        self.assertEqual(len(messages), recovered + 1)
+        self.assertEqual(messages[-1], _message(100))
+
+    def test_missing_index_falls_back_to_scan(self):
+        self._record(50)
+        os.remove(self.path + ".idx")
+        with StreamReplayer(self.path) as replayer:
+            self.assertEqual(len(list(replayer)), 50)
+
+    def test_accelerated_replay(self):
+        self._record(5)
+        clock = FakeClock()
+        with StreamReplayer(self.path, speed=2, clock=clock, sleep=clock.sleep) as replayer:
+            self.assertEqual(len(list(replayer)), 5)
+        self.assertEqual(clock.sleeps, [0.5] * 4)
+
+    def test_filter_by_currency_pair(self):
+        with StreamRecorder(self.path) as recorder:
+            recorder.write(_message(0), timestamp=1.0)
+            recorder.write(_message(1, "xem_jpy"), timestamp=2.0)
+        with StreamReplayer(self.path) as replayer:
+            self.assertEqual(list(replayer.execute("xem_jpy")), [_message(1, "xem_jpy")])
+
+    def test_record_passes_messages_through(self):
+        messages = [_message(i) for i in range(3)]
+        with StreamRecorder(self.path) as recorder:
+            self.assertEqual(list(recorder.record(iter(messages))), messages)
+        with StreamReplayer(self.path) as replayer:
+            self.assertEqual(list(replayer), messages)
+
+    def test_decimal_messages(self):
+        message = {"currency_pair": "btc_jpy", "last_price": {"price": Decimal("4000000.5")}}
+        for json_only in (False, True):
+            with self.subTest(json_only=json_only):
+                path = os.path.join(self.tmp.name, "decimal{}.log".format(int(json_only)))
+                with patch("zaifapi.stream_log.orjson", None if json_only else orjson):
+                    with StreamRecorder(path) as recorder:
+                        recorder.write(message)
+                with StreamReplayer(path, decoder=DECIMAL_DECODER) as replayer:
+                    self.assertEqual(list(replayer), [message])
+
+    def test_record_raw_frames(self):
+        frames = [b'{"timestamp": 1, "last_price": {"price": 0.10000000000000000001}}']
+        with StreamRecorder(self.path) as recorder:
+            messages = list(recorder.record(iter(frames), DECIMAL_DECODER))
+        self.assertEqual(messages[0]["last_price"]["price"], Decimal("0.10000000000000000001"))
+        with StreamReplayer(self.path) as replayer:
+            self.assertEqual([bytes(data) for _, data in replayer.raw()], frames)
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a stream log")
+        with self.assertRaises(ValueError):
+            StreamReplayer(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import unittest
+from types import SimpleNamespace
+from aiohttp import WSMsgType
+from zaifapi import ZaifStreamManager
+from zaifapi.api_error import ZaifApiValidationError
+
+
+class FakeWebSocket:
+    def __init__(self, messages, fail=False, close=False):
+        self._messages = list(messages)
+        self._fail = fail
+        self._close = close
+
+    async def __aenter__(self):
+        if self._fail:
+            raise OSError("refused")
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._messages:
+            return SimpleNamespace(type=WSMsgType.TEXT, data=self._messages.pop(0))
+        if self._close:
+            raise StopAsyncIteration
+        await asyncio.Event().wait()
+
+
+class FakeSession:
+    def __init__(self, fail_first=(), close=False):
+        self.urls = []
+        self._fail_first = set(fail_first)
+        self._close = close
+
+    def ws_connect(self, url, heartbeat=None):
+        self.urls.append(url)
+        pair = url.rsplit("=", 1)[1]
+        if pair in self._fail_first:
+            self._fail_first.discard(pair)
+            return FakeWebSocket([], fail=True)
+        messages = ['{{"pair": "{}", "n": {}}}'.format(pair, n) for n in range(2)]
+        return FakeWebSocket(messages, close=self._close)
+
+    async def close(self):
+        pass
+
+
+class TestZaifStreamManager(unittest.TestCase):
+    def _collect(self, manager, count):
+        result = []
+        for pair, message in manager.start():
+            result.append((pair, message["n"]))
+            if len(result) == count:
+                manager.stop(timeout=1)
+        return sorted(result)
+
+    def test_merged_feed(self):
+        session = FakeSession()
+        manager = ZaifStreamManager(["btc_jpy", "xem_jpy"], session=session)
+        self.assertEqual(
+            self._collect(manager, 4),
+            [("btc_jpy", 0), ("btc_jpy", 1), ("xem_jpy", 0), ("xem_jpy", 1)],
+        )
+        self.assertEqual(
+            sorted(session.urls),
+            [
+                "wss://ws.zaif.jp:8888/stream?currency_pair=btc_jpy",
+                "wss://ws.zaif.jp:8888/stream?currency_pair=xem_jpy",
+            ],
+        )
+        self.assertIsNone(manager._thread)
+
+    def test_reconnect(self):
+        manager = ZaifStreamManager(["btc_jpy"], session=FakeSession(["btc_jpy"]), backoff=0.001)
+        self.assertEqual(self._collect(manager, 2), [("btc_jpy", 0), ("btc_jpy", 1)])
+        self.assertEqual(manager.stats["btc_jpy"].errors, 1)
+        self.assertEqual(manager.stats["btc_jpy"].connects, 1)
+
+    def test_error_without_reconnect(self):
+        manager = ZaifStreamManager(["btc_jpy"], session=FakeSession(["btc_jpy"]), reconnect=False)
+        try:
+            with self.assertRaises(OSError):
+                list(manager.start())
+        finally:
+            manager.stop(timeout=1)
+        self.assertEqual(manager.stats["btc_jpy"].errors, 1)
+
+    def test_server_close_without_reconnect_ends_iteration(self):
+        session = FakeSession(close=True)
+        manager = ZaifStreamManager(["btc_jpy", "xem_jpy"], session=session, reconnect=False)
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.extend(pair for pair, _ in manager.start()), daemon=True
+        )
+        try:
+            thread.start()
+            thread.join(2)
+            self.assertFalse(thread.is_alive())
+        finally:
+            manager.stop(timeout=1)
+        self.assertEqual(sorted(result), ["btc_jpy", "btc_jpy", "xem_jpy", "xem_jpy"])
+        self.assertEqual(manager.stats["btc_jpy"].connects, 1)
+
+    def test_run_in_caller_loop(self):
+        manager = ZaifStreamManager(["btc_jpy"], session=FakeSession())
+
+        async def main():
+            task = asyncio.ensure_future(manager.run())
+            while manager.stats["btc_jpy"].received < 2:
+                await asyncio.sleep(0.001)
+            messages = iter(manager)
+            pairs = [next(messages)[0], next(messages)[0]]
+            manager.stop()
+            await task
+            return pairs
+
+        self.assertEqual(asyncio.run(main()), ["btc_jpy", "btc_jpy"])
+
+    def test_subscribe_while_running(self):
+        manager = ZaifStreamManager(["btc_jpy"], session=FakeSession())
+        received = []
+        manager.add_callback(lambda pair, message: received.append(pair))
+        manager.start()
+        manager.subscribe("mona_jpy")
+        result = []
+        for pair, message in manager:
+            result.append(pair)
+            if len(result) == 4:
+                manager.stop(timeout=1)
+        self.assertEqual(sorted(result), ["btc_jpy", "btc_jpy", "mona_jpy", "mona_jpy"])
+        self.assertEqual(sorted(received), sorted(result))
+
+    def test_validation(self):
+        with self.assertRaises(ZaifApiValidationError):
+            ZaifStreamManager([1])
+
+
+if __name__ == "__main__":
+    unittest.main()
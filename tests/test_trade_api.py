@@ -16,14 +16,14 @@ class TestPublicApi(unittest.TestCase):
     def setUp(self):
         self.response = MagicMock()
         self.response.status_code = 200
-        self.response.text = '{"success": 1, "return": "return"}'
+        self.response.content = b'{"success": 1, "return": "return"}'
         self.assertEqual(self.api._url.get_absolute_url(), "https://test_trade.com/tapi")
 
     def tearDown(self):
         self.assertEqual(self.api._url.get_absolute_url(), "https://test_trade.com/tapi")
 
     def test_get_info(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.get_info()
             params = urlencode({"method": "get_info", "nonce": 1111111111})
@@ -33,7 +33,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_get_info2(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.get_info2()
             params = urlencode({"method": "get_info2", "nonce": 1111111111})
@@ -43,7 +43,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_get_personal_info(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.get_personal_info()
             params = urlencode({"method": "get_personal_info", "nonce": 1111111111})
@@ -53,7 +53,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_get_id_info(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.get_id_info()
             params = urlencode({"method": "get_id_info", "nonce": 1111111111})
@@ -63,7 +63,7 @@ class TestPublicApi(unittest.TestCase):
             )
 
     def test_trade_history(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.trade_history(
                 from_num=0,
@@ -96,7 +96,7 @@ class TestPublicApi(unittest.TestCase):
             self.assertDictEqual(mock_post.call_args[1]["headers"], {"key": "key", "sign": "sign"})
 
     def test_active_orders(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.active_orders(currency_pair="test_jpy", is_token=False, is_token_both=True)
 
@@ -113,7 +113,7 @@ class TestPublicApi(unittest.TestCase):
             self.assertDictEqual(mock_post.call_args[1]["headers"], {"key": "key", "sign": "sign"})
 
     def test_withdraw_history(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.withdraw_history(
                 from_num=0,
@@ -146,7 +146,7 @@ class TestPublicApi(unittest.TestCase):
             self.assertDictEqual(mock_post.call_args[1]["headers"], {"key": "key", "sign": "sign"})
 
     def test_deposit_history(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.deposit_history(
                 from_num=0,
@@ -179,7 +179,7 @@ class TestPublicApi(unittest.TestCase):
             self.assertDictEqual(mock_post.call_args[1]["headers"], {"key": "key", "sign": "sign"})
 
     def test_withdraw(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.withdraw(
                 currency="test_coin",
@@ -204,7 +204,7 @@ class TestPublicApi(unittest.TestCase):
             self.assertDictEqual(mock_post.call_args[1]["headers"], {"key": "key", "sign": "sign"})
 
     def test_cancel_order(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.cancel_order(order_id=123, is_token=True, currency_pair="test_jpy")
 
@@ -221,7 +221,7 @@ class TestPublicApi(unittest.TestCase):
             self.assertDictEqual(mock_post.call_args[1]["headers"], {"key": "key", "sign": "sign"})
 
     def test_trade(self):
-        with patch("requests.post") as mock_post:
+        with patch("requests.Session.post") as mock_post:
             mock_post.return_value = self.response
             self.api.trade(
                 currency_pair="test_jpy",
@@ -0,0 +1,93 @@
+import sys
+import threading
+import unittest
+from unittest.mock import MagicMock
+from zaifapi import ZaifPublicApi, ZaifFuturesPublicApi
+from zaifapi.api_common import ApiUrl
+
+
+class TestApiUrl(unittest.TestCase):
+    def test_build_url_does_not_mutate(self):
+        url = ApiUrl("api", version=1)
+        self.assertEqual(
+            url.build_url("depth", "btc_jpy"), "https://api.zaif.jp/api/1/depth/btc_jpy"
+        )
+        self.assertEqual(
+            url.build_url("last_price", 1, None, 2), "https://api.zaif.jp/api/1/last_price/1"
+        )
+        self.assertEqual(url.get_absolute_url(), "https://api.zaif.jp/api/1")
+
+    def test_build_url_params(self):
+        url = ApiUrl("stream", protocol="wss", host="ws.zaif.jp", port=8888, params={"a": 1})
+        self.assertEqual(
+            url.build_url(params={"currency_pair": "btc_jpy"}),
+            "wss://ws.zaif.jp:8888/stream?a=1&currency_pair=btc_jpy",
+        )
+        self.assertEqual(url.get_absolute_url(with_params=True), "wss://ws.zaif.jp:8888/stream?a=1")
+
+    def test_cache_invalidation(self):
+        url = ApiUrl("api", version=1)
+        self.assertEqual(url.get_absolute_url(), "https://api.zaif.jp/api/1")
+        url._host = "example.com"
+        self.assertEqual(url.get_absolute_url(), "https://example.com/api/1")
+        url.add_dirs("a", "b")
+        self.assertEqual(url.get_absolute_url(), "https://example.com/api/1/a/b")
+        url.refresh_dirs()
+        self.assertEqual(url.get_absolute_url(), "https://example.com/api/1")
+
+
+class TestConcurrentUse(unittest.TestCase):
+    THREADS = 16
+    CALLS = 200
+
+    def setUp(self):
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self._switch_interval)
+
+    def _hammer(self, api, call, expected_url):
+        response = MagicMock(status_code=200, content=b"{}")
+        seen = []
+        api._session = MagicMock()
+        api._session.get.side_effect = lambda url, params: seen.append(url) or response
+        errors = []
+
+        def worker(index):
+            try:
+                for _ in range(self.CALLS):
+                    call(api, index)
+            except Exception as e:  # pragma: no cover
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(seen), self.THREADS * self.CALLS)
+        expected = {expected_url(i) for i in range(self.THREADS)}
+        self.assertEqual(set(seen), expected)
+        for i in range(self.THREADS):
+            self.assertEqual(seen.count(expected_url(i)), self.CALLS)
+
+    def test_public_depth(self):
+        self._hammer(
+            ZaifPublicApi(),
+            lambda api, i: api.depth("pair{}_jpy".format(i)),
+            lambda i: "https://api.zaif.jp/api/1/depth/pair{}_jpy".format(i),
+        )
+
+    def test_futures_ticker(self):
+        self._hammer(
+            ZaifFuturesPublicApi(),
+            lambda api, i: api.ticker(i, "btc_jpy"),
+            lambda i: "https://api.zaif.jp/fapi/1/ticker/{}/btc_jpy".format(i),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
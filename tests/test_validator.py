@@ -0,0 +1,73 @@
+import unittest
+from decimal import Decimal
+from zaifapi.api_common.validator import (
+    DEFAULT_SCHEMA,
+    ZaifApiValidator,
+    FuturesPublicApiValidator,
+)
+from zaifapi.api_error import ZaifApiValidationError
+
+TRADE_KEYS = ("currency_pair", "action", "price", "amount", "limit", "comment")
+HISTORY_KEYS = ("from_num", "count", "order", "end", "is_token")
+
+CASES = [
+    (TRADE_KEYS, {"currency_pair": "btc_jpy", "action": "bid", "price": 1, "amount": 0.1}),
+    (
+        TRADE_KEYS,
+        {"currency_pair": "btc_jpy", "action": "bid", "price": Decimal("1.5"), "amount": 1},
+    ),
+    (TRADE_KEYS, {"currency_pair": "btc_jpy", "action": "buy", "price": 1, "amount": 1}),
+    (TRADE_KEYS, {"currency_pair": "btc_jpy", "action": "bid", "price": True, "amount": 1}),
+    (TRADE_KEYS, {"currency_pair": "btc_jpy", "action": "bid", "price": "1", "amount": 1}),
+    (TRADE_KEYS, {"currency_pair": "btc_jpy", "action": "bid", "amount": 1}),
+    (TRADE_KEYS, {"currency_pair": None, "action": "bid", "price": 1, "amount": 1}),
+    (TRADE_KEYS, {"currency_pair": "btc_jpy", "action": "bid", "price": 1, "amount": 1, "x": 1}),
+    (HISTORY_KEYS, {}),
+    (HISTORY_KEYS, {"from_num": 0, "count": True, "order": "ASC", "end": "1", "is_token": False}),
+    (HISTORY_KEYS, {"from_num": 1.5}),
+    (HISTORY_KEYS, {"order": "asc"}),
+    (HISTORY_KEYS, {"end": 1.5}),
+    (HISTORY_KEYS, {"is_token": 1}),
+]
+
+
+def _is_valid(validator, keys, params):
+    try:
+        validator.params_pre_processing(keys, dict(params))
+    except ZaifApiValidationError:
+        return False
+    return True
+
+
+class TestZaifApiValidator(unittest.TestCase):
+    def test_fast_path_matches_cerberus(self):
+        fast = ZaifApiValidator()
+        slow = ZaifApiValidator(fast=False)
+        for keys, params in CASES:
+            with self.subTest(params=params):
+                self.assertEqual(_is_valid(fast, keys, params), _is_valid(slow, keys, params))
+
+    def test_error_message(self):
+        with self.assertRaises(ZaifApiValidationError) as cm:
+            ZaifApiValidator().params_pre_processing(["order"], {"order": "asc"})
+        self.assertIn("order", str(cm.exception))
+
+    def test_compiled_schema_is_cached(self):
+        validator = ZaifApiValidator()
+        first = validator._get_compiled_schema(("currency_pair",))
+        self.assertIs(ZaifApiValidator()._get_compiled_schema(("currency_pair",)), first)
+        self.assertIsNot(
+            FuturesPublicApiValidator()._get_compiled_schema(("currency_pair",)), first
+        )
+
+    def test_futures_schema_does_not_leak(self):
+        FuturesPublicApiValidator()
+        self.assertNotIn("nullable", DEFAULT_SCHEMA["currency_pair"])
+        self.assertTrue(
+            _is_valid(FuturesPublicApiValidator(), ["currency_pair"], {"currency_pair": None})
+        )
+        self.assertFalse(_is_valid(ZaifApiValidator(), ["currency_pair"], {"currency_pair": None}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,11 +5,21 @@ from .exchange_api import (
     ZaifPublicStreamApi,
     ZaifLeverageTradeApi,
     ZaifFuturesPublicApi,
+    AsyncZaifTradeApi,
+    AsyncZaifPublicApi,
+    AsyncZaifPublicStreamApi,
+    AsyncZaifLeverageTradeApi,
+    AsyncZaifFuturesPublicApi,
+    ZaifStreamManager,
 )
 from .oauth import ZaifTokenApi
+from .orderbook import LocalOrderBook
+from .order_tracker import OrderTracker, TrackedOrder
+from .stream_log import StreamRecorder, StreamReplayer
+from .api_common.rate_limit import MIN_WAIT_TIME_SEC
+from .exchange_api.pagination import MAX_COUNT as _MAX_COUNT  # NOQA
 
-_MAX_COUNT = 1000
-_MIN_WAIT_TIME_SEC = 1
+_MIN_WAIT_TIME_SEC = MIN_WAIT_TIME_SEC
 
 __version__ = "1.7.0"
 
@@ -22,4 +32,15 @@ __all__ = [
     "ZaifPublicStreamApi",
     "ZaifLeverageTradeApi",
     "ZaifFuturesPublicApi",
+    "AsyncZaifTradeApi",
+    "AsyncZaifPublicApi",
+    "AsyncZaifPublicStreamApi",
+    "AsyncZaifLeverageTradeApi",
+    "AsyncZaifFuturesPublicApi",
+    "ZaifStreamManager",
+    "LocalOrderBook",
+    "OrderTracker",
+    "TrackedOrder",
+    "StreamRecorder",
+    "StreamReplayer",
 ]
@@ -1,14 +1,204 @@
-import inspect
+import asyncio
+import sys
+import time
 from abc import ABCMeta
+from functools import partial
+from typing import Dict
+from .endpoint import Endpoint, endpoint, collect_endpoints  # NOQA
+from .rate_limit import (  # NOQA
+    Budget,
+    RateLimiter,
+    PRIORITY_HIGH,
+    PRIORITY_NORMAL,
+    PRIORITY_LOW,
+)
+from .decoder import JsonDecoder, DEFAULT_DECODER, DECIMAL_DECODER, get_decoder  # NOQA
+from .cache import CacheBackend, CacheStats, MemoryCacheBackend, ResponseCache, get_cache  # NOQA
+from .shared_cache import MmapCacheBackend  # NOQA
+from .instrumentation import (  # NOQA
+    Histogram,
+    Instrumentation,
+    RequestTrace,
+    StatsdEmitter,
+    NULL_TRACE,
+    PHASE_DECODING,
+    PHASE_NETWORK,
+    PHASE_RATE_LIMIT,
+    PHASE_SIGNING,
+    PHASE_VALIDATION,
+    start_trace,
+)
+from .hedge import HedgePolicy, HedgeStats, get_hedge_policy  # NOQA
+from .retry import (  # NOQA
+    CircuitBreaker,
+    RetryPolicy,
+    get_circuit_breaker,
+    get_retry_policy,
+    is_transient,
+)
+from .flow import perform, run_flow, run_flow_async  # NOQA
 from .response import get_response  # NOQA
+from .session import DEFAULT_TIMEOUT, ZaifSession, get_session  # NOQA
+from .nonce import (  # NOQA
+    NonceGenerator,
+    FileNonceGenerator,
+    get_async_send_lock,
+    get_nonce_generator,
+    get_send_lock,
+)
+from .async_session import AsyncZaifSession, get_async_response  # NOQA
 from .url import ApiUrl, get_api_url  # NOQA
 from .validator import ZaifApiValidator, FuturesPublicApiValidator  # NOQA
 
 
 def method_name() -> str:
-    return inspect.stack()[1][3]
+    return sys._getframe(1).f_code.co_name
 
 
 class ZaifApi(metaclass=ABCMeta):
-    def __init__(self, url: ApiUrl):
+    _http_verb = "GET"
+    _endpoints: Dict[str, Endpoint] = {}
+    _run_flow = staticmethod(run_flow)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._endpoints = collect_endpoints(cls, cls._http_verb)
+
+    def __init__(
+        self,
+        url: ApiUrl,
+        session=None,
+        rate_limiter=None,
+        decoder=None,
+        typed=False,
+        instrumentation=None,
+        timeouts=None,
+        retry=None,
+        circuit_breaker=None,
+    ):
         self._url = url
+        self._typed = typed
+        self._session = get_session(session)
+        self._owns_session = session is None
+        self._rate_limiter = rate_limiter
+        self._decoder = get_decoder(decoder)
+        self._instrumentation = instrumentation
+        self._timeouts = dict(timeouts or {})
+        self._retry = get_retry_policy(retry)
+        self._circuit_breaker = get_circuit_breaker(circuit_breaker)
+
+    def _start_trace(self, func_name):
+        return start_trace(self._instrumentation, self._url._api_name, func_name)
+
+    def _to_model(self, func_name, result):
+        if self._typed:
+            model = self._endpoints[func_name].model
+            if model is not None:
+                return model.from_json(result)
+        return result
+
+    def _timeout(self, func_name):
+        timeout = self._timeouts.get(func_name, self._endpoints[func_name].timeout)
+        if timeout is None and not hasattr(self._session, "timeout"):
+            return DEFAULT_TIMEOUT
+        return timeout
+
+    def _retry_delay(self, func_name, error, attempt):
+        if self._retry is None or not self._endpoints[func_name].idempotent:
+            return None
+        return self._retry.next_delay(error, attempt)
+
+    def _before_request(self):
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.before()
+
+    def _record_outcome(self, error=None):
+        if self._circuit_breaker is not None:
+            self._circuit_breaker.record(error)
+
+    def _guarded(self, flow):
+        self._before_request()
+        try:
+            result = yield from flow
+        except BaseException as e:
+            self._record_outcome(e)
+            raise
+        self._record_outcome()
+        return result
+
+    def _retrying(self, func_name, attempt, trace):
+        retries = 0
+        while True:
+            yield partial(self._throttle, func_name)
+            trace.mark(PHASE_RATE_LIMIT)
+            try:
+                return (yield from attempt())
+            except Exception as e:
+                delay = self._retry_delay(func_name, e, retries)
+                if delay is None:
+                    raise
+            yield partial(self._sleep, delay)
+            retries += 1
+
+    def _traced(self, func_name, body):
+        trace = self._start_trace(func_name)
+        try:
+            result = yield from body(trace)
+        except Exception as e:
+            trace.fail(e)
+            raise
+        trace.finish(result)
+        return result
+
+    def circuit_stats(self):
+        return self._circuit_breaker.stats() if self._circuit_breaker is not None else {}
+
+    def _wait_rate_limit(self, func_name):
+        if self._rate_limiter is not None:
+            priority = self._endpoints[func_name].priority
+            self._rate_limiter.acquire(self._url._api_name, priority)
+
+    async def _wait_rate_limit_async(self, func_name):
+        if self._rate_limiter is not None:
+            priority = self._endpoints[func_name].priority
+            await self._rate_limiter.acquire_async(self._url._api_name, priority)
+
+    def _throttle(self, func_name):
+        return self._wait_rate_limit(func_name)
+
+    def _sleep(self, delay):
+        return time.sleep(delay)
+
+    def close(self):
+        if self._owns_session:
+            self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AsyncZaifApiMixin:
+    _run_flow = staticmethod(run_flow_async)
+
+    def __init__(self, *args, session=None, **kwargs):
+        super().__init__(*args, session=session or AsyncZaifSession(), **kwargs)
+        self._owns_session = session is None
+
+    def _throttle(self, func_name):
+        return self._wait_rate_limit_async(func_name)
+
+    def _sleep(self, delay):
+        return asyncio.sleep(delay)
+
+    async def close(self):
+        if self._owns_session:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
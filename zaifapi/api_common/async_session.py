@@ -0,0 +1,102 @@
+from typing import Any, Dict, NamedTuple, Optional
+from zaifapi.api_error import ZaifServerException
+from .decoder import get_decoder
+from .instrumentation import NULL_TRACE, PHASE_DECODING, PHASE_NETWORK
+from .session import DEFAULT_POOL_MAXSIZE, DEFAULT_TIMEOUT, Timeout
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+
+
+class AsyncResponse(NamedTuple):
+    status_code: int
+    content: bytes
+
+
+class AsyncZaifSession:
+    def __init__(
+        self,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        limit_per_host: int = 0,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+    ):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for async apis: pip install zaifapi[async]")
+        self._pool_maxsize = pool_maxsize
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._timeout = _to_client_timeout(timeout)
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None or self._client.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._pool_maxsize,
+                limit_per_host=self._limit_per_host,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            self._client = aiohttp.ClientSession(connector=connector, timeout=self._timeout)
+        return self._client
+
+    async def get(self, url, params=None, timeout: Timeout = None) -> AsyncResponse:
+        options = {} if timeout is None else {"timeout": _to_client_timeout(timeout)}
+        async with self.client.get(url, params=params, **options) as response:
+            return AsyncResponse(response.status, await response.read())
+
+    async def post(self, url, data=None, headers=None, timeout: Timeout = None) -> AsyncResponse:
+        options = {} if timeout is None else {"timeout": _to_client_timeout(timeout)}
+        async with self.client.post(url, data=data, headers=headers, **options) as response:
+            return AsyncResponse(response.status, await response.read())
+
+    def ws_connect(self, url, **kwargs):
+        return self.client.ws_connect(url, **kwargs)
+
+    async def close(self) -> None:
+        if self._client is not None and not self._client.closed:
+            await self._client.close()
+        self._client = None
+
+
+async def get_async_response(
+    url,
+    params: Optional[Dict[Any, Any]] = None,
+    headers: Optional[Dict[Any, Any]] = None,
+    session: Optional[AsyncZaifSession] = None,
+    decoder=None,
+    trace=NULL_TRACE,
+    timeout: Timeout = None,
+) -> Any:
+    if session is None:
+        session = AsyncZaifSession()
+        try:
+            response = await session.post(url, data=params, headers=headers, timeout=timeout)
+        finally:
+            await session.close()
+    elif timeout is None:
+        response = await session.post(url, data=params, headers=headers)
+    else:
+        response = await session.post(url, data=params, headers=headers, timeout=timeout)
+    trace.mark(PHASE_NETWORK)
+    if response.status_code != 200:
+        raise ZaifServerException(
+            "return status code is {}".format(response.status_code), response.status_code
+        )
+    result = get_decoder(decoder).decode(response.content)
+    trace.mark(PHASE_DECODING)
+    return result
+
+
+def _to_client_timeout(timeout: Timeout):
+    if timeout is None:
+        return aiohttp.ClientTimeout(total=None)
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+    return aiohttp.ClientTimeout(total=timeout)
@@ -0,0 +1,289 @@
+import asyncio
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+DEFAULT_MAXSIZE = 1024
+
+DEFAULT_TTLS: Dict[str, float] = {
+    "currency_pairs": 3600.0,
+    "currencies": 3600.0,
+    "groups": 3600.0,
+    "ticker": 0.5,
+    "last_price": 0.5,
+    "depth": 0.2,
+    "trades": 0.5,
+}
+
+MISS = object()
+EXPIRED = object()
+
+
+def _apply(transform, value):
+    return value if transform is None else transform(value)
+
+
+def _copy(value):
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+def _consume(task) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+class CacheBackend(metaclass=ABCMeta):
+    clock: Callable[[], float] = staticmethod(time.monotonic)
+
+    @abstractmethod
+    def get(self, key: str, now: float, transform=None) -> Any:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def set(self, key: str, value: Any, expires: float) -> int:
+        raise NotImplementedError()
+
+    def remember(self, key: str, value: Any, transform, decoded: Any) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError()
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, now, transform=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            if entry[0] <= now:
+                del self._entries[key]
+                return EXPIRED
+            self._entries.move_to_end(key)
+        decoded = entry[2]
+        if decoded is None or decoded[0] != transform:
+            decoded = entry[2] = (transform, _apply(transform, entry[1]))
+        return _copy(decoded[1])
+
+    def set(self, key, value, expires):
+        evicted = 0
+        with self._lock:
+            self._entries[key] = [expires, value, None]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                evicted += 1
+        return evicted
+
+    def remember(self, key, value, transform, decoded):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is value:
+                entry[2] = (transform, decoded)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CacheStats:
+    __slots__ = ("hits", "misses", "coalesced", "evictions", "expired")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expired = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "hit_ratio": self.hit_ratio,
+        }
+
+
+class _Pending:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        clock=None,
+        backend: Optional[CacheBackend] = None,
+    ):
+        self._ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._backend = backend if backend is not None else MemoryCacheBackend(maxsize)
+        self._clock = clock or self._backend.clock
+        self._pending: Dict[str, _Pending] = {}
+        self._async_pending: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, CacheStats] = {}
+
+    @staticmethod
+    def make_key(url: str, params=None) -> str:
+        if not params:
+            return url
+        return "{}?{}".format(url, urlencode(sorted(params.items())))
+
+    def ttl(self, name: str) -> float:
+        return self._ttls.get(name, 0.0)
+
+    def set_ttl(self, name: str, ttl: float) -> None:
+        self._ttls[name] = ttl
+
+    def _stats_for(self, name: str) -> CacheStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(name, CacheStats())
+        return stats
+
+    def _lookup(self, key: str, stats: CacheStats, transform):
+        value = self._backend.get(key, self._clock(), transform)
+        if value is EXPIRED:
+            stats.expired += 1
+            return MISS
+        return value
+
+    def _store(self, key: str, value: Any, ttl: float, stats: CacheStats, transform=None):
+        stats.evictions += self._backend.set(key, value, self._clock() + ttl)
+        decoded = _apply(transform, value)
+        self._backend.remember(key, value, transform, decoded)
+        return decoded
+
+    def get(self, key: str, name: str = "", transform=None):
+        value = self._lookup(key, self._stats_for(name), transform)
+        return None if value is MISS else value
+
+    def put(self, key: str, value: Any, name: str = "", ttl: Optional[float] = None) -> None:
+        ttl = self.ttl(name) if ttl is None else ttl
+        if ttl > 0:
+            self._store(key, value, ttl, self._stats_for(name))
+
+    def fetch(self, key: str, name: str, loader, transform=None):
+        ttl = self.ttl(name)
+        if ttl <= 0:
+            return _apply(transform, loader())
+        stats = self._stats_for(name)
+        value = self._lookup(key, stats, transform)
+        with self._lock:
+            if value is not MISS:
+                stats.hits += 1
+                return value
+            stats.misses += 1
+            owner = key not in self._pending
+            if owner:
+                self._pending[key] = _Pending()
+            else:
+                stats.coalesced += 1
+            pending = self._pending[key]
+        if not owner:
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return _copy(pending.value)
+        try:
+            pending.value = self._store(key, loader(), ttl, stats, transform)
+        except BaseException as e:
+            pending.error = e
+            raise
+        else:
+            return _copy(pending.value)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            pending.event.set()
+
+    async def _load_async(self, key: str, loader, transform, ttl: float, stats: CacheStats):
+        try:
+            return self._store(key, await loader(), ttl, stats, transform)
+        finally:
+            with self._lock:
+                self._async_pending.pop(key, None)
+
+    async def fetch_async(self, key: str, name: str, loader, transform=None):
+        ttl = self.ttl(name)
+        if ttl <= 0:
+            return _apply(transform, await loader())
+        stats = self._stats_for(name)
+        value = self._lookup(key, stats, transform)
+        with self._lock:
+            if value is not MISS:
+                stats.hits += 1
+                return value
+            stats.misses += 1
+            task = self._async_pending.get(key)
+            if task is not None:
+                stats.coalesced += 1
+            else:
+                task = asyncio.ensure_future(self._load_async(key, loader, transform, ttl, stats))
+                task.add_done_callback(_consume)
+                self._async_pending[key] = task
+        return _copy(await asyncio.shield(task))
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        if key is None:
+            self._backend.clear()
+        else:
+            self._backend.delete(key)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    def __len__(self):
+        return len(self._backend)
+
+
+def get_cache(cache):
+    if cache is True:
+        return ResponseCache()
+    if cache is False:
+        return None
+    return cache
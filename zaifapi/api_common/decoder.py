@@ -0,0 +1,31 @@
+import json
+from decimal import Decimal
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+class JsonDecoder:
+    def __init__(self, use_decimal: bool = False, use_orjson: bool = True):
+        self.use_decimal = use_decimal
+        self._orjson = orjson if use_orjson and not use_decimal else None
+
+    def decode(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        if self._orjson is not None:
+            return self._orjson.loads(data)
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        if self.use_decimal:
+            return json.loads(data, parse_float=Decimal)
+        return json.loads(data)
+
+
+DEFAULT_DECODER = JsonDecoder()
+DECIMAL_DECODER = JsonDecoder(use_decimal=True)
+
+
+def get_decoder(decoder=None) -> JsonDecoder:
+    return decoder or DEFAULT_DECODER
@@ -0,0 +1,48 @@
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from .rate_limit import PRIORITY_NORMAL
+
+
+class Endpoint(NamedTuple):
+    name: str
+    schema_keys: Tuple[str, ...] = ()
+    dirs: Tuple[str, ...] = ()
+    verb: Optional[str] = None
+    priority: int = PRIORITY_NORMAL
+    model: Any = None
+    idempotent: bool = True
+    timeout: Any = None
+
+
+def endpoint(
+    *schema_keys: str,
+    dirs: Tuple[str, ...] = (),
+    verb: Optional[str] = None,
+    priority: int = PRIORITY_NORMAL,
+    model: Any = None,
+    idempotent: bool = True,
+    timeout: Any = None
+):
+    def decorator(func):
+        func.endpoint = Endpoint(
+            func.__name__,
+            tuple(schema_keys),
+            tuple(dirs),
+            verb,
+            priority,
+            model,
+            idempotent,
+            timeout,
+        )
+        return func
+
+    return decorator
+
+
+def collect_endpoints(cls, default_verb: str) -> Dict[str, Endpoint]:
+    endpoints = {}
+    for klass in reversed(cls.__mro__):
+        for attr in vars(klass).values():
+            endpoint_ = getattr(attr, "endpoint", None)
+            if isinstance(endpoint_, Endpoint):
+                endpoints[endpoint_.name] = endpoint_._replace(verb=endpoint_.verb or default_verb)
+    return endpoints
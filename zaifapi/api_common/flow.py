@@ -0,0 +1,28 @@
+def perform(effect):
+    return (yield effect)
+
+
+def run_flow(flow):
+    value = error = None
+    while True:
+        try:
+            effect = flow.send(value) if error is None else flow.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            value, error = effect(), None
+        except BaseException as e:
+            value, error = None, e
+
+
+async def run_flow_async(flow):
+    value = error = None
+    while True:
+        try:
+            effect = flow.send(value) if error is None else flow.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            value, error = await effect(), None
+        except BaseException as e:
+            value, error = None, e
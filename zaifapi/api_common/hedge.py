@@ -0,0 +1,234 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Optional
+from .instrumentation import Histogram
+
+DEFAULT_HEDGE_ENDPOINTS = ("ticker", "depth", "last_price")
+DEFAULT_HEDGE_QUANTILE = 0.95
+DEFAULT_INITIAL_DELAY = 0.1
+DEFAULT_MIN_DELAY = 0.005
+DEFAULT_MAX_DELAY = 1.0
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_WINDOW = 1000
+DEFAULT_MAX_WORKERS = 16
+
+_REFRESH_EVERY = 16
+
+
+class HedgeStats:
+    __slots__ = ("requests", "fired", "won", "skipped", "losers")
+
+    def __init__(self):
+        self.requests = 0
+        self.fired = 0
+        self.won = 0
+        self.skipped = 0
+        self.losers = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "fired": self.fired,
+            "won": self.won,
+            "skipped": self.skipped,
+            "losers": self.losers,
+            "fire_ratio": self.fired / self.requests if self.requests else 0.0,
+            "win_ratio": self.won / self.fired if self.fired else 0.0,
+        }
+
+
+class _Latency:
+    __slots__ = ("histogram", "delay", "refreshed")
+
+    def __init__(self, delay: float):
+        self.histogram = Histogram()
+        self.delay = delay
+        self.refreshed = 0
+
+
+class HedgePolicy:
+    def __init__(
+        self,
+        endpoints: Iterable[str] = DEFAULT_HEDGE_ENDPOINTS,
+        quantile: float = DEFAULT_HEDGE_QUANTILE,
+        initial_delay: float = DEFAULT_INITIAL_DELAY,
+        min_delay: float = DEFAULT_MIN_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        window: int = DEFAULT_WINDOW,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_in_flight: Optional[int] = None,
+        clock=time.perf_counter,
+    ):
+        self.endpoints = frozenset(endpoints)
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.window = window
+        self._max_workers = max_workers
+        self.max_in_flight = max_workers if max_in_flight is None else max_in_flight
+        self._in_flight = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, _Latency] = {}
+        self._stats: Dict[str, HedgeStats] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def applies(self, func_name: str) -> bool:
+        return func_name in self.endpoints
+
+    def _latency(self, func_name: str) -> _Latency:
+        latency = self._latencies.get(func_name)
+        if latency is None:
+            latency = self._latencies[func_name] = _Latency(self.initial_delay)
+        return latency
+
+    def delay(self, func_name: str) -> float:
+        with self._lock:
+            return self._latency(func_name).delay
+
+    def observe(self, func_name: str, seconds: float) -> None:
+        with self._lock:
+            latency = self._latency(func_name)
+            histogram = latency.histogram
+            if histogram.count >= self.window:
+                histogram = latency.histogram = Histogram()
+                latency.refreshed = 0
+            histogram.record(seconds)
+            if histogram.count >= self.min_samples and (
+                histogram.count - latency.refreshed >= _REFRESH_EVERY or not latency.refreshed
+            ):
+                delay = histogram.percentile(self.quantile)
+                latency.delay = min(self.max_delay, max(self.min_delay, delay))
+                latency.refreshed = histogram.count
+
+    def _count(self, func_name: str, counter: str, delta: int = 1) -> None:
+        with self._lock:
+            stats = self._stats.get(func_name)
+            if stats is None:
+                stats = self._stats[func_name] = HedgeStats()
+            setattr(stats, counter, getattr(stats, counter) + delta)
+
+    def _reserve(self) -> bool:
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                return False
+            self._in_flight += 1
+            return True
+
+    def _release(self, future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def _submit(self, func_name, request, before=None):
+        try:
+            future = self._get_executor().submit(self._timed, func_name, request, before)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _abandon(self, func_name: str, future) -> None:
+        if future.cancel():
+            return
+        self._count(func_name, "losers")
+        future.add_done_callback(lambda _: self._count(func_name, "losers", -1))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    self._max_workers, thread_name_prefix="zaifapi-hedge"
+                )
+            return self._executor
+
+    def _timed(self, func_name, request, before=None):
+        if before is not None:
+            before()
+        started = self._clock()
+        result = request()
+        self.observe(func_name, self._clock() - started)
+        return result
+
+    def call(self, func_name: str, request, before_hedge=None):
+        self._count(func_name, "requests")
+        if not self._reserve():
+            self._count(func_name, "skipped")
+            return self._timed(func_name, request)
+        primary = self._submit(func_name, request)
+        done, _ = wait([primary], timeout=self.delay(func_name))
+        if done:
+            return primary.result()
+        if not self._reserve():
+            self._count(func_name, "skipped")
+            return primary.result()
+        self._count(func_name, "fired")
+        hedge = self._submit(func_name, request, before_hedge)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        self._abandon(func_name, other)
+                    if future is hedge:
+                        self._count(func_name, "won")
+                    return future.result()
+        raise primary.exception()  # type: ignore
+
+    async def _timed_async(self, func_name, request, before=None):
+        if before is not None:
+            await before()
+        started = self._clock()
+        result = await request()
+        self.observe(func_name, self._clock() - started)
+        return result
+
+    async def call_async(self, func_name: str, request, before_hedge=None):
+        self._count(func_name, "requests")
+        primary = asyncio.ensure_future(self._timed_async(func_name, request))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self.delay(func_name))
+            if done:
+                return primary.result()
+            self._count(func_name, "fired")
+            hedge = asyncio.ensure_future(self._timed_async(func_name, request, before_hedge))
+            pending.add(hedge)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._count(func_name, "won")
+                        return task.result()
+            raise primary.exception()  # type: ignore
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            result = {}
+            for func_name, stats in self._stats.items():
+                result[func_name] = dict(stats.as_dict(), delay=self._latency(func_name).delay)
+            return result
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def get_hedge_policy(hedge):
+    if hedge is True:
+        return HedgePolicy()
+    if hedge is False:
+        return None
+    return hedge
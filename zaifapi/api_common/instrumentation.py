@@ -0,0 +1,252 @@
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+PHASE_RATE_LIMIT = "rate_limit"
+PHASE_VALIDATION = "validation"
+PHASE_SIGNING = "signing"
+PHASE_NETWORK = "network"
+PHASE_DECODING = "decoding"
+PHASE_TOTAL = "total"
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class Histogram:
+    def __init__(self, significant_bits: int = 7, unit: float = 1e-6):
+        self._bits = significant_bits
+        self._half = 1 << (significant_bits - 1)
+        self._unit = unit
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def _index(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self._bits)
+        if not shift:
+            return value
+        return shift * self._half + (value >> shift)
+
+    def _upper_bound(self, index: int) -> int:
+        if index < self._half * 2:
+            return index
+        shift = index // self._half - 1
+        return ((index - shift * self._half + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        index = self._index(int(seconds / self._unit))
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, quantile: float) -> float:
+        if not self.count:
+            return 0.0
+        threshold = quantile * self.count
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= threshold:
+                return min(self._upper_bound(index) * self._unit, self.max)
+        return self.max
+
+    def as_dict(self, quantiles=DEFAULT_QUANTILES) -> Dict[str, float]:
+        result = {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.mean,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+        for quantile in quantiles:
+            result["p{:g}".format(quantile * 100)] = self.percentile(quantile)
+        return result
+
+
+class _NullTrace:
+    __slots__ = ()
+
+    def mark(self, phase: str) -> None:
+        pass
+
+    def finish(self, result=None) -> None:
+        pass
+
+    def fail(self, error: BaseException) -> None:
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+class RequestTrace:
+    __slots__ = ("api", "endpoint", "phases", "started", "elapsed", "_last", "_owner")
+
+    def __init__(self, owner: "Instrumentation", api: str, endpoint: str):
+        self.api = api
+        self.endpoint = endpoint
+        self.phases: Dict[str, float] = {}
+        self.started = self._last = owner.clock()
+        self.elapsed = 0.0
+        self._owner = owner
+
+    def mark(self, phase: str) -> None:
+        now = self._owner.clock()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def _stop(self) -> None:
+        self.elapsed = self._owner.clock() - self.started
+
+    def finish(self, result=None) -> None:
+        self._stop()
+        self._owner._finish(self, result)
+
+    def fail(self, error: BaseException) -> None:
+        self._stop()
+        self._owner._fail(self, error)
+
+
+Hook = Callable[..., None]
+
+
+class Instrumentation:
+    def __init__(self, histograms: bool = True, clock=time.perf_counter):
+        self.clock = clock
+        self._record = histograms
+        self._pre: List[Hook] = []
+        self._post: List[Hook] = []
+        self._error: List[Hook] = []
+        self._histograms: Dict[Tuple[str, str, str], Histogram] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def add_hook(
+        self, pre: Optional[Hook] = None, post: Optional[Hook] = None, error: Optional[Hook] = None
+    ) -> None:
+        for hooks, hook in ((self._pre, pre), (self._post, post), (self._error, error)):
+            if hook is not None:
+                hooks.append(hook)
+
+    def start(self, api: str, endpoint: str) -> RequestTrace:
+        trace = RequestTrace(self, api, endpoint)
+        for hook in self._pre:
+            hook(trace)
+        return trace
+
+    def _observe(self, trace: RequestTrace) -> None:
+        if not self._record:
+            return
+        with self._lock:
+            for phase, seconds in trace.phases.items():
+                self._histogram(trace.api, trace.endpoint, phase).record(seconds)
+            self._histogram(trace.api, trace.endpoint, PHASE_TOTAL).record(trace.elapsed)
+
+    def _histogram(self, api: str, endpoint: str, phase: str) -> Histogram:
+        key = (api, endpoint, phase)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram()
+        return histogram
+
+    def _finish(self, trace: RequestTrace, result) -> None:
+        self._observe(trace)
+        for hook in self._post:
+            hook(trace, result)
+
+    def _fail(self, trace: RequestTrace, error: BaseException) -> None:
+        self._observe(trace)
+        with self._lock:
+            key = (trace.api, trace.endpoint)
+            self._errors[key] = self._errors.get(key, 0) + 1
+        for hook in self._error:
+            hook(trace, error)
+
+    def histogram(self, endpoint: str, phase: str = PHASE_TOTAL, api: Optional[str] = None):
+        with self._lock:
+            for (api_name, name, phase_name), histogram in self._histograms.items():
+                if name == endpoint and phase_name == phase and api in (None, api_name):
+                    return histogram
+        return None
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        with self._lock:
+            for (api, endpoint, phase), histogram in sorted(self._histograms.items()):
+                name = "{}.{}".format(api, endpoint)
+                result.setdefault(name, {})[phase] = histogram.as_dict()
+        return result
+
+    def prometheus_text(self, prefix: str = "zaifapi", quantiles=DEFAULT_QUANTILES) -> str:
+        metric = "{}_request_seconds".format(prefix)
+        lines = [
+            "# HELP {} Zaif API request latency by phase.".format(metric),
+            "# TYPE {} summary".format(metric),
+        ]
+        with self._lock:
+            for (api, endpoint, phase), histogram in sorted(self._histograms.items()):
+                labels = 'api="{}",endpoint="{}",phase="{}"'.format(api, endpoint, phase)
+                for quantile in quantiles:
+                    lines.append(
+                        '{}{{{},quantile="{:g}"}} {:.9g}'.format(
+                            metric, labels, quantile, histogram.percentile(quantile)
+                        )
+                    )
+                lines.append("{}_sum{{{}}} {:.9g}".format(metric, labels, histogram.total))
+                lines.append("{}_count{{{}}} {}".format(metric, labels, histogram.count))
+            errors = "{}_request_errors_total".format(prefix)
+            lines.append("# TYPE {} counter".format(errors))
+            for (api, endpoint), count in sorted(self._errors.items()):
+                lines.append('{}{{api="{}",endpoint="{}"}} {}'.format(errors, api, endpoint, count))
+        return "\n".join(lines) + "\n"
+
+
+class StatsdEmitter:
+    def __init__(self, host: str = "127.0.0.1", port: int = 8125, prefix: str = "zaifapi"):
+        self._address = (host, port)
+        self._prefix = prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def _format(self, trace: RequestTrace, error: Optional[BaseException]) -> bytes:
+        name = "{}.{}.{}".format(self._prefix, trace.api, trace.endpoint)
+        lines = [
+            "{}.{}:{:.3f}|ms".format(name, phase, s * 1000) for phase, s in trace.phases.items()
+        ]
+        lines.append("{}.{}:{:.3f}|ms".format(name, PHASE_TOTAL, trace.elapsed * 1000))
+        if error is not None:
+            lines.append("{}.errors:1|c".format(name))
+        return "\n".join(lines).encode("utf-8")
+
+    def post(self, trace: RequestTrace, result=None) -> None:
+        self._send(self._format(trace, None))
+
+    def error(self, trace: RequestTrace, error: BaseException) -> None:
+        self._send(self._format(trace, error))
+
+    def _send(self, payload: bytes) -> None:
+        try:
+            self._socket.sendto(payload, self._address)
+        except OSError:
+            pass
+
+    def attach(self, instrumentation: Instrumentation) -> "StatsdEmitter":
+        instrumentation.add_hook(post=self.post, error=self.error)
+        return self
+
+    def close(self) -> None:
+        self._socket.close()
+
+
+def start_trace(instrumentation: Optional[Instrumentation], api: str, endpoint: str):
+    if instrumentation is None:
+        return NULL_TRACE
+    return instrumentation.start(api, endpoint)
@@ -0,0 +1,98 @@
+import asyncio
+import os
+import threading
+import time
+import weakref
+from decimal import Decimal
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+_NONCE_SCALE = 6
+
+
+def _now() -> int:
+    return int(time.time() * 1000000)
+
+
+def _to_nonce(value: int) -> Decimal:
+    return Decimal(value).scaleb(-_NONCE_SCALE)
+
+
+class NonceGenerator:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last = 0
+
+    def next(self) -> Decimal:
+        with self._lock:
+            self._last = max(_now(), self._last + 1)
+            return _to_nonce(self._last)
+
+    __call__ = next
+
+
+class FileNonceGenerator(NonceGenerator):
+    def __init__(self, path: str):
+        if fcntl is None:
+            raise RuntimeError("FileNonceGenerator requires fcntl")
+        super().__init__()
+        self._path = path
+
+    def next(self) -> Decimal:
+        with self._lock:
+            fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                stored = os.read(fd, 32).strip()
+                last = max(int(stored) if stored else 0, self._last)
+                self._last = max(_now(), last + 1)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, str(self._last).encode("ascii"))
+            finally:
+                os.close(fd)
+            return _to_nonce(self._last)
+
+    __call__ = next
+
+
+_generators: Dict[Optional[str], NonceGenerator] = {}
+_generators_lock = threading.Lock()
+
+
+def get_nonce_generator(key: Optional[str] = None) -> NonceGenerator:
+    with _generators_lock:
+        generator = _generators.get(key)
+        if generator is None:
+            generator = _generators[key] = NonceGenerator()
+        return generator
+
+
+_send_locks: Dict[Optional[str], threading.Lock] = {}
+_async_send_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_send_lock(key: Optional[str] = None) -> threading.Lock:
+    with _generators_lock:
+        lock = _send_locks.get(key)
+        if lock is None:
+            lock = _send_locks[key] = threading.Lock()
+        return lock
+
+
+def get_async_send_lock(key: Optional[str] = None) -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    with _generators_lock:
+        locks = _async_send_locks.get(loop)
+        if locks is None:
+            locks = _async_send_locks[loop] = {}
+        lock = locks.get(key)
+        if lock is None:
+            lock = locks[key] = asyncio.Lock()
+        return lock
@@ -0,0 +1,174 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+MIN_WAIT_TIME_SEC = 1
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+
+class Budget(NamedTuple):
+    calls: float
+    per: float = MIN_WAIT_TIME_SEC
+
+
+DEFAULT_BUDGETS: Dict[str, Budget] = {
+    "api": Budget(10),
+    "fapi": Budget(10),
+    "tapi": Budget(5),
+    "tlapi": Budget(5),
+}
+
+
+class TokenBucket:
+    def __init__(self, budget: Budget, clock=time.monotonic):
+        self._rate = budget.calls / budget.per
+        self._capacity = float(budget.calls)
+        self._tokens = self._capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def take(self) -> float:
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+    def wait_time(self) -> float:
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self._rate)
+
+
+class WaitStats:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, waited: float) -> None:
+        self.count += 1
+        self.total += waited
+        self.max = max(self.max, waited)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"count": self.count, "total": self.total, "mean": self.mean, "max": self.max}
+
+
+class _Lane:
+    def __init__(self, budget: Budget, clock):
+        self.bucket = TokenBucket(budget, clock)
+        self.waiters: list = []
+
+
+class RateLimiter:
+    def __init__(self, budgets: Optional[Dict[str, Budget]] = None, clock=time.monotonic):
+        self._budgets = dict(DEFAULT_BUDGETS if budgets is None else budgets)
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._lanes: Dict[str, _Lane] = {}
+        self._seq = itertools.count()
+        self._stats: Dict[tuple, WaitStats] = {}
+
+    def _get_lane(self, group) -> Optional[_Lane]:
+        lane = self._lanes.get(group)
+        if lane is None:
+            budget = self._budgets.get(group)
+            if budget is None:
+                return None
+            lane = self._lanes[group] = _Lane(budget, self._clock)
+        return lane
+
+    def _enqueue(self, lane, priority):
+        entry = (priority, next(self._seq))
+        heapq.heappush(lane.waiters, entry)
+        return entry
+
+    def _dequeue(self, lane, entry) -> None:
+        if entry in lane.waiters:
+            lane.waiters.remove(entry)
+            heapq.heapify(lane.waiters)
+            self._cond.notify_all()
+
+    def _poll(self, lane: _Lane, entry) -> float:
+        if lane.waiters[0] != entry:
+            return lane.bucket.wait_time() or MIN_WAIT_TIME_SEC / 100
+        wait = lane.bucket.take()
+        if wait == 0:
+            heapq.heappop(lane.waiters)
+            self._cond.notify_all()
+        return wait
+
+    def _record(self, group, priority, started) -> float:
+        waited: float = self._clock() - started
+        with self._cond:
+            stats = self._stats.get((group, priority))
+            if stats is None:
+                stats = self._stats[(group, priority)] = WaitStats()
+            stats.add(waited)
+        return waited
+
+    def acquire(self, group, priority=PRIORITY_NORMAL) -> float:
+        started = self._clock()
+        with self._cond:
+            lane = self._get_lane(group)
+            if lane is None:
+                return 0.0
+            entry = self._enqueue(lane, priority)
+            try:
+                wait = self._poll(lane, entry)
+                while wait > 0:
+                    self._cond.wait(wait)
+                    wait = self._poll(lane, entry)
+            except BaseException:
+                self._dequeue(lane, entry)
+                raise
+        return self._record(group, priority, started)
+
+    async def acquire_async(self, group, priority=PRIORITY_NORMAL) -> float:
+        started = self._clock()
+        with self._cond:
+            lane = self._get_lane(group)
+            if lane is None:
+                return 0.0
+            entry = self._enqueue(lane, priority)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._poll(lane, entry)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+        except BaseException:
+            with self._cond:
+                self._dequeue(lane, entry)
+            raise
+        return self._record(group, priority, started)
+
+    def stats(self) -> Dict[str, Dict[int, Dict[str, float]]]:
+        with self._cond:
+            result: Dict[str, Dict[int, Dict[str, float]]] = {}
+            for (group, priority), stats in self._stats.items():
+                result.setdefault(group, {})[priority] = stats.as_dict()
+            return result
+
+    def queue_length(self, group) -> int:
+        with self._cond:
+            lane = self._lanes.get(group)
+            return len(lane.waiters) if lane else 0
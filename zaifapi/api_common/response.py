@@ -1,13 +1,33 @@
-import json
 from typing import Any, Dict, Optional
 import requests
 from zaifapi.api_error import ZaifServerException
+from .decoder import get_decoder
+from .instrumentation import NULL_TRACE, PHASE_DECODING, PHASE_NETWORK
+from .session import DEFAULT_TIMEOUT, Timeout
 
 
 def get_response(
-    url, params: Optional[Dict[Any, Any]] = None, headers: Optional[Dict[Any, Any]] = None
+    url,
+    params: Optional[Dict[Any, Any]] = None,
+    headers: Optional[Dict[Any, Any]] = None,
+    session: Optional[requests.Session] = None,
+    decoder=None,
+    trace=NULL_TRACE,
+    timeout: Timeout = None,
 ) -> Any:
-    response = requests.post(url, data=params, headers=headers)
+    if timeout is None and not hasattr(session, "timeout"):
+        timeout = DEFAULT_TIMEOUT
+    if session is None:
+        response = requests.post(url, data=params, headers=headers, timeout=timeout)
+    elif timeout is None:
+        response = session.post(url, data=params, headers=headers)
+    else:
+        response = session.post(url, data=params, headers=headers, timeout=timeout)
+    trace.mark(PHASE_NETWORK)
     if response.status_code != 200:
-        raise ZaifServerException("return status code is {}".format(response.status_code))
-    return json.loads(response.text)
+        raise ZaifServerException(
+            "return status code is {}".format(response.status_code), response.status_code
+        )
+    result = get_decoder(decoder).decode(response.content)
+    trace.mark(PHASE_DECODING)
+    return result
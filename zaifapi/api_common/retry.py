@@ -0,0 +1,157 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Union
+import requests
+from zaifapi.api_error import ZaifCircuitOpenError, ZaifServerException
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.1
+DEFAULT_MAX_BACKOFF = 2.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+RETRY_STATUS_CODES = frozenset((429,))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_TRANSIENT_ERRORS: tuple = (requests.ConnectionError, requests.Timeout, asyncio.TimeoutError)
+if aiohttp is not None:
+    _TRANSIENT_ERRORS += (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+
+
+def is_transient(error: BaseException) -> bool:
+    if isinstance(error, ZaifServerException):
+        status = error.status_code
+        return status is None or status >= 500 or status in RETRY_STATUS_CODES
+    return isinstance(error, _TRANSIENT_ERRORS)
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        jitter: bool = True,
+        random=random.random,
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self._random: Callable[[], float] = random
+
+    def delay(self, attempt: int) -> float:
+        delay = min(self.max_backoff, self.backoff * (1 << attempt))
+        return delay * self._random() if self.jitter else delay
+
+    def next_delay(self, error: BaseException, attempt: int) -> Optional[float]:
+        if attempt >= self.retries or not is_transient(error):
+            return None
+        return self.delay(attempt)
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self._trips = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def before(self) -> None:
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            now = self._clock()
+            remaining = self.reset_timeout - (now - self._opened_at)
+            if self._state == OPEN and remaining <= 0:
+                self._state = HALF_OPEN
+                self._probing = False
+            if self._state == HALF_OPEN and (
+                not self._probing or now - self._probe_started >= self.reset_timeout
+            ):
+                self._probing = True
+                self._probe_started = now
+                return
+            if self._state == HALF_OPEN:
+                remaining = self.reset_timeout - (now - self._probe_started)
+            self._rejected += 1
+        raise ZaifCircuitOpenError("circuit open, retry in {:.1f}s".format(max(0.0, remaining)))
+
+    def record(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if error is not None and not isinstance(error, Exception):
+                self._probing = False
+                return
+            if error is None or not is_transient(error):
+                if self._state != OPEN:
+                    self._state = CLOSED
+                    self._failures = 0
+                return
+            self._failures += 1
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._trips += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def stats(self) -> Dict[str, Union[str, int]]:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "failures": self._failures,
+                "trips": self._trips,
+                "rejected": self._rejected,
+            }
+
+
+def get_retry_policy(retry):
+    if retry is True:
+        return RetryPolicy()
+    if retry is False:
+        return None
+    return retry
+
+
+def get_circuit_breaker(circuit_breaker):
+    if circuit_breaker is True:
+        return CircuitBreaker()
+    if circuit_breaker is False:
+        return None
+    return circuit_breaker
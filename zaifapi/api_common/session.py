@@ -0,0 +1,38 @@
+from typing import Optional, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_TIMEOUT: Tuple[float, float] = (3.05, 30.0)
+
+Timeout = Optional[Union[float, Tuple[float, float]]]
+
+
+class ZaifSession(requests.Session):
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        pool_block: bool = False,
+    ):
+        super().__init__()
+        self.timeout = timeout
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        self.headers["Connection"] = "keep-alive"
+
+    def request(self, method, url, *args, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().request(method, url, *args, **kwargs)
+
+
+def get_session(session: Optional[requests.Session] = None) -> requests.Session:
+    if session is not None:
+        return session
+    return ZaifSession()
@@ -0,0 +1,173 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from .cache import CacheBackend, EXPIRED, MISS
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+DEFAULT_SLOTS = 256
+DEFAULT_SLOT_SIZE = 64 * 1024
+MAX_READ_RETRIES = 16
+
+_MAGIC = b"ZAIFCCH1"
+_FILE_HEADER = struct.Struct("<8sII")
+_SLOT_HEADER = struct.Struct("<QdQII")
+_DATA_OFFSET = 64
+
+
+def _hash_key(key: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+class MmapCacheBackend(CacheBackend):
+    clock = staticmethod(time.time)
+
+    def __init__(self, path: str, slots: int = DEFAULT_SLOTS, slot_size: int = DEFAULT_SLOT_SIZE):
+        if fcntl is None:
+            raise RuntimeError("MmapCacheBackend requires fcntl")
+        self._path = path
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                self._slots, self._slot_size = self._init_file(slots, slot_size)
+                size = _DATA_OFFSET + self._slots * self._slot_size
+                self._mmap = mmap.mmap(self._fd, size)
+                self._repair()
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._capacity = self._slot_size - _SLOT_HEADER.size
+
+    def _init_file(self, slots, slot_size):
+        header = os.pread(self._fd, _FILE_HEADER.size, 0)
+        if len(header) == _FILE_HEADER.size:
+            magic, stored_slots, stored_size = _FILE_HEADER.unpack(header)
+            if magic == _MAGIC:
+                return stored_slots, stored_size
+        os.ftruncate(self._fd, _DATA_OFFSET + slots * slot_size)
+        os.pwrite(self._fd, _FILE_HEADER.pack(_MAGIC, slots, slot_size), 0)
+        return slots, slot_size
+
+    def _repair(self) -> None:
+        for index in range(self._slots):
+            offset = _DATA_OFFSET + index * self._slot_size
+            if _SLOT_HEADER.unpack_from(self._mmap, offset)[0] & 1:
+                self._clear_slot(offset)
+
+    def _slot(self, key_hash: int):
+        return _DATA_OFFSET + (key_hash % self._slots) * self._slot_size
+
+    def get(self, key, now, transform=None):
+        encoded = key.encode("utf-8")
+        key_hash = _hash_key(encoded)
+        offset = self._slot(key_hash)
+        transform = transform or bytes
+        with memoryview(self._mmap) as view:
+            for _ in range(MAX_READ_RETRIES):
+                seq, expires, stored_hash, key_len, value_len = _SLOT_HEADER.unpack_from(
+                    view, offset
+                )
+                if seq & 1:
+                    continue
+                if stored_hash != key_hash or seq == 0:
+                    return MISS
+                start = offset + _SLOT_HEADER.size
+                middle = start + key_len
+                if view[start:middle] != encoded:
+                    return MISS
+                if expires <= now:
+                    return EXPIRED
+                end = middle + value_len
+                data = view[middle:end]
+                try:
+                    value = transform(data)
+                except Exception:
+                    if _SLOT_HEADER.unpack_from(view, offset)[0] == seq:
+                        raise
+                    continue
+                finally:
+                    data.release()
+                if _SLOT_HEADER.unpack_from(view, offset)[0] == seq:
+                    return value
+        return MISS
+
+    def set(self, key, value, expires):
+        encoded = key.encode("utf-8")
+        if len(encoded) + len(value) > self._capacity:
+            return 0
+        key_hash = _hash_key(encoded)
+        offset = self._slot(key_hash)
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                seq, _, stored_hash, _, _ = _SLOT_HEADER.unpack_from(self._mmap, offset)
+                evicted = int(stored_hash not in (0, key_hash))
+                seq |= 1
+                _SLOT_HEADER.pack_into(self._mmap, offset, seq, 0.0, 0, 0, 0)
+                start = offset + _SLOT_HEADER.size
+                middle = start + len(encoded)
+                end = middle + len(value)
+                self._mmap[start:middle] = encoded
+                self._mmap[middle:end] = value
+                _SLOT_HEADER.pack_into(
+                    self._mmap, offset, seq + 1, expires, key_hash, len(encoded), len(value)
+                )
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return evicted
+
+    def _clear_slot(self, offset: int) -> None:
+        seq = _SLOT_HEADER.unpack_from(self._mmap, offset)[0]
+        if seq:
+            seq |= 1
+            _SLOT_HEADER.pack_into(self._mmap, offset, seq, 0.0, 0, 0, 0)
+            _SLOT_HEADER.pack_into(self._mmap, offset, seq + 1, 0.0, 0, 0, 0)
+
+    def delete(self, key):
+        encoded = key.encode("utf-8")
+        key_hash = _hash_key(encoded)
+        offset = self._slot(key_hash)
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                if _SLOT_HEADER.unpack_from(self._mmap, offset)[2] == key_hash:
+                    self._clear_slot(offset)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def clear(self):
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                for index in range(self._slots):
+                    self._clear_slot(_DATA_OFFSET + index * self._slot_size)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def __len__(self):
+        count = 0
+        for index in range(self._slots):
+            offset = _DATA_OFFSET + index * self._slot_size
+            if _SLOT_HEADER.unpack_from(self._mmap, offset)[2]:
+                count += 1
+        return count
+
+    def close(self):
+        self._mmap.close()
+        os.close(self._fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -5,6 +5,8 @@ from urllib.parse import urlencode
 
 class ApiUrl:
     _skeleton_url = "{}://{}{}"
+    _cached_attrs = frozenset(("_protocol", "_host", "_api_name", "_port", "_version", "_dirs"))
+    _url_cache: Optional[str] = None
 
     def __init__(
         self,
@@ -25,6 +27,17 @@ class ApiUrl:
         self._dirs = dirs or []
         self._version = version
 
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if name in self._cached_attrs:
+            super().__setattr__("_url_cache", None)
+
+    def _get_cached_url(self) -> str:
+        url = self._url_cache
+        if url is None:
+            url = self._url_cache = self.get_base_url() + self.get_pathname()
+        return url
+
     def get_base_url(self) -> str:
         base = self._skeleton_url.format(self._protocol, self._host, self._get_port())
         if self._api_name:
@@ -35,11 +48,25 @@ class ApiUrl:
         return base
 
     def get_absolute_url(self, *, with_params: bool = False) -> str:
-        absolute_url = self.get_base_url() + self.get_pathname()
+        absolute_url = self._get_cached_url()
         if with_params is True:
             absolute_url += self._q_params.get_str_params()
         return absolute_url
 
+    def build_url(self, *dirs, params=None) -> str:
+        url = self._get_cached_url()
+        for dir_ in dirs:
+            if dir_ is None:
+                break
+            url += "/" + str(dir_)
+        if params:
+            q_params = QueryParam(dict(self._q_params._params))
+            q_params.add_params(params)
+            url += q_params.get_str_params()
+        elif len(self._q_params):
+            url += self._q_params.get_str_params()
+        return url
+
     def get_pathname(self) -> str:
         path_name = ""
         for dir_ in self._dirs:
@@ -54,8 +81,9 @@ class ApiUrl:
     def add_dirs(self, dir_, *dirs) -> None:
         for dir_ in itertools.chain((dir_,), dirs):
             if dir_ is None:
-                return
+                break
             self._dirs.append(str(dir_))
+        self._url_cache = None
 
     def refresh_dirs(self) -> None:
         self._dirs = []
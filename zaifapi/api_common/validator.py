@@ -1,13 +1,19 @@
 import json
+import threading
 from decimal import Decimal
-from typing import Any, Dict
+from numbers import Integral
+from typing import Any, Dict, Tuple
 import cerberus
 from zaifapi.api_error import ZaifApiValidationError
 
+_compiled_schemas: Dict[Tuple[type, Tuple[str, ...]], "_CompiledSchema"] = {}
+_unit_validators = threading.local()
+
 
 class ZaifApiValidator:
-    def __init__(self):
+    def __init__(self, fast=True):
         self._schema = _ZaifValidationSchema()
+        self._fast = fast
 
     def params_pre_processing(self, schema_keys, params):
         self._validate(schema_keys, params)
@@ -21,16 +27,36 @@ class ZaifApiValidator:
         return params
 
     def _validate(self, schema_keys, params):
-        required_schema = self._schema.select(schema_keys)
-        v = _UnitValidator(required_schema)
+        schema_keys = tuple(schema_keys)
+        if self._fast and self._get_compiled_schema(schema_keys).is_valid(params):
+            return
+        v = self._get_unit_validator(schema_keys)
         if v.validate(params):
             return
         raise ZaifApiValidationError(json.dumps(v.errors))
 
+    def _get_compiled_schema(self, schema_keys):
+        cache_key = (type(self), schema_keys)
+        compiled = _compiled_schemas.get(cache_key)
+        if compiled is None:
+            compiled = _CompiledSchema(self._schema.select(schema_keys))
+            _compiled_schemas[cache_key] = compiled
+        return compiled
+
+    def _get_unit_validator(self, schema_keys):
+        validators = getattr(_unit_validators, "cache", None)
+        if validators is None:
+            validators = _unit_validators.cache = {}
+        cache_key = (type(self), schema_keys)
+        v = validators.get(cache_key)
+        if v is None:
+            v = validators[cache_key] = _UnitValidator(self._schema.select(schema_keys))
+        return v
+
 
 class FuturesPublicApiValidator(ZaifApiValidator):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, fast=True):
+        super().__init__(fast)
         self._schema.updates({"currency_pair": {"type": "string", "nullable": True}})
 
 
@@ -44,9 +70,58 @@ class _UnitValidator(cerberus.Validator):
         return super().validate(params)
 
 
+_TYPES: Dict[str, Tuple[tuple, tuple]] = {
+    "integer": ((Integral,), ()),
+    "number": ((float, Integral), (bool,)),
+    "string": ((str,), ()),
+    "boolean": ((bool,), ()),
+    "decimal": ((Decimal,), ()),
+}
+
+
+class _CompiledSchema:
+    __slots__ = ("_rules", "_required")
+
+    def __init__(self, schema):
+        self._rules = {key: self._compile(rule) for key, rule in schema.items()}
+        self._required = tuple(key for key, rule in schema.items() if rule.get("required"))
+
+    @staticmethod
+    def _compile(rule):
+        types = rule.get("type", ())
+        if isinstance(types, str):
+            types = [types]
+        checks = tuple(_TYPES[type_] for type_ in types)
+        allowed = frozenset(rule["allowed"]) if "allowed" in rule else None
+        return checks, allowed, rule.get("nullable", False)
+
+    def is_valid(self, params) -> bool:
+        for key in self._required:
+            if key not in params:
+                return False
+        rules = self._rules
+        for key, value in params.items():
+            rule = rules.get(key)
+            if rule is None:
+                return False
+            checks, allowed, nullable = rule
+            if value is None:
+                if nullable:
+                    continue
+                return False
+            if checks and not any(
+                isinstance(value, included) and not isinstance(value, excluded)
+                for included, excluded in checks
+            ):
+                return False
+            if allowed is not None and value not in allowed:
+                return False
+        return True
+
+
 class _ZaifValidationSchema:
     def __init__(self):
-        self._schema = DEFAULT_SCHEMA
+        self._schema = dict(DEFAULT_SCHEMA)
 
     def all(self) -> Any:
         return self._schema
@@ -58,7 +133,10 @@ class _ZaifValidationSchema:
         self._schema[k] = v
 
     def updates(self, dictionary) -> None:
-        for k, v, in dictionary.items():
+        for (
+            k,
+            v,
+        ) in dictionary.items():
             self.update(k, v)
 
 
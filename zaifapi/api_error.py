@@ -15,4 +15,10 @@ class ZaifApiValidationError(ZaifApiError):
 
 
 class ZaifServerException(ZaifApiError):
+    def __init__(self, message: str, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ZaifCircuitOpenError(ZaifApiError):
     pass
@@ -0,0 +1,135 @@
+from typing import Any, Dict, Optional
+from zaifapi.models import DepthSnapshot, Orders, Positions, Trades, _Table
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover
+    pd = None  # type: ignore
+
+TRADE_DTYPES = {"tid": "i8", "date": "i8", "price": "f8", "amount": "f8"}
+ORDER_DTYPES = {
+    "id": "i8",
+    "amount": "f8",
+    "price": "f8",
+    "fee": "f8",
+    "bonus": "f8",
+    "timestamp": "f8",
+}
+POSITION_DTYPES = {
+    "id": "i8",
+    "group_id": "i8",
+    "amount": "f8",
+    "price": "f8",
+    "limit": "f8",
+    "stop": "f8",
+    "timestamp": "f8",
+    "leverage": "f8",
+}
+
+
+def _as_table(data, table_cls):
+    if isinstance(data, table_cls):
+        return data
+    return table_cls.from_json(data)
+
+
+def table_columns(table: _Table) -> Dict[str, Any]:
+    return {name: table.column(name) for name in table._row.__slots__}
+
+
+def trades_columns(trades) -> Dict[str, Any]:
+    return table_columns(_as_table(trades, Trades))
+
+
+def trade_history_columns(history) -> Dict[str, Any]:
+    return table_columns(_as_table(history, Orders))
+
+
+def positions_columns(positions) -> Dict[str, Any]:
+    return table_columns(_as_table(positions, Positions))
+
+
+def depth_columns(depth) -> Dict[str, Dict[str, Any]]:
+    depth = _as_table(depth, DepthSnapshot)
+    return {
+        "asks": {"price": depth.ask_prices, "amount": depth.ask_amounts},
+        "bids": {"price": depth.bid_prices, "amount": depth.bid_amounts},
+    }
+
+
+def _require(module, name):
+    if module is None:
+        raise ImportError("{} is required for this conversion".format(name))
+    return module
+
+
+def _column_to_numpy(values, dtype: Optional[str]):
+    if dtype is not None:
+        try:
+            return np.frombuffer(values, dtype=dtype)
+        except (TypeError, ValueError):
+            return np.array([np.nan if v is None else v for v in values], dtype=dtype)
+    if values and all(isinstance(v, str) for v in values):
+        return np.array(values, dtype=str)
+    return np.array(values, dtype=object)
+
+
+def columns_to_numpy(columns: Dict[str, Any], dtypes: Optional[Dict[str, str]] = None):
+    _require(np, "numpy")
+    dtypes = dtypes or {}
+    arrays = {name: _column_to_numpy(values, dtypes.get(name)) for name, values in columns.items()}
+    length = len(next(iter(arrays.values()))) if arrays else 0
+    result = np.empty(length, dtype=[(name, array.dtype) for name, array in arrays.items()])
+    for name, array in arrays.items():
+        result[name] = array
+    return result
+
+
+def trades_to_numpy(trades):
+    return columns_to_numpy(trades_columns(trades), TRADE_DTYPES)
+
+
+def trade_history_to_numpy(history):
+    return columns_to_numpy(trade_history_columns(history), ORDER_DTYPES)
+
+
+def positions_to_numpy(positions):
+    return columns_to_numpy(positions_columns(positions), POSITION_DTYPES)
+
+
+def depth_to_numpy(depth):
+    dtypes = {"price": "f8", "amount": "f8"}
+    return {side: columns_to_numpy(cols, dtypes) for side, cols in depth_columns(depth).items()}
+
+
+def _to_dataframe(columns, dtypes, index=None):
+    _require(pd, "pandas")
+    _require(np, "numpy")
+    frame = pd.DataFrame(
+        {name: _column_to_numpy(values, dtypes.get(name)) for name, values in columns.items()}
+    )
+    if index is not None:
+        frame = frame.set_index(index)
+    return frame
+
+
+def trades_to_dataframe(trades):
+    return _to_dataframe(trades_columns(trades), TRADE_DTYPES)
+
+
+def trade_history_to_dataframe(history):
+    return _to_dataframe(trade_history_columns(history), ORDER_DTYPES, index="id")
+
+
+def positions_to_dataframe(positions):
+    return _to_dataframe(positions_columns(positions), POSITION_DTYPES, index="id")
+
+
+def depth_to_dataframe(depth):
+    dtypes = {"price": "f8", "amount": "f8"}
+    return {side: _to_dataframe(cols, dtypes) for side, cols in depth_columns(depth).items()}
@@ -4,8 +4,30 @@ from zaifapi.api_common import ZaifApi
 
 
 class ZaifExchangeApi(ZaifApi, metaclass=ABCMeta):
-    def __init__(self, url, validator=None):
-        super().__init__(url)
+    def __init__(
+        self,
+        url,
+        validator=None,
+        session=None,
+        rate_limiter=None,
+        decoder=None,
+        typed=False,
+        instrumentation=None,
+        timeouts=None,
+        retry=None,
+        circuit_breaker=None,
+    ):
+        super().__init__(
+            url,
+            session,
+            rate_limiter,
+            decoder,
+            typed,
+            instrumentation,
+            timeouts,
+            retry,
+            circuit_breaker,
+        )
         self._validator = validator or ZaifApiValidator()
 
     @abstractmethod
@@ -15,7 +37,13 @@ class ZaifExchangeApi(ZaifApi, metaclass=ABCMeta):
 
 from .public import ZaifPublicApi, ZaifFuturesPublicApi, ZaifPublicStreamApi  # NOQA
 from .trade import ZaifTokenTradeApi, ZaifTradeApi, ZaifLeverageTradeApi  # NOQA
-
+from .async_public import (  # NOQA
+    AsyncZaifPublicApi,
+    AsyncZaifFuturesPublicApi,
+    AsyncZaifPublicStreamApi,
+)
+from .async_trade import AsyncZaifTradeApi, AsyncZaifLeverageTradeApi  # NOQA
+from .stream_manager import ZaifStreamManager  # NOQA
 
 __all__ = [
     "ZaifLeverageTradeApi",
@@ -24,4 +52,10 @@ __all__ = [
     "ZaifFuturesPublicApi",
     "ZaifPublicApi",
     "ZaifPublicStreamApi",
+    "AsyncZaifLeverageTradeApi",
+    "AsyncZaifTradeApi",
+    "AsyncZaifFuturesPublicApi",
+    "AsyncZaifPublicApi",
+    "AsyncZaifPublicStreamApi",
+    "ZaifStreamManager",
 ]
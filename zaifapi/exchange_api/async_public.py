@@ -0,0 +1,41 @@
+from zaifapi.api_common import AsyncZaifApiMixin
+from .batch import run_batch_async
+from .public import ZaifPublicApi, ZaifFuturesPublicApi, ZaifPublicStreamApi
+
+try:
+    from aiohttp import WSMsgType
+except ImportError:  # pragma: no cover
+    WSMsgType = None  # type: ignore
+
+
+class _AsyncZaifPublicApiMixin(AsyncZaifApiMixin):
+    _run_batch = staticmethod(run_batch_async)
+
+    def _cache_fetch(self, key, name, loader, transform):
+        return self._cache.fetch_async(key, name, loader, transform)
+
+    def _hedge_call(self, func_name, request, before_hedge):
+        return self._hedge.call_async(func_name, request, before_hedge)
+
+
+class AsyncZaifPublicApi(_AsyncZaifPublicApiMixin, ZaifPublicApi):
+    pass
+
+
+class AsyncZaifFuturesPublicApi(_AsyncZaifPublicApiMixin, ZaifFuturesPublicApi):
+    pass
+
+
+class AsyncZaifPublicStreamApi(AsyncZaifApiMixin, ZaifPublicStreamApi):
+    async def execute(self, currency_pair, heartbeat=None, raw=False):
+        params = {"currency_pair": currency_pair}
+        params = self._params_pre_processing(["currency_pair"], params=params)
+        url = self._url.build_url(params=params)
+        async with self._session.ws_connect(url, heartbeat=heartbeat) as ws:
+            async for message in ws:
+                if not self._continue:
+                    break
+                if message.type == WSMsgType.TEXT:
+                    yield message.data if raw else self._decoder.decode(message.data)
+                elif message.type in (WSMsgType.CLOSED, WSMsgType.ERROR):
+                    break
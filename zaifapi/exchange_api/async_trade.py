@@ -0,0 +1,23 @@
+from zaifapi.api_common import AsyncZaifApiMixin, get_async_response, get_async_send_lock
+from .batch import run_batch_async
+from .pagination import aiter_history
+from .trade import ZaifTradeApi, ZaifLeverageTradeApi
+
+
+class _AsyncZaifTradeApiMixin(AsyncZaifApiMixin):
+    _iter_history = staticmethod(aiter_history)
+    _run_batch = staticmethod(run_batch_async)
+
+    def _request(self, url, data, header, trace, timeout):
+        return get_async_response(url, data, header, self._session, self._decoder, trace, timeout)
+
+    def _get_send_lock(self):
+        return get_async_send_lock(self._send_key)
+
+
+class AsyncZaifTradeApi(_AsyncZaifTradeApiMixin, ZaifTradeApi):
+    pass
+
+
+class AsyncZaifLeverageTradeApi(_AsyncZaifTradeApiMixin, ZaifLeverageTradeApi):
+    pass
@@ -0,0 +1,62 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Hashable
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+class BatchResult(dict):
+    def __init__(self):
+        super().__init__()
+        self.errors: Dict[Hashable, BaseException] = {}
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def raise_first(self) -> None:
+        for error in self.errors.values():
+            raise error
+
+    def __repr__(self):
+        return "BatchResult({}, errors={!r})".format(dict.__repr__(self), self.errors)
+
+
+def _collect(keys, outcomes) -> BatchResult:
+    result = BatchResult()
+    for key, (value, error) in zip(keys, outcomes):
+        if error is None:
+            result[key] = value
+        else:
+            result.errors[key] = error
+    return result
+
+
+def _call(func, key, kwargs):
+    try:
+        return func(key, **kwargs), None
+    except Exception as e:
+        return None, e
+
+
+def run_batch(func, keys, max_concurrency=DEFAULT_MAX_CONCURRENCY, **kwargs):
+    keys = list(dict.fromkeys(keys))
+    if len(keys) <= 1 or max_concurrency <= 1:
+        return _collect(keys, [_call(func, key, kwargs) for key in keys])
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(keys))) as executor:
+        outcomes = list(executor.map(lambda key: _call(func, key, kwargs), keys))
+    return _collect(keys, outcomes)
+
+
+async def run_batch_async(func, keys, max_concurrency=DEFAULT_MAX_CONCURRENCY, **kwargs):
+    keys = list(dict.fromkeys(keys))
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def call(key):
+        async with semaphore:
+            try:
+                return await func(key, **kwargs), None
+            except Exception as e:
+                return None, e
+
+    return _collect(keys, await asyncio.gather(*(call(key) for key in keys)))
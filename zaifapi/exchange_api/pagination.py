@@ -0,0 +1,72 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from zaifapi.api_error import ZaifApiValidationError
+
+MAX_COUNT = 1000
+
+
+def _prepare(params):
+    params = dict(params)
+    if "from_num" in params:
+        raise ZaifApiValidationError("from_num cannot be combined with id based pagination")
+    params["count"] = min(params.get("count", MAX_COUNT), MAX_COUNT)
+    params.setdefault("order", "DESC")
+    return params
+
+
+def _walk_page(page, params):
+    ids = sorted((int(key), key) for key in page)
+    if params["order"] == "DESC":
+        ids.reverse()
+    records = [(id_, page[key]) for id_, key in ids]
+    if len(records) < params["count"]:
+        return records, None
+    next_params = dict(params)
+    if params["order"] == "DESC":
+        next_params["end_id"] = records[-1][0] - 1
+        if next_params["end_id"] < params.get("from_id", 0):
+            return records, None
+    else:
+        next_params["from_id"] = records[-1][0] + 1
+    return records, next_params
+
+
+def iter_history(fetch, params, prefetch=True):
+    params = _prepare(params)
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        page = fetch(**params)
+        while True:
+            records, next_params = _walk_page(page, params)
+            future = None
+            if next_params is not None and executor is not None:
+                future = executor.submit(fetch, **next_params)
+            yield from records
+            if next_params is None:
+                return
+            page = future.result() if future is not None else fetch(**next_params)
+            params = next_params
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+async def aiter_history(fetch, params, prefetch=True):
+    params = _prepare(params)
+    page = await fetch(**params)
+    task = None
+    try:
+        while True:
+            records, next_params = _walk_page(page, params)
+            if next_params is not None and prefetch:
+                task = asyncio.ensure_future(fetch(**next_params))
+            for record in records:
+                yield record
+            if next_params is None:
+                return
+            page = await task if task is not None else await fetch(**next_params)
+            task = None
+            params = next_params
+    finally:
+        if task is not None:
+            task.cancel()
@@ -1,136 +1,278 @@
-import json
-import requests
 from abc import ABCMeta
-from typing import Optional
+from functools import partial
+from typing import Optional, Set
 
-from zaifapi.api_error import ZaifApiError
-from websocket import create_connection
-from zaifapi.api_common import ApiUrl, method_name, get_api_url, FuturesPublicApiValidator
+from zaifapi.api_error import ZaifServerException
+from zaifapi.api_common import (
+    ApiUrl,
+    endpoint,
+    get_api_url,
+    get_cache,
+    get_hedge_policy,
+    FuturesPublicApiValidator,
+    NULL_TRACE,
+    perform,
+    PHASE_DECODING,
+    PHASE_NETWORK,
+    PHASE_VALIDATION,
+    PRIORITY_LOW,
+)
+from zaifapi.models import DepthSnapshot, Ticker, Trades
 from . import ZaifExchangeApi
+from .batch import DEFAULT_MAX_CONCURRENCY, run_batch
+from .stream import StreamConnection
 
 
 class _ZaifPublicApiBase(ZaifExchangeApi, metaclass=ABCMeta):
-    def _execute_api(self, func_name, schema_keys=None, q_params=None, **kwargs):
-        schema_keys = schema_keys or []
+    _cache = None
+    _hedge = None
+    _run_batch = staticmethod(run_batch)
+
+    def _execute_api(self, func_name, q_params=None, **kwargs):
+        return self._run_flow(
+            self._traced(func_name, partial(self._query, func_name, q_params, kwargs))
+        )
+
+    def _query(self, func_name, q_params, params, trace):
+        url, q_params = self._prepare_request(func_name, q_params, params)
+        trace.mark(PHASE_VALIDATION)
+        if self._cache is None:
+            result = self._decoder.decode((yield from self._fetch(func_name, url, q_params, trace)))
+        else:
+            result = yield partial(
+                self._cache_fetch,
+                self._cache.make_key(url, q_params),
+                func_name,
+                lambda: self._run_flow(self._fetch(func_name, url, q_params, trace)),
+                self._decoder.decode,
+            )
+        result = self._to_model(func_name, result)
+        trace.mark(PHASE_DECODING)
+        return result
+
+    def _fetch(self, func_name, url, q_params, trace=NULL_TRACE):
+        return (
+            yield from self._retrying(
+                func_name, partial(self._get, func_name, url, q_params, trace), trace
+            )
+        )
+
+    def _get(self, func_name, url, q_params, trace):
+        timeout = self._timeout(func_name)
+        options = {} if timeout is None else {"timeout": timeout}
+        if self._hedge is not None and self._hedge.applies(func_name):
+            request = perform(
+                partial(
+                    self._hedge_call,
+                    func_name,
+                    lambda: self._run_flow(self._send(url, q_params, options)),
+                    partial(self._throttle, func_name),
+                )
+            )
+        else:
+            request = self._send(url, q_params, options)
+        body = yield from self._guarded(request)
+        trace.mark(PHASE_NETWORK)
+        return body
+
+    def _send(self, url, q_params, options):
+        response = yield partial(self._session.get, url, params=q_params, **options)
+        return self._check_response(response.status_code, response.content)
+
+    def _cache_fetch(self, key, name, loader, transform):
+        return self._cache.fetch(key, name, loader, transform)
+
+    def _hedge_call(self, func_name, request, before_hedge):
+        return self._hedge.call(func_name, request, before_hedge)
+
+    def cache_stats(self):
+        return self._cache.stats() if self._cache is not None else {}
+
+    def hedge_stats(self):
+        return self._hedge.stats() if self._hedge is not None else {}
+
+    def _prepare_request(self, func_name, q_params, params):
+        endpoint = self._endpoints[func_name]
         q_params = q_params or {}
-        params = self._params_pre_processing(schema_keys, kwargs)
-        self._url.add_dirs(func_name, *params.values())
-        response = requests.get(self._url.get_absolute_url(), params=q_params)
-        self._url.refresh_dirs()
-        if response.status_code != 200:
-            raise ZaifApiError("return status code is {}".format(response.status_code))
-        return json.loads(response.text)
+        params = self._params_pre_processing(endpoint.schema_keys, params)
+        url = self._url.build_url(endpoint.name, *(params.get(key) for key in endpoint.dirs))
+        return url, q_params
+
+    @staticmethod
+    def _check_response(status_code, body):
+        if status_code != 200:
+            raise ZaifServerException("return status code is {}".format(status_code), status_code)
+        return body
 
     def _params_pre_processing(self, keys, params):
         return self._validator.params_pre_processing(keys, params)
 
 
 class ZaifPublicApi(_ZaifPublicApiBase):
-    def __init__(self, api_url: Optional[ApiUrl] = None):
-        super().__init__(get_api_url(api_url, "api", version="1"))
+    def __init__(
+        self,
+        api_url: Optional[ApiUrl] = None,
+        session=None,
+        rate_limiter=None,
+        decoder=None,
+        typed=False,
+        cache=None,
+        instrumentation=None,
+        timeouts=None,
+        retry=None,
+        circuit_breaker=None,
+        hedge=None,
+    ):
+        super().__init__(
+            get_api_url(api_url, "api", version="1"),
+            session=session,
+            rate_limiter=rate_limiter,
+            decoder=decoder,
+            typed=typed,
+            instrumentation=instrumentation,
+            timeouts=timeouts,
+            retry=retry,
+            circuit_breaker=circuit_breaker,
+        )
+        self._cache = get_cache(cache)
+        self._hedge = get_hedge_policy(hedge)
 
+    @endpoint("currency_pair", dirs=("currency_pair",))
     def last_price(self, currency_pair):
-        schema_keys = ["currency_pair"]
-        return self._execute_api(method_name(), schema_keys, currency_pair=currency_pair)
+        return self._execute_api("last_price", currency_pair=currency_pair)
 
+    @endpoint("currency_pair", dirs=("currency_pair",), model=Ticker)
     def ticker(self, currency_pair):
-        schema_keys = ["currency_pair"]
-        return self._execute_api(method_name(), schema_keys, currency_pair=currency_pair)
+        return self._execute_api("ticker", currency_pair=currency_pair)
 
+    @endpoint("currency_pair", dirs=("currency_pair",), model=Trades)
     def trades(self, currency_pair):
-        schema_keys = ["currency_pair"]
-        return self._execute_api(method_name(), schema_keys, currency_pair=currency_pair)
+        return self._execute_api("trades", currency_pair=currency_pair)
 
+    @endpoint("currency_pair", dirs=("currency_pair",), model=DepthSnapshot)
     def depth(self, currency_pair):
-        schema_keys = ["currency_pair"]
-        return self._execute_api(method_name(), schema_keys, currency_pair=currency_pair)
+        return self._execute_api("depth", currency_pair=currency_pair)
+
+    def last_price_many(self, currency_pairs, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        return self._run_batch(self.last_price, currency_pairs, max_concurrency)
+
+    def ticker_many(self, currency_pairs, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        return self._run_batch(self.ticker, currency_pairs, max_concurrency)
 
+    def depth_many(self, currency_pairs, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        return self._run_batch(self.depth, currency_pairs, max_concurrency)
+
+    @endpoint("currency_pair", dirs=("currency_pair",))
     def currency_pairs(self, currency_pair):
-        schema_keys = ["currency_pair"]
-        return self._execute_api(method_name(), schema_keys, currency_pair=currency_pair)
+        return self._execute_api("currency_pairs", currency_pair=currency_pair)
 
+    @endpoint("currency", dirs=("currency",))
     def currencies(self, currency):
-        schema_keys = ["currency"]
-        return self._execute_api(method_name(), schema_keys, currency=currency)
+        return self._execute_api("currencies", currency=currency)
+
+
+_FUTURES_DIRS = ("group_id", "currency_pair", "page")
 
 
 class ZaifFuturesPublicApi(_ZaifPublicApiBase):
-    def __init__(self, api_url=None):
+    def __init__(
+        self,
+        api_url=None,
+        session=None,
+        rate_limiter=None,
+        decoder=None,
+        typed=False,
+        cache=None,
+        instrumentation=None,
+        timeouts=None,
+        retry=None,
+        circuit_breaker=None,
+        hedge=None,
+    ):
         api_url = get_api_url(api_url, "fapi", version=1)
-        super().__init__(api_url, FuturesPublicApiValidator())
-
-    # Want to delete this method
-    def _execute_api(self, func_name, schema_keys=None, q_params=None, **kwargs):
-        schema_keys = schema_keys or []
-        q_params = q_params or {}
-        params = self._params_pre_processing(schema_keys, kwargs)
-        if params.get("page", None):
-            self._url.add_dirs(
-                func_name, params.get("group_id"), params.get("currency_pair"), params.get("page")
-            )
-        else:
-            self._url.add_dirs(func_name, params.get("group_id"), params.get("currency_pair"))
-        response = requests.get(self._url.get_absolute_url(), params=q_params)
-        self._url.refresh_dirs()
-        if response.status_code != 200:
-            raise ZaifApiError("return status code is {}".format(response.status_code))
-        return json.loads(response.text)
+        super().__init__(
+            api_url,
+            FuturesPublicApiValidator(),
+            session,
+            rate_limiter,
+            decoder,
+            typed,
+            instrumentation,
+            timeouts,
+            retry,
+            circuit_breaker,
+        )
+        self._cache = get_cache(cache)
+        self._hedge = get_hedge_policy(hedge)
 
+    @endpoint("currency_pair", "group_id", dirs=_FUTURES_DIRS)
     def last_price(self, group_id, currency_pair=None):
-        schema_keys = ["currency_pair", "group_id"]
-        return self._execute_api(
-            method_name(), schema_keys, group_id=group_id, currency_pair=currency_pair
-        )
+        return self._execute_api("last_price", group_id=group_id, currency_pair=currency_pair)
 
+    @endpoint("currency_pair", "group_id", dirs=_FUTURES_DIRS, model=Ticker)
     def ticker(self, group_id, currency_pair):
-        schema_keys = ["currency_pair", "group_id"]
-        return self._execute_api(
-            method_name(), schema_keys, group_id=group_id, currency_pair=currency_pair
-        )
+        return self._execute_api("ticker", group_id=group_id, currency_pair=currency_pair)
 
+    @endpoint("currency_pair", "group_id", dirs=_FUTURES_DIRS, model=Trades)
     def trades(self, group_id, currency_pair):
-        schema_keys = ["currency_pair", "group_id"]
-        return self._execute_api(
-            method_name(), schema_keys, group_id=group_id, currency_pair=currency_pair
-        )
+        return self._execute_api("trades", group_id=group_id, currency_pair=currency_pair)
 
+    @endpoint("currency_pair", "group_id", dirs=_FUTURES_DIRS, model=DepthSnapshot)
     def depth(self, group_id, currency_pair):
-        schema_keys = ["currency_pair", "group_id"]
-        return self._execute_api(
-            method_name(), schema_keys, group_id=group_id, currency_pair=currency_pair
+        return self._execute_api("depth", group_id=group_id, currency_pair=currency_pair)
+
+    def last_price_many(
+        self, group_ids, currency_pair=None, max_concurrency=DEFAULT_MAX_CONCURRENCY
+    ):
+        return self._run_batch(
+            self.last_price, group_ids, max_concurrency, currency_pair=currency_pair
         )
 
+    def ticker_many(self, group_ids, currency_pair, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        return self._run_batch(self.ticker, group_ids, max_concurrency, currency_pair=currency_pair)
+
+    def depth_many(self, group_ids, currency_pair, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        return self._run_batch(self.depth, group_ids, max_concurrency, currency_pair=currency_pair)
+
+    @endpoint("group_id", dirs=_FUTURES_DIRS)
     def groups(self, group_id):
-        schema_keys = ["group_id"]
-        return self._execute_api(method_name(), schema_keys, group_id=group_id)
+        return self._execute_api("groups", group_id=group_id)
 
+    @endpoint("currency_pair", "group_id", "page", dirs=_FUTURES_DIRS, priority=PRIORITY_LOW)
     def swap_history(self, group_id, currency_pair, page=None):
         if not page:
-            schema_keys = ["currency_pair", "group_id"]
-            return self._execute_api(
-                method_name(), schema_keys, group_id=group_id, currency_pair=currency_pair
-            )
-        schema_keys = ["currency_pair", "group_id", "page"]
+            return self._execute_api("swap_history", group_id=group_id, currency_pair=currency_pair)
         return self._execute_api(
-            method_name(), schema_keys, group_id=group_id, currency_pair=currency_pair, page=page
+            "swap_history", group_id=group_id, currency_pair=currency_pair, page=page
         )
 
 
 class ZaifPublicStreamApi(_ZaifPublicApiBase):
-    def __init__(self, api_url=None):
+    def __init__(self, api_url=None, session=None, decoder=None, **stream_options):
         api_url = get_api_url(api_url, "stream", protocol="wss", host="ws.zaif.jp", port=8888)
-        super().__init__(api_url)
+        super().__init__(api_url, session=session, decoder=decoder)
+        self._stream_options = stream_options
+        self._connections: Set[StreamConnection] = set()
         self._continue = True
 
     def stop(self):
         self._continue = False
+        for connection in list(self._connections):
+            connection.stop()
 
-    def execute(self, currency_pair):
+    def open(self, currency_pair) -> StreamConnection:
         params = {"currency_pair": currency_pair}
         params = self._params_pre_processing(["currency_pair"], params=params)
-        self._url.add_q_params(params)
-        ws = create_connection(self._url.get_absolute_url(with_params=True))
-        while self._continue:
-            result = ws.recv()
-            yield json.loads(result)
-        ws.close()
+        return StreamConnection(self._url.build_url(params=params), **self._stream_options)
+
+    def execute(self, currency_pair, raw=False):
+        connection = self.open(currency_pair)
+        self._connections.add(connection)
+        try:
+            if self._continue:
+                connection.start()
+                for message in connection:
+                    yield message if raw else self._decoder.decode(message)
+        finally:
+            connection.stop()
+            self._connections.discard(connection)
@@ -0,0 +1,198 @@
+import queue
+import random
+import threading
+from websocket import ABNF, WebSocketTimeoutException, create_connection
+
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+BLOCK = "block"
+
+CLOSED = object()
+
+
+class StreamStats:
+    __slots__ = ("connects", "reconnects", "received", "dropped", "errors")
+
+    def __init__(self):
+        self.connects = 0
+        self.reconnects = 0
+        self.received = 0
+        self.dropped = 0
+        self.errors = 0
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+
+class MessageQueue(queue.Queue):
+    def __init__(self, maxsize, overflow, stats):
+        if overflow not in (DROP_OLDEST, DROP_NEWEST, BLOCK):
+            raise ValueError("unknown overflow policy: {}".format(overflow))
+        super().__init__(maxsize)
+        self.overflow = overflow
+        self._stats = stats
+
+    def offer(self, item):
+        try:
+            self.put_nowait(item)
+            return True
+        except queue.Full:
+            if self.overflow == DROP_NEWEST:
+                self._stats.dropped += 1
+                return True
+            if self.overflow == DROP_OLDEST:
+                self.force_put(item)
+                return True
+            return False
+
+    def force_put(self, item):
+        while True:
+            try:
+                self.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    if self.get_nowait() is not CLOSED:
+                        self._stats.dropped += 1
+                except queue.Empty:
+                    pass
+
+
+class StreamConnection:
+    def __init__(
+        self,
+        url,
+        reconnect=True,
+        backoff=0.5,
+        max_backoff=30.0,
+        ping_interval=30.0,
+        ping_timeout=10.0,
+        connect_timeout=10.0,
+        queue_size=1024,
+        overflow=BLOCK,
+    ):
+        self.url = url
+        self.stats = StreamStats()
+        self._reconnect = reconnect
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._ping_interval = ping_interval
+        self._ping_timeout = ping_timeout
+        self._connect_timeout = connect_timeout
+        self._queue = MessageQueue(queue_size, overflow, self.stats)
+        self._stopped = threading.Event()
+        self._ws = None
+        self._thread = threading.Thread(target=self._run, name="zaif-stream", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        ws = self._ws
+        if ws is not None:
+            try:
+                ws.shutdown()
+            except Exception:
+                pass
+        self._force_put(CLOSED)
+
+    @property
+    def stopped(self):
+        return self._stopped.is_set()
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is CLOSED or self.stopped:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def _run(self):
+        attempt = 0
+        try:
+            while not self.stopped:
+                try:
+                    self._ws = create_connection(self.url, timeout=self._connect_timeout)
+                except Exception as e:
+                    if not self._handle_error(e):
+                        return
+                    attempt += 1
+                    self._sleep_backoff(attempt)
+                    continue
+                self.stats.connects += 1
+                attempt = 0
+                try:
+                    self._receive(self._ws)
+                except Exception as e:
+                    if not self._handle_error(e):
+                        return
+                finally:
+                    self._close_socket()
+                if not self._reconnect or self.stopped:
+                    return
+                self.stats.reconnects += 1
+                self._sleep_backoff(attempt)
+        finally:
+            self._put_final(CLOSED)
+
+    def _close_socket(self):
+        ws, self._ws = self._ws, None
+        try:
+            ws.close(timeout=0)
+        except Exception:
+            pass
+
+    def _handle_error(self, error):
+        if self.stopped:
+            return False
+        self.stats.errors += 1
+        if not self._reconnect:
+            self._put_final(error)
+            return False
+        return True
+
+    def _sleep_backoff(self, attempt):
+        delay = min(self._max_backoff, self._backoff * (2**attempt))
+        self._stopped.wait(random.uniform(delay / 2, delay))
+
+    def _receive(self, ws):
+        awaiting_pong = False
+        while not self.stopped:
+            ws.settimeout(self._ping_timeout if awaiting_pong else self._ping_interval)
+            try:
+                opcode, frame = ws.recv_data_frame(True)
+            except WebSocketTimeoutException:
+                if awaiting_pong:
+                    raise ConnectionError("no pong within {} seconds".format(self._ping_timeout))
+                ws.ping()
+                awaiting_pong = True
+                continue
+            awaiting_pong = False
+            if opcode in (ABNF.OPCODE_TEXT, ABNF.OPCODE_BINARY):
+                self.stats.received += 1
+                self._put(frame.data)
+            elif opcode == ABNF.OPCODE_CLOSE:
+                return
+
+    def _put(self, item):
+        while not self._queue.offer(item):
+            if self.stopped:
+                return
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _put_final(self, item):
+        if self._queue.overflow == BLOCK:
+            self._put(item)
+        else:
+            self._force_put(item)
+
+    def _force_put(self, item):
+        self._queue.force_put(item)
@@ -0,0 +1,195 @@
+import asyncio
+import random
+import threading
+from typing import Dict, Iterable, Optional
+from zaifapi.api_common import AsyncZaifSession, ZaifApiValidator, get_api_url, get_decoder
+from .stream import BLOCK, CLOSED, MessageQueue, StreamStats
+
+try:
+    from aiohttp import WSMsgType
+except ImportError:  # pragma: no cover
+    WSMsgType = None  # type: ignore
+
+
+class ZaifStreamManager:
+    def __init__(
+        self,
+        currency_pairs: Iterable[str] = (),
+        api_url=None,
+        session: Optional[AsyncZaifSession] = None,
+        reconnect=True,
+        backoff=0.5,
+        max_backoff=30.0,
+        ping_interval=30.0,
+        queue_size=1024,
+        overflow=BLOCK,
+        feed=True,
+        decoder=None,
+    ):
+        self._url = get_api_url(api_url, "stream", protocol="wss", host="ws.zaif.jp", port=8888)
+        self._validator = ZaifApiValidator()
+        self._session = session
+        self._reconnect = reconnect
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._ping_interval = ping_interval
+        self._feed = feed
+        self._decoder = get_decoder(decoder)
+        self.feed_stats = StreamStats()
+        self.stats: Dict[str, StreamStats] = {}
+        self._queue = MessageQueue(queue_size, overflow, self.feed_stats)
+        self._callbacks: list = []
+        self._pairs: set = set()
+        self._tasks: Dict[str, asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closed: Optional[asyncio.Event] = None
+        self._active_session: Optional[AsyncZaifSession] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        for currency_pair in currency_pairs:
+            self.subscribe(currency_pair)
+
+    @property
+    def currency_pairs(self):
+        return frozenset(self._pairs)
+
+    def subscribe(self, currency_pair):
+        self._validator.params_pre_processing(["currency_pair"], {"currency_pair": currency_pair})
+        if currency_pair in self._pairs:
+            return
+        self._pairs.add(currency_pair)
+        self.stats.setdefault(currency_pair, StreamStats())
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._start_task, currency_pair)
+
+    def unsubscribe(self, currency_pair):
+        self._pairs.discard(currency_pair)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._cancel_task, currency_pair)
+
+    def add_callback(self, callback):
+        self._callbacks.append(callback)
+
+    def start(self):
+        if self._thread is None:
+            ready = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run_loop, args=(ready,), name="zaif-stream-manager", daemon=True
+            )
+            self._thread.start()
+            ready.wait()
+        return self
+
+    def stop(self, timeout=None):
+        self._stopped.set()
+        loop, closed = self._loop, self._closed
+        if loop is not None and closed is not None:
+            loop.call_soon_threadsafe(closed.set)
+        self._queue.force_put(CLOSED)
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+            self._thread = None
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is CLOSED or self._stopped.is_set():
+                return
+            if isinstance(item, Exception):
+                raise item
+            currency_pair, data, message = item
+            yield currency_pair, message if message is not None else self._decoder.decode(data)
+
+    async def run(self, ready: Optional[threading.Event] = None):
+        self._loop = asyncio.get_running_loop()
+        self._closed = asyncio.Event()
+        self._active_session = self._session or AsyncZaifSession()
+        for currency_pair in list(self._pairs):
+            self._start_task(currency_pair)
+        if ready is not None:
+            ready.set()
+        try:
+            if not self._stopped.is_set():
+                await self._closed.wait()
+        finally:
+            tasks = list(self._tasks.values())
+            self._tasks.clear()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self._session is None:
+                await self._active_session.close()
+            self._loop = None
+            self._queue.force_put(CLOSED)
+
+    def _run_loop(self, ready):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.run(ready))
+        finally:
+            ready.set()
+            loop.close()
+
+    def _start_task(self, currency_pair):
+        if currency_pair in self._pairs and currency_pair not in self._tasks:
+            self._tasks[currency_pair] = asyncio.ensure_future(self._watch(currency_pair))
+
+    def _cancel_task(self, currency_pair):
+        task = self._tasks.pop(currency_pair, None)
+        if task is not None:
+            task.cancel()
+
+    async def _watch(self, currency_pair):
+        stats = self.stats[currency_pair]
+        url = self._url.build_url(params={"currency_pair": currency_pair})
+        attempt = 0
+        while True:
+            try:
+                async with self._active_session.ws_connect(
+                    url, heartbeat=self._ping_interval
+                ) as ws:
+                    stats.connects += 1
+                    attempt = 0
+                    async for message in ws:
+                        if message.type in (WSMsgType.TEXT, WSMsgType.BINARY):
+                            stats.received += 1
+                            await self._publish(currency_pair, message.data)
+                        elif message.type == WSMsgType.ERROR:
+                            raise ws.exception() or ConnectionError("stream error")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats.errors += 1
+                attempt += 1
+                if not self._reconnect:
+                    await self._put_final(e)
+            if not self._reconnect:
+                self._tasks.pop(currency_pair, None)
+                if not self._tasks:
+                    await self._put_final(CLOSED)
+                return
+            stats.reconnects += 1
+            delay = min(self._max_backoff, self._backoff * (2**attempt))
+            await asyncio.sleep(random.uniform(delay / 2, delay))
+
+    async def _publish(self, currency_pair, data):
+        message = None
+        if self._callbacks:
+            message = self._decoder.decode(data)
+            for callback in self._callbacks:
+                callback(currency_pair, message)
+        if not self._feed:
+            return
+        await self._put((currency_pair, data, message))
+
+    async def _put(self, item):
+        while not self._queue.offer(item):
+            await asyncio.sleep(0.01)
+
+    async def _put_final(self, item):
+        if self._queue.overflow == BLOCK:
+            await self._put(item)
+        else:
+            self._queue.force_put(item)
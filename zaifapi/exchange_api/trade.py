@@ -1,189 +1,411 @@
-import time
 import hmac
 import hashlib
-from decimal import Decimal
-from datetime import datetime
 from abc import ABCMeta, abstractmethod
+from functools import partial
 from typing import Optional
 from urllib.parse import urlencode
-from zaifapi.api_common import ApiUrl, get_response, get_api_url, method_name
-from zaifapi.api_error import ZaifApiError, ZaifApiNonceError
+from zaifapi.api_common import (
+    ApiUrl,
+    endpoint,
+    get_response,
+    get_api_url,
+    get_nonce_generator,
+    get_send_lock,
+    NULL_TRACE,
+    perform,
+    PHASE_DECODING,
+    PHASE_RATE_LIMIT,
+    PHASE_SIGNING,
+    PHASE_VALIDATION,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+)
+from zaifapi.api_error import ZaifApiError, ZaifApiNonceError, ZaifApiValidationError
+from zaifapi.models import Orders, Positions
 from . import ZaifExchangeApi
+from .batch import DEFAULT_MAX_CONCURRENCY, run_batch
+from .pagination import iter_history
+
+DEFAULT_NONCE_RETRIES = 2
 
 
 class _ZaifTradeApiBase(ZaifExchangeApi, metaclass=ABCMeta):
+    _http_verb = "POST"
+    _iter_history = staticmethod(iter_history)
+    _run_batch = staticmethod(run_batch)
+    _nonce = None
+    _nonce_retries = DEFAULT_NONCE_RETRIES
+
     @abstractmethod
     def _get_header(self, params):
         raise NotImplementedError()
 
-    @staticmethod
-    def _get_nonce():
-        now = datetime.now()
-        nonce = str(int(time.mktime(now.timetuple())))
-        microseconds = "{0:06d}".format(now.microsecond)
-        return Decimal(nonce + "." + microseconds)
-
-    def _execute_api(self, func_name, schema_keys=None, params=None):
-        schema_keys = schema_keys or []
-        params = params or {}
-
-        params = self._params_pre_processing(schema_keys, params, func_name)
-        header = self._get_header(params)
-        url = self._url.get_absolute_url()
+    def _set_credentials(self, key, secret):
+        self._key = key
+        self._secret = secret
+        self._signer = _Signer(key, secret) if secret is not None else None
+
+    def _set_nonce_generator(self, key, nonce, nonce_retries):
+        self._nonce = nonce or get_nonce_generator(key)
+        self._nonce_retries = nonce_retries
+        self._send_lock = get_send_lock(self._send_key)
+
+    @property
+    def _send_key(self):
+        return self._key
+
+    def _get_nonce(self):
+        return self._nonce.next()
+
+    def _execute_api(self, func_name, params=None, validated=None):
+        return self._run_flow(
+            self._traced(func_name, partial(self._call, func_name, params, validated))
+        )
+
+    def _call(self, func_name, params, validated, trace):
+        if validated is None:
+            validated = self._validate(func_name, params)
+        trace.mark(PHASE_VALIDATION)
+        return (
+            yield from self._retrying(
+                func_name, partial(self._attempt, func_name, validated, trace), trace
+            )
+        )
+
+    def _attempt(self, func_name, params, trace):
+        nonce_errors = 0
+        while True:
+            res = yield from self._post(func_name, params, trace)
+            try:
+                result = self._parse_result(res)
+            except ZaifApiNonceError:
+                if nonce_errors >= self._nonce_retries:
+                    raise
+                nonce_errors += 1
+                yield partial(self._throttle, func_name)
+                trace.mark(PHASE_RATE_LIMIT)
+                continue
+            result = self._to_model(func_name, result)
+            trace.mark(PHASE_DECODING)
+            return result
+
+    def _post(self, func_name, params, trace):
+        lock = self._get_send_lock()
+        yield lock.acquire
+        trace.mark(PHASE_RATE_LIMIT)
+        try:
+            url, data, header = self._sign(func_name, params, trace)
+        finally:
+            lock.release()
+        request = partial(self._request, url, data, header, trace, self._timeout(func_name))
+        return (yield from self._guarded(perform(request)))
+
+    def _request(self, url, data, header, trace, timeout):
+        return get_response(url, data, header, self._session, self._decoder, trace, timeout)
+
+    def _get_send_lock(self):
+        return self._send_lock
+
+    def _execute_many(self, func_name, params_list, max_concurrency):
+        validated = []
+        for params in params_list:
+            try:
+                validated.append(self._validate(func_name, params))
+            except ZaifApiValidationError as e:
+                validated.append(e)
+
+        def execute(index):
+            if isinstance(validated[index], Exception):
+                raise validated[index]
+            return self._execute_api(func_name, validated=validated[index])
+
+        return self._run_batch(execute, range(len(validated)), max_concurrency)
+
+    def _validate(self, func_name, params):
+        endpoint = self._endpoints[func_name]
+        return self._params_pre_processing(endpoint.schema_keys, dict(params or {}))
+
+    def _sign(self, func_name, params, trace=NULL_TRACE):
+        params = dict(params, method=self._endpoints[func_name].name, nonce=self._get_nonce())
+        data = urlencode(params)
+        header = self._get_header(data)
+        trace.mark(PHASE_SIGNING)
+        return self._url.get_absolute_url(), data, header
 
-        res = get_response(url, params, header)
+    @staticmethod
+    def _parse_result(res):
         if res["success"] == 0:
             if res["error"].startswith("nonce"):
                 raise ZaifApiNonceError(res["error"])
             raise ZaifApiError(res["error"])
         return res["return"]
 
-    def _params_pre_processing(self, keys, params, func_name):
-        params = self._validator.params_pre_processing(keys, params)
-        params["method"] = func_name
-        params["nonce"] = self._get_nonce()
-        return urlencode(params)
+    def _params_pre_processing(self, keys, params):
+        return self._validator.params_pre_processing(keys, params)
+
+
+class _Signer:
+    __slots__ = ("_key", "_hmac")
+
+    def __init__(self, key, secret):
+        self._key = key
+        self._hmac = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha512)
+
+    def sign(self, params):
+        signature = self._hmac.copy()
+        signature.update(params.encode("utf-8"))
+        return {"key": self._key, "sign": signature.hexdigest()}
 
 
 def _make_signature(key, secret, params):
-    signature = hmac.new(bytearray(secret.encode("utf-8")), digestmod=hashlib.sha512)
-    signature.update(params.encode("utf-8"))
-    return {"key": key, "sign": signature.hexdigest()}
+    return _Signer(key, secret).sign(params)
+
+
+_HISTORY_SCHEMA_KEYS = (
+    "currency",
+    "from_num",
+    "count",
+    "from_id",
+    "end_id",
+    "order",
+    "since",
+    "end",
+    "is_token",
+)
 
 
 class ZaifTradeApi(_ZaifTradeApiBase):
-    def __init__(self, key, secret, api_url=None):
-        super().__init__(get_api_url(api_url, "tapi"))
-        self._key = key
-        self._secret = secret
+    def __init__(
+        self,
+        key,
+        secret,
+        api_url=None,
+        session=None,
+        nonce=None,
+        nonce_retries=DEFAULT_NONCE_RETRIES,
+        rate_limiter=None,
+        decoder=None,
+        typed=False,
+        instrumentation=None,
+        timeouts=None,
+        retry=None,
+        circuit_breaker=None,
+    ):
+        super().__init__(
+            get_api_url(api_url, "tapi"),
+            session=session,
+            rate_limiter=rate_limiter,
+            decoder=decoder,
+            typed=typed,
+            instrumentation=instrumentation,
+            timeouts=timeouts,
+            retry=retry,
+            circuit_breaker=circuit_breaker,
+        )
+        self._set_credentials(key, secret)
+        self._set_nonce_generator(key, nonce, nonce_retries)
 
     def _get_header(self, params):
-        return _make_signature(self._key, self._secret, params)
+        return self._signer.sign(params)
 
+    @endpoint()
     def get_info(self):
-        return self._execute_api(method_name())
+        return self._execute_api("get_info")
 
+    @endpoint()
     def get_info2(self):
-        return self._execute_api(method_name())
+        return self._execute_api("get_info2")
 
+    @endpoint()
     def get_personal_info(self):
-        return self._execute_api(method_name())
+        return self._execute_api("get_personal_info")
 
+    @endpoint()
     def get_id_info(self):
-        return self._execute_api(method_name())
-
+        return self._execute_api("get_id_info")
+
+    @endpoint(
+        "from_num",
+        "count",
+        "from_id",
+        "end_id",
+        "order",
+        "since",
+        "end",
+        "currency_pair",
+        "is_token",
+        priority=PRIORITY_LOW,
+        model=Orders,
+    )
     def trade_history(self, **kwargs):
-        schema_keys = [
-            "from_num",
-            "count",
-            "from_id",
-            "end_id",
-            "order",
-            "since",
-            "end",
-            "currency_pair",
-            "is_token",
-        ]
-        return self._execute_api(method_name(), schema_keys, kwargs)
+        return self._execute_api("trade_history", kwargs)
+
+    def iter_trade_history(self, prefetch=True, **kwargs):
+        return self._iter_history(self.trade_history, kwargs, prefetch)
 
+    @endpoint("currency_pair", "is_token", "is_token_both", model=Orders)
     def active_orders(self, **kwargs):
-        schema_keys = ["currency_pair", "is_token", "is_token_both"]
-        return self._execute_api(method_name(), schema_keys, kwargs)
-
-    def _inner_history_api(self, func_name, kwargs):
-        schema_keys = [
-            "currency",
-            "from_num",
-            "count",
-            "from_id",
-            "end_id",
-            "order",
-            "since",
-            "end",
-            "is_token",
-        ]
-        return self._execute_api(func_name, schema_keys, kwargs)
+        return self._execute_api("active_orders", kwargs)
 
+    @endpoint(*_HISTORY_SCHEMA_KEYS, priority=PRIORITY_LOW)
     def withdraw_history(self, **kwargs):
-        return self._inner_history_api(method_name(), kwargs)
+        return self._execute_api("withdraw_history", kwargs)
 
+    @endpoint(*_HISTORY_SCHEMA_KEYS, priority=PRIORITY_LOW)
     def deposit_history(self, **kwargs):
-        return self._inner_history_api(method_name(), kwargs)
+        return self._execute_api("deposit_history", kwargs)
 
+    def iter_withdraw_history(self, prefetch=True, **kwargs):
+        return self._iter_history(self.withdraw_history, kwargs, prefetch)
+
+    def iter_deposit_history(self, prefetch=True, **kwargs):
+        return self._iter_history(self.deposit_history, kwargs, prefetch)
+
+    @endpoint("currency", "address", "message", "amount", "opt_fee", idempotent=False)
     def withdraw(self, **kwargs):
-        schema_keys = ["currency", "address", "message", "amount", "opt_fee"]
-        return self._execute_api(method_name(), schema_keys, kwargs)
+        return self._execute_api("withdraw", kwargs)
 
+    @endpoint("order_id", "is_token", "currency_pair", priority=PRIORITY_HIGH, idempotent=False)
     def cancel_order(self, **kwargs):
-        schema_keys = ["order_id", "is_token", "currency_pair"]
-        return self._execute_api(method_name(), schema_keys, kwargs)
+        return self._execute_api("cancel_order", kwargs)
 
+    @endpoint("currency_pair", "action", "price", "amount", "limit", "comment", idempotent=False)
     def trade(self, **kwargs):
-        schema_keys = ["currency_pair", "action", "price", "amount", "limit", "comment"]
-        return self._execute_api(method_name(), schema_keys, kwargs)
+        return self._execute_api("trade", kwargs)
+
+    def trade_many(self, orders, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        return self._execute_many("trade", orders, max_concurrency)
+
+    def cancel_orders(self, orders, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        orders = [order if isinstance(order, dict) else {"order_id": order} for order in orders]
+        return self._execute_many("cancel_order", orders, max_concurrency)
 
 
 class ZaifLeverageTradeApi(_ZaifTradeApiBase):
-    def __init__(self, key, secret, api_url=None):
+    def __init__(
+        self,
+        key,
+        secret,
+        api_url=None,
+        session=None,
+        nonce=None,
+        nonce_retries=DEFAULT_NONCE_RETRIES,
+        rate_limiter=None,
+        decoder=None,
+        typed=False,
+        instrumentation=None,
+        timeouts=None,
+        retry=None,
+        circuit_breaker=None,
+    ):
         api_url = get_api_url(api_url, "tlapi")
-        super().__init__(api_url)
-        self._key = key
-        self._secret = secret
+        super().__init__(
+            api_url,
+            session=session,
+            rate_limiter=rate_limiter,
+            decoder=decoder,
+            typed=typed,
+            instrumentation=instrumentation,
+            timeouts=timeouts,
+            retry=retry,
+            circuit_breaker=circuit_breaker,
+        )
+        self._set_credentials(key, secret)
+        self._set_nonce_generator(key, nonce, nonce_retries)
 
     def _get_header(self, params):
-        return _make_signature(self._key, self._secret, params)
-
+        return self._signer.sign(params)
+
+    @endpoint(
+        "type",
+        "group_id",
+        "from_num",
+        "count",
+        "from_id",
+        "end_id",
+        "order",
+        "since",
+        "end",
+        "currency_pair",
+        priority=PRIORITY_LOW,
+        model=Positions,
+    )
     def get_positions(self, **kwargs):
-        schema_keys = [
-            "type",
-            "group_id",
-            "from_num",
-            "count",
-            "from_id",
-            "end_id",
-            "order",
-            "since",
-            "end",
-            "currency_pair",
-        ]
-
-        return self._execute_api(method_name(), schema_keys, kwargs)
+        return self._execute_api("get_positions", kwargs)
+
+    def iter_positions(self, prefetch=True, **kwargs):
+        return self._iter_history(self.get_positions, kwargs, prefetch)
 
+    @endpoint("type", "group_id", "leverage_id", priority=PRIORITY_LOW)
     def position_history(self, **kwargs):
-        schema_keys = ["type", "group_id", "leverage_id"]
-        return self._execute_api(method_name(), schema_keys, kwargs)
+        return self._execute_api("position_history", kwargs)
 
+    @endpoint("type", "group_id", "currency_pair", model=Positions)
     def active_positions(self, **kwargs):
-        schema_keys = ["type", "group_id", "currency_pair"]
-        return self._execute_api(method_name(), schema_keys, kwargs)
-
+        return self._execute_api("active_positions", kwargs)
+
+    @endpoint(
+        "type",
+        "group_id",
+        "currency_pair",
+        "action",
+        "price",
+        "amount",
+        "leverage",
+        "limit",
+        "stop",
+        idempotent=False,
+    )
     def create_position(self, **kwargs):
-        schema_keys = [
-            "type",
-            "group_id",
-            "currency_pair",
-            "action",
-            "price",
-            "amount",
-            "leverage",
-            "limit",
-            "stop",
-        ]
-        return self._execute_api(method_name(), schema_keys, kwargs)
+        return self._execute_api("create_position", kwargs)
 
+    @endpoint("type", "group_id", "leverage_id", "price", "limit", "stop", idempotent=False)
     def change_position(self, **kwargs):
-        schema_keys = ["type", "group_id", "leverage_id", "price", "limit", "stop"]
-        return self._execute_api(method_name(), schema_keys, kwargs)
+        return self._execute_api("change_position", kwargs)
 
+    @endpoint("type", "group_id", "leverage_id", priority=PRIORITY_HIGH, idempotent=False)
     def cancel_position(self, **kwargs):
-        schema_keys = ["type", "group_id", "leverage_id"]
-        return self._execute_api(method_name(), schema_keys, kwargs)
+        return self._execute_api("cancel_position", kwargs)
 
 
 class ZaifTokenTradeApi(ZaifTradeApi):
-    def __init__(self, token: str, api_url: Optional[ApiUrl] = None):
+    def __init__(
+        self,
+        token: str,
+        api_url: Optional[ApiUrl] = None,
+        session=None,
+        nonce=None,
+        nonce_retries=DEFAULT_NONCE_RETRIES,
+        rate_limiter=None,
+        decoder=None,
+        typed=False,
+        instrumentation=None,
+        timeouts=None,
+        retry=None,
+        circuit_breaker=None,
+    ):
         self._token = token
-        super().__init__(None, None, api_url)
+        super().__init__(
+            None,
+            None,
+            api_url,
+            session,
+            nonce or get_nonce_generator(token),
+            nonce_retries,
+            rate_limiter,
+            decoder,
+            typed,
+            instrumentation,
+            timeouts,
+            retry,
+            circuit_breaker,
+        )
+
+    @property
+    def _send_key(self):
+        return self._token
 
-    def get_header(self, params):
+    def _get_header(self, params):
         return {"token": self._token}
+
+    get_header = _get_header
@@ -13,9 +13,10 @@ from zaifapi.exchange_api.trade import (
 )
 
 from zaifapi.oauth import ZaifTokenApi
+from zaifapi.api_common.rate_limit import MIN_WAIT_TIME_SEC
+from zaifapi.exchange_api.pagination import MAX_COUNT as _MAX_COUNT  # NOQA
 
-_MAX_COUNT = 1000
-_MIN_WAIT_TIME_SEC = 1
+_MIN_WAIT_TIME_SEC = MIN_WAIT_TIME_SEC
 
 __all__ = [
     "ZaifTradeApi",
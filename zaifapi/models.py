@@ -0,0 +1,227 @@
+import sys
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class _Model:
+    __slots__: Tuple[str, ...] = ()
+
+    def __init__(self, *args, **kwargs):
+        for name, value in zip(self.__slots__, args):
+            setattr(self, name, value)
+        start = len(args)
+        for name in self.__slots__[start:]:
+            setattr(self, name, kwargs.get(name))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], **extra):
+        return cls(**data, **extra)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def __repr__(self):
+        fields = ", ".join("{}={!r}".format(k, v) for k, v in self.as_dict().items())
+        return "{}({})".format(type(self).__name__, fields)
+
+
+class Ticker(_Model):
+    __slots__ = ("last", "high", "low", "vwap", "volume", "bid", "ask")
+
+    @classmethod
+    def from_json(cls, data):
+        return cls.from_dict(data)
+
+
+class Trade(_Model):
+    __slots__ = ("tid", "date", "price", "amount", "currency_pair", "trade_type")
+
+
+class Order(_Model):
+    __slots__ = (
+        "id",
+        "currency_pair",
+        "action",
+        "amount",
+        "price",
+        "timestamp",
+        "comment",
+        "fee",
+        "your_action",
+        "bonus",
+    )
+
+
+class Position(_Model):
+    __slots__ = (
+        "id",
+        "group_id",
+        "currency_pair",
+        "action",
+        "amount",
+        "price",
+        "limit",
+        "stop",
+        "timestamp",
+        "term_end",
+        "leverage",
+        "swap",
+        "guard_fee",
+        "price_avg",
+        "amount_done",
+        "close_avg",
+        "close_done",
+        "deposit",
+        "refunded",
+    )
+
+
+class _Column:
+    __slots__ = ("values",)
+
+    def __init__(self, typecode: Optional[str]):
+        self.values: Any = array(typecode) if typecode else []
+
+    def append(self, value) -> None:
+        if isinstance(self.values, array):
+            if type(value) in (int, float):
+                try:
+                    self.values.append(value)
+                    return
+                except (TypeError, OverflowError):
+                    pass
+            self.values = list(self.values)
+        if isinstance(value, str):
+            value = sys.intern(value)
+        self.values.append(value)
+
+
+class _Table:
+    _row: Any = _Model
+    _typecodes: Dict[str, str] = {}
+
+    def __init__(self, rows: Iterable[Dict[str, Any]] = (), **extra):
+        self._columns = {name: _Column(self._typecodes.get(name)) for name in self._row.__slots__}
+        self._length = 0
+        for row in rows:
+            self._append(row, extra)
+
+    def _append(self, row: Dict[str, Any], extra: Dict[str, Any], row_id=None) -> None:
+        for name, column in self._columns.items():
+            if name == "id" and row_id is not None:
+                column.append(row_id)
+            elif name in extra:
+                column.append(extra[name])
+            else:
+                column.append(row.get(name))
+        self._length += 1
+
+    def column(self, name: str):
+        return self._columns[name].values
+
+    def _row_at(self, index: int):
+        return self._row(*(column.values[index] for column in self._columns.values()))
+
+    def __len__(self):
+        return self._length
+
+
+class Trades(_Table, Sequence):
+    _row = Trade
+    _typecodes = {"tid": "q", "date": "q", "price": "d", "amount": "d"}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row_at(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return self._row_at(index)
+
+
+class _IdTable(_Table, Mapping):
+    def __init__(self, records: Optional[Dict[Any, Dict[str, Any]]] = None, **extra):
+        super().__init__(**extra)
+        self._index: Dict[int, int] = {}
+        for key, record in (records or {}).items():
+            row_id = int(key)
+            self._index[row_id] = self._length
+            self._append(record, extra, row_id)
+
+    @classmethod
+    def from_json(cls, data):
+        if "active_orders" in data or "token_active_orders" in data:
+            return {key: cls(value) for key, value in data.items()}
+        return cls(data)
+
+    def __getitem__(self, key):
+        return self._row_at(self._index[int(key)])
+
+    def __contains__(self, key):
+        try:
+            return int(key) in self._index
+        except (TypeError, ValueError):
+            return False
+
+    def __iter__(self):
+        return iter(self._index)
+
+
+class Orders(_IdTable):
+    _row = Order
+    _typecodes = {"id": "q", "amount": "d", "price": "d", "fee": "d"}
+
+
+class Positions(_IdTable):
+    _row = Position
+    _typecodes = {"id": "q", "amount": "d", "price": "d", "leverage": "d"}
+
+
+class DepthSnapshot:
+    __slots__ = ("ask_prices", "ask_amounts", "bid_prices", "bid_amounts")
+
+    def __init__(self, asks=(), bids=()):
+        self.ask_prices, self.ask_amounts = self._columns(asks)
+        self.bid_prices, self.bid_amounts = self._columns(bids)
+
+    @staticmethod
+    def _columns(levels):
+        prices, amounts = _Column("d"), _Column("d")
+        for price, amount in levels:
+            prices.append(price)
+            amounts.append(amount)
+        return prices.values, amounts.values
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data.get("asks") or (), data.get("bids") or ())
+
+    @property
+    def asks(self):
+        return list(zip(self.ask_prices, self.ask_amounts))
+
+    @property
+    def bids(self):
+        return list(zip(self.bid_prices, self.bid_amounts))
+
+    @property
+    def best_ask(self):
+        return (self.ask_prices[0], self.ask_amounts[0]) if self.ask_prices else None
+
+    @property
+    def best_bid(self):
+        return (self.bid_prices[0], self.bid_amounts[0]) if self.bid_prices else None
+
+    def __repr__(self):
+        return "DepthSnapshot(asks={}, bids={})".format(len(self.ask_prices), len(self.bid_prices))
@@ -4,11 +4,18 @@ from zaifapi.api_common import ApiUrl, get_api_url
 
 
 class ZaifTokenApi(ZaifApi):
-    def __init__(self, client_id: str, client_secret: str, api_url: Optional[ApiUrl] = None):
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        api_url: Optional[ApiUrl] = None,
+        session=None,
+        decoder=None,
+    ):
         setup_api_url = get_api_url(
             api_url, None, host="oauth.zaif.jp", version="v1", dirs=["token"]
         )
-        super().__init__(setup_api_url)
+        super().__init__(setup_api_url, session, decoder=decoder)
         self._client_id = client_id
         self._client_secret = client_secret
 
@@ -21,7 +28,9 @@ class ZaifTokenApi(ZaifApi):
         }
         if redirect_uri:
             params["redirect_uri"] = redirect_uri
-        return get_response(self._url.get_absolute_url(), params)
+        return get_response(
+            self._url.get_absolute_url(), params, session=self._session, decoder=self._decoder
+        )
 
     def refresh_token(self, refresh_token: str):
         params = {
@@ -30,4 +39,6 @@ class ZaifTokenApi(ZaifApi):
             "client_secret": self._client_secret,
             "grant_type": "refresh_token",
         }
-        return get_response(self._url.get_absolute_url(), params)
+        return get_response(
+            self._url.get_absolute_url(), params, session=self._session, decoder=self._decoder
+        )
@@ -0,0 +1,328 @@
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+from .orderbook import BID
+
+OPEN = "open"
+FILLED = "filled"
+CANCELLED = "cancelled"
+CLOSED = "closed"
+
+DEFAULT_MAX_CLOSED = 1000
+
+_EPSILON = 1e-12
+_PRICE_DIGITS = 8
+
+
+def _field(record, name: str, default=None):
+    if isinstance(record, dict):
+        return record.get(name, default)
+    return getattr(record, name, default)
+
+
+def _price_key(price: float) -> float:
+    return round(float(price), _PRICE_DIGITS)
+
+
+class TrackedOrder:
+    __slots__ = (
+        "order_id",
+        "currency_pair",
+        "action",
+        "price",
+        "amount",
+        "remaining",
+        "status",
+        "comment",
+        "timestamp",
+        "fills",
+    )
+
+    def __init__(
+        self,
+        order_id: int,
+        currency_pair: str,
+        action: str,
+        price: float,
+        amount: float,
+        remaining: Optional[float] = None,
+        status: str = OPEN,
+        comment: str = "",
+        timestamp=None,
+    ):
+        self.order_id = order_id
+        self.currency_pair = currency_pair
+        self.action = action
+        self.price = float(price)
+        self.amount = float(amount)
+        self.remaining = self.amount if remaining is None else float(remaining)
+        self.status = status
+        self.comment = comment or ""
+        self.timestamp = timestamp
+        self.fills: List[int] = []
+
+    @property
+    def filled(self) -> float:
+        return self.amount - self.remaining
+
+    @property
+    def is_open(self) -> bool:
+        return self.status == OPEN
+
+    def as_dict(self) -> Dict:
+        result = {name: getattr(self, name) for name in self.__slots__}
+        result["filled"] = self.filled
+        return result
+
+    def __repr__(self):
+        return "TrackedOrder(order_id={}, {} {} {}@{}, remaining={}, status={!r})".format(
+            self.order_id,
+            self.currency_pair,
+            self.action,
+            self.amount,
+            self.price,
+            self.remaining,
+            self.status,
+        )
+
+
+class OrderTracker:
+    def __init__(
+        self, api=None, currency_pair: Optional[str] = None, max_closed: int = DEFAULT_MAX_CLOSED
+    ):
+        self._api = api
+        self.currency_pair = currency_pair
+        self.last_trade_id: Optional[int] = None
+        self._max_closed = max_closed
+        self._open: Dict[int, TrackedOrder] = {}
+        self._by_pair: Dict[str, Dict[int, TrackedOrder]] = {}
+        self._by_level: Dict[Tuple[str, str, float], Dict[int, TrackedOrder]] = {}
+        self._closed: "OrderedDict[int, TrackedOrder]" = OrderedDict()
+        self._credits: Dict[Tuple[str, str], List[List[float]]] = {}
+
+    @staticmethod
+    def _level(order: TrackedOrder) -> Tuple[str, str, float]:
+        return order.currency_pair, order.action, _price_key(order.price)
+
+    def _add(self, order: TrackedOrder) -> TrackedOrder:
+        self._open[order.order_id] = order
+        self._by_pair.setdefault(order.currency_pair, {})[order.order_id] = order
+        self._by_level.setdefault(self._level(order), {})[order.order_id] = order
+        return order
+
+    @staticmethod
+    def _discard(index: Dict, key, order_id: int) -> None:
+        orders = index.get(key)
+        if orders is not None:
+            orders.pop(order_id, None)
+            if not orders:
+                del index[key]
+
+    def _close(self, order: TrackedOrder, status: str) -> TrackedOrder:
+        order.status = status
+        self._open.pop(order.order_id, None)
+        self._discard(self._by_pair, order.currency_pair, order.order_id)
+        self._discard(self._by_level, self._level(order), order.order_id)
+        self._closed[order.order_id] = order
+        while len(self._closed) > self._max_closed:
+            self._closed.popitem(last=False)
+        return order
+
+    def record_trade(self, params: Dict, result: Dict) -> TrackedOrder:
+        received = float(result.get("received") or 0)
+        remains = float(result.get("remains") or 0)
+        order = TrackedOrder(
+            int(result.get("order_id") or 0),
+            params["currency_pair"],
+            params["action"],
+            params["price"],
+            received + remains,
+            remains,
+            comment=params.get("comment", ""),
+        )
+        if received > 0:
+            credits = self._credits.setdefault((order.currency_pair, order.action), [])
+            credits.append([order.price, received])
+        if not order.order_id or remains <= _EPSILON:
+            order.remaining = 0.0
+            order.status = FILLED
+            return order
+        return self._add(order)
+
+    def record_cancel(self, result: Dict) -> Optional[TrackedOrder]:
+        order = self._open.get(int(result["order_id"]))
+        if order is None:
+            return None
+        return self._close(order, CANCELLED)
+
+    def trade(self, **params) -> TrackedOrder:
+        return self.record_trade(params, self._api.trade(**params))
+
+    def cancel_order(self, **params) -> Optional[TrackedOrder]:
+        return self.record_cancel(self._api.cancel_order(**params))
+
+    async def trade_async(self, **params) -> TrackedOrder:
+        return self.record_trade(params, await self._api.trade(**params))
+
+    async def cancel_order_async(self, **params) -> Optional[TrackedOrder]:
+        return self.record_cancel(await self._api.cancel_order(**params))
+
+    def _use_credit(self, currency_pair: str, action: str, price: float, amount: float) -> float:
+        credits = self._credits.get((currency_pair, action))
+        if not credits:
+            return amount
+        for credit in credits:
+            limit = credit[0]
+            if price > limit + _EPSILON if action == BID else price < limit - _EPSILON:
+                continue
+            used = min(credit[1], amount)
+            credit[1] -= used
+            amount -= used
+            if amount <= _EPSILON:
+                break
+        credits[:] = [credit for credit in credits if credit[1] > _EPSILON]
+        return amount
+
+    def _match(self, currency_pair, action, price, comment) -> Optional[TrackedOrder]:
+        orders = self._by_level.get((currency_pair, action, _price_key(price)))
+        if not orders:
+            return None
+        if comment:
+            for order in orders.values():
+                if order.comment == comment:
+                    return order
+        return next(iter(orders.values()))
+
+    def apply_fill(self, trade_id: int, fill) -> Optional[TrackedOrder]:
+        trade_id = int(trade_id)
+        if self.last_trade_id is None or trade_id > self.last_trade_id:
+            self.last_trade_id = trade_id
+        currency_pair = _field(fill, "currency_pair")
+        action = _field(fill, "your_action") or _field(fill, "action")
+        price = float(_field(fill, "price"))
+        amount = float(_field(fill, "amount"))
+        amount = self._use_credit(currency_pair, action, price, amount)
+        if amount <= _EPSILON:
+            return None
+        order = self._match(currency_pair, action, price, _field(fill, "comment"))
+        if order is None:
+            return None
+        order.fills.append(trade_id)
+        order.remaining = max(0.0, order.remaining - amount)
+        if order.remaining <= _EPSILON:
+            order.remaining = 0.0
+            self._close(order, FILLED)
+        return order
+
+    def apply_trade_history(self, history) -> List[TrackedOrder]:
+        records = history.items() if hasattr(history, "items") else history
+        updated = []
+        for trade_id, fill in sorted(records, key=lambda record: int(record[0])):
+            if self.last_trade_id is not None and int(trade_id) <= self.last_trade_id:
+                continue
+            order = self.apply_fill(trade_id, fill)
+            if order is not None:
+                updated.append(order)
+        return updated
+
+    def apply_active_orders(
+        self, active_orders, currency_pair: Optional[str] = None
+    ) -> List[TrackedOrder]:
+        currency_pair = currency_pair or self.currency_pair
+        seen = set()
+        for order_id, record in active_orders.items():
+            order_id = int(order_id)
+            seen.add(order_id)
+            remaining = float(_field(record, "amount"))
+            order = self._open.get(order_id)
+            if order is None:
+                self._add(
+                    TrackedOrder(
+                        order_id,
+                        _field(record, "currency_pair"),
+                        _field(record, "action"),
+                        _field(record, "price"),
+                        remaining,
+                        comment=_field(record, "comment", ""),
+                        timestamp=_field(record, "timestamp"),
+                    )
+                )
+            else:
+                order.remaining = min(order.amount, remaining)
+                order.timestamp = _field(record, "timestamp", order.timestamp)
+        closed = []
+        for order in list(self._open.values()):
+            if order.order_id in seen:
+                continue
+            if currency_pair is not None and order.currency_pair != currency_pair:
+                continue
+            if order.remaining <= _EPSILON:
+                order.remaining = 0.0
+                closed.append(self._close(order, FILLED))
+            else:
+                closed.append(self._close(order, CLOSED))
+        return closed
+
+    def _history_params(self) -> Dict:
+        params: Dict = {"order": "ASC"}
+        if self.last_trade_id is not None:
+            params["from_id"] = self.last_trade_id + 1
+        if self.currency_pair is not None:
+            params["currency_pair"] = self.currency_pair
+        return params
+
+    def _active_params(self) -> Dict:
+        return {} if self.currency_pair is None else {"currency_pair": self.currency_pair}
+
+    def _baseline(self, latest) -> None:
+        ids = [int(trade_id) for trade_id in latest]
+        self.last_trade_id = max(ids) if ids else 0
+
+    def reconcile(self, api=None) -> List[TrackedOrder]:
+        return self.apply_active_orders((api or self._api).active_orders(**self._active_params()))
+
+    def sync(self, api=None) -> List[TrackedOrder]:
+        api = api or self._api
+        if self.last_trade_id is None:
+            self.reconcile(api)
+            params = dict(self._history_params(), order="DESC", count=1)
+            self._baseline(api.trade_history(**params))
+            return []
+        fills = api.iter_trade_history(prefetch=False, **self._history_params())
+        return self.apply_trade_history(list(fills))
+
+    async def reconcile_async(self, api=None) -> List[TrackedOrder]:
+        active_orders = await (api or self._api).active_orders(**self._active_params())
+        return self.apply_active_orders(active_orders)
+
+    async def sync_async(self, api=None) -> List[TrackedOrder]:
+        api = api or self._api
+        if self.last_trade_id is None:
+            await self.reconcile_async(api)
+            params = dict(self._history_params(), order="DESC", count=1)
+            self._baseline(await api.trade_history(**params))
+            return []
+        fills = [
+            fill async for fill in api.iter_trade_history(prefetch=False, **self._history_params())
+        ]
+        return self.apply_trade_history(fills)
+
+    def get(self, order_id: int) -> Optional[TrackedOrder]:
+        order_id = int(order_id)
+        return self._open.get(order_id) or self._closed.get(order_id)
+
+    def open_orders(self, currency_pair: Optional[str] = None) -> List[TrackedOrder]:
+        if currency_pair is None:
+            return list(self._open.values())
+        return list(self._by_pair.get(currency_pair, {}).values())
+
+    def currency_pairs(self) -> List[str]:
+        return list(self._by_pair)
+
+    def __contains__(self, order_id) -> bool:
+        return int(order_id) in self._open
+
+    def __iter__(self) -> Iterator[TrackedOrder]:
+        return iter(list(self._open.values()))
+
+    def __len__(self):
+        return len(self._open)
@@ -0,0 +1,151 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+ASK = "ask"
+BID = "bid"
+
+
+class LevelChange(NamedTuple):
+    price: float
+    old_amount: float
+    new_amount: float
+
+
+class BookDiff(NamedTuple):
+    asks: List[LevelChange]
+    bids: List[LevelChange]
+
+    def __bool__(self):
+        return bool(self.asks or self.bids)
+
+
+def _field(snapshot, name: str, default=None):
+    if isinstance(snapshot, dict):
+        return snapshot.get(name, default)
+    return getattr(snapshot, name, default)
+
+
+# Levels are stored as float64 columns, so prices and amounts decoded as Decimal
+# (DECIMAL_DECODER) are rounded to the nearest double here.
+class _BookSide:
+    __slots__ = ("prices", "amounts")
+
+    def __init__(self, levels: Iterable[Tuple[float, float]] = ()):
+        levels = sorted((float(price), float(amount)) for price, amount in levels if amount)
+        self.prices = array("d", (price for price, _ in levels))
+        self.amounts = array("d", (amount for _, amount in levels))
+
+    def __len__(self):
+        return len(self.prices)
+
+    def get(self, price: float) -> float:
+        index = bisect_left(self.prices, price)
+        if index < len(self.prices) and self.prices[index] == price:
+            return self.amounts[index]
+        return 0.0
+
+    def diff(self, other: "_BookSide") -> List[LevelChange]:
+        changes = []
+        i = j = 0
+        old_prices, old_amounts = self.prices, self.amounts
+        new_prices, new_amounts = other.prices, other.amounts
+        while i < len(old_prices) or j < len(new_prices):
+            if j == len(new_prices) or (i < len(old_prices) and old_prices[i] < new_prices[j]):
+                changes.append(LevelChange(old_prices[i], old_amounts[i], 0.0))
+                i += 1
+            elif i == len(old_prices) or new_prices[j] < old_prices[i]:
+                changes.append(LevelChange(new_prices[j], 0.0, new_amounts[j]))
+                j += 1
+            else:
+                if old_amounts[i] != new_amounts[j]:
+                    changes.append(LevelChange(new_prices[j], old_amounts[i], new_amounts[j]))
+                i += 1
+                j += 1
+        return changes
+
+
+class LocalOrderBook:
+    def __init__(self, currency_pair: Optional[str] = None, depth=None):
+        self.currency_pair = currency_pair
+        self._asks = _BookSide()
+        self._bids = _BookSide()
+        self.last_price: Optional[dict] = None
+        self.trades: list = []
+        self.timestamp: Optional[str] = None
+        if depth is not None:
+            self.update(depth)
+
+    @classmethod
+    def from_api(cls, api, currency_pair: str) -> "LocalOrderBook":
+        return cls(currency_pair, api.depth(currency_pair))
+
+    def update(self, snapshot) -> BookDiff:
+        asks = _BookSide(_field(snapshot, "asks") or ())
+        bids = _BookSide(_field(snapshot, "bids") or ())
+        diff = BookDiff(self._asks.diff(asks), self._bids.diff(bids))
+        self._asks, self._bids = asks, bids
+        self.last_price = _field(snapshot, "last_price", self.last_price)
+        self.trades = _field(snapshot, "trades", self.trades)
+        self.timestamp = _field(snapshot, "timestamp", self.timestamp)
+        return diff
+
+    def follow(self, stream: Iterable):
+        for snapshot in stream:
+            yield self.update(snapshot)
+
+    @property
+    def best_ask(self) -> Optional[Tuple[float, float]]:
+        if not self._asks:
+            return None
+        return self._asks.prices[0], self._asks.amounts[0]
+
+    @property
+    def best_bid(self) -> Optional[Tuple[float, float]]:
+        if not self._bids:
+            return None
+        return self._bids.prices[-1], self._bids.amounts[-1]
+
+    @property
+    def spread(self) -> Optional[float]:
+        if not self._asks or not self._bids:
+            return None
+        return self._asks.prices[0] - self._bids.prices[-1]
+
+    def asks(self) -> List[Tuple[float, float]]:
+        return list(zip(self._asks.prices, self._asks.amounts))
+
+    def bids(self) -> List[Tuple[float, float]]:
+        return list(zip(reversed(self._bids.prices), reversed(self._bids.amounts)))
+
+    def amount_at(self, side: str, price: float) -> float:
+        return self._side(side).get(float(price))
+
+    def volume_within(self, side: str, price: float) -> float:
+        book = self._side(side)
+        if side == ASK:
+            end = bisect_right(book.prices, price)
+            return sum(book.amounts[:end])
+        start = bisect_left(book.prices, price)
+        return sum(book.amounts[start:])
+
+    def price_for_volume(self, side: str, volume: float) -> Optional[Tuple[float, float]]:
+        if volume <= 0:
+            raise ValueError("volume must be positive")
+        book = self._side(side)
+        indexes = range(len(book)) if side == ASK else range(len(book) - 1, -1, -1)
+        filled = cost = 0.0
+        for index in indexes:
+            take = min(book.amounts[index], volume - filled)
+            filled += take
+            cost += take * book.prices[index]
+            if filled >= volume:
+                return book.prices[index], cost / filled
+        return None
+
+    def _side(self, side: str) -> _BookSide:
+        if side == ASK:
+            return self._asks
+        if side == BID:
+            return self._bids
+        raise ValueError("side must be '{}' or '{}'".format(ASK, BID))
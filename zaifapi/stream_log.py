@@ -0,0 +1,288 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from decimal import Decimal
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+from zaifapi.api_common import get_decoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+
+DEFAULT_BLOCK_SIZE = 256 * 1024
+DEFAULT_LEVEL = 6
+
+_MAGIC = b"ZAIFLOG1"
+_FILE_HEADER = struct.Struct("<8sHH")
+_BLOCK_HEADER = struct.Struct("<IIIdd")
+_ENTRY = struct.Struct("<dI")
+_INDEX_ENTRY = struct.Struct("<dQ")
+
+
+class LogBlock(NamedTuple):
+    offset: int
+    stored_size: int
+    raw_size: int
+    messages: int
+    first_time: float
+    last_time: float
+
+
+def _index_path(path: str) -> str:
+    return path + ".idx"
+
+
+def _scan_blocks(buffer, size: int) -> Tuple[List[LogBlock], int]:
+    blocks = []
+    offset = _FILE_HEADER.size
+    while offset + _BLOCK_HEADER.size <= size:
+        stored, raw, count, first, last = _BLOCK_HEADER.unpack_from(buffer, offset)
+        end = offset + _BLOCK_HEADER.size + stored
+        if end > size:
+            break
+        blocks.append(LogBlock(offset, stored, raw, count, first, last))
+        offset = end
+    return blocks, offset
+
+
+def _read_header(header: bytes, path: str) -> int:
+    magic, _, codec = _FILE_HEADER.unpack(header)
+    if magic != _MAGIC:
+        raise ValueError("{} is not a stream log".format(path))
+    return int(codec)
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError("Type is not JSON serializable: {}".format(type(value).__name__))
+
+
+def _encode(message) -> bytes:
+    if isinstance(message, bytes):
+        return message
+    if isinstance(message, str):
+        return message.encode("utf-8")
+    if isinstance(message, (bytearray, memoryview)):
+        return bytes(message)
+    if orjson is not None:
+        return orjson.dumps(message, default=_default)
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=_default).encode(
+        "utf-8"
+    )
+
+
+class StreamRecorder:
+    def __init__(
+        self,
+        path: str,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        codec: int = CODEC_ZLIB,
+        level: int = DEFAULT_LEVEL,
+        clock=time.time,
+    ):
+        self._path = path
+        self._block_size = block_size
+        self._level = level
+        self._clock = clock
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        self._pending_count = 0
+        self._first_time = 0.0
+        self._last_time = 0.0
+        self._file = open(path, "a+b")
+        self._file.seek(0)
+        header = self._file.read(_FILE_HEADER.size)
+        if header:
+            self._codec = _read_header(header, path)
+            self._recover()
+        else:
+            self._codec = codec
+            self._file.write(_FILE_HEADER.pack(_MAGIC, 1, codec))
+            self._file.flush()
+            open(_index_path(path), "wb").close()
+        self._index = open(_index_path(path), "ab")
+
+    def _recover(self) -> None:
+        size = os.fstat(self._file.fileno()).st_size
+        with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            blocks, end = _scan_blocks(data, size)
+        if end != size:
+            self._file.truncate(end)
+        with open(_index_path(self._path), "wb") as index:
+            for block in blocks:
+                index.write(_INDEX_ENTRY.pack(block.first_time, block.offset))
+
+    def write(self, message, timestamp: Optional[float] = None) -> None:
+        timestamp = self._clock() if timestamp is None else timestamp
+        data = _encode(message)
+        if not self._pending_count:
+            self._first_time = timestamp
+        self._last_time = timestamp
+        self._pending.append(_ENTRY.pack(timestamp, len(data)))
+        self._pending.append(data)
+        self._pending_size += _ENTRY.size + len(data)
+        self._pending_count += 1
+        if self._pending_size >= self._block_size:
+            self.flush()
+
+    def record(self, messages, decoder=None):
+        for message in messages:
+            self.write(message)
+            yield message if decoder is None else decoder.decode(message)
+
+    def flush(self) -> None:
+        if not self._pending_count:
+            return
+        raw = b"".join(self._pending)
+        stored = zlib.compress(raw, self._level) if self._codec == CODEC_ZLIB else raw
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        self._file.write(
+            _BLOCK_HEADER.pack(
+                len(stored), len(raw), self._pending_count, self._first_time, self._last_time
+            )
+        )
+        self._file.write(stored)
+        self._file.flush()
+        self._index.write(_INDEX_ENTRY.pack(self._first_time, offset))
+        self._index.flush()
+        self._pending = []
+        self._pending_size = 0
+        self._pending_count = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class StreamReplayer:
+    def __init__(
+        self,
+        path: str,
+        speed: Optional[float] = None,
+        decoder=None,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        self._path = path
+        self._speed = speed
+        self._decoder = get_decoder(decoder)
+        self._clock = clock
+        self._sleep = sleep
+        self._continue = True
+        with open(path, "rb") as f:
+            self._codec = _read_header(f.read(_FILE_HEADER.size), path)
+            size = os.fstat(f.fileno()).st_size
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.blocks = self._load_index(size)
+        self._times = [block.first_time for block in self.blocks]
+
+    def _load_index(self, size: int) -> List[LogBlock]:
+        try:
+            with open(_index_path(self._path), "rb") as index:
+                entries = list(_INDEX_ENTRY.iter_unpack(index.read()))
+        except (OSError, struct.error):
+            entries = []
+        blocks = []
+        for _, offset in entries:
+            if offset + _BLOCK_HEADER.size > size:
+                break
+            block = LogBlock(offset, *_BLOCK_HEADER.unpack_from(self._mmap, offset))
+            if offset + _BLOCK_HEADER.size + block.stored_size > size:
+                break
+            blocks.append(block)
+        end = blocks[-1].offset + _BLOCK_HEADER.size + blocks[-1].stored_size if blocks else 0
+        if end < size:
+            blocks, _ = _scan_blocks(self._mmap, size)
+        return blocks
+
+    def __len__(self):
+        return sum(block.messages for block in self.blocks)
+
+    @property
+    def start_time(self) -> Optional[float]:
+        return self.blocks[0].first_time if self.blocks else None
+
+    @property
+    def end_time(self) -> Optional[float]:
+        return self.blocks[-1].last_time if self.blocks else None
+
+    def _block_data(self, block: LogBlock):
+        start = block.offset + _BLOCK_HEADER.size
+        end = start + block.stored_size
+        view = memoryview(self._mmap)[start:end]
+        if self._codec == CODEC_ZLIB:
+            data = zlib.decompress(view, bufsize=block.raw_size)
+            view.release()
+            return memoryview(data)
+        return view
+
+    def raw(self, start: Optional[float] = None, end: Optional[float] = None) -> Iterator:
+        first = 0
+        if start is not None:
+            first = max(0, bisect.bisect_right(self._times, start) - 1)
+        for block in self.blocks[first:]:
+            if end is not None and block.first_time > end:
+                return
+            if start is not None and block.last_time < start:
+                continue
+            data = self._block_data(block)
+            position = 0
+            for _ in range(block.messages):
+                timestamp, length = _ENTRY.unpack_from(data, position)
+                position += _ENTRY.size
+                message_end = position + length
+                if end is not None and timestamp > end:
+                    return
+                if start is None or timestamp >= start:
+                    yield timestamp, data[position:message_end]
+                position = message_end
+
+    def replay(self, start: Optional[float] = None, end: Optional[float] = None):
+        origin = None
+        for timestamp, data in self.raw(start, end):
+            if not self._continue:
+                return
+            if self._speed:
+                if origin is None:
+                    origin = (timestamp, self._clock())
+                delay = (timestamp - origin[0]) / self._speed - (self._clock() - origin[1])
+                if delay > 0:
+                    self._sleep(delay)
+            yield timestamp, self._decoder.decode(data)
+
+    def execute(self, currency_pair: Optional[str] = None, start=None, end=None):
+        for _, message in self.replay(start, end):
+            if currency_pair is None or message.get("currency_pair") == currency_pair:
+                yield message
+
+    def __iter__(self):
+        return self.execute()
+
+    def stop(self) -> None:
+        self._continue = False
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()